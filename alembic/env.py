@@ -23,6 +23,8 @@ from app.core.database import Base
 # Import all models so they are registered with Base
 from app.models.task import Task
 from app.models.task_log import TaskLog
+from app.models.task_run import TaskRun
+from app.models.scheduler_node import SchedulerNode
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
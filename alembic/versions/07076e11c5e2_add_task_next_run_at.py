@@ -0,0 +1,42 @@
+"""add tasks.next_run_at
+
+Revision ID: 07076e11c5e2
+Revises: 8378adb234ae
+Create Date: 2026-10-17 09:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "07076e11c5e2"
+down_revision: Union[str, Sequence[str], None] = "8378adb234ae"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Left NULL for existing tasks; the scheduler fills it in as they fire
+    op.add_column("tasks", sa.Column("next_run_at", sa.DateTime(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_active_next_run_at",
+            "tasks",
+            ["next_run_at"],
+            postgresql_where=sa.text("status = 'active'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_active_next_run_at",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("tasks", "next_run_at")
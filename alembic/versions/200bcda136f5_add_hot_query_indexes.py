@@ -0,0 +1,84 @@
+"""add indexes for scheduler and listing queries
+
+Revision ID: 200bcda136f5
+Revises: 814feaefef84
+Create Date: 2026-10-17 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "200bcda136f5"
+down_revision: Union[str, Sequence[str], None] = "814feaefef84"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently, outside the migration transaction, so that writes to
+    # large existing tables are not blocked while the indexes are created
+    with op.get_context().autocommit_block():
+        # Scheduler full resync (status = 'active') and incremental sync
+        op.create_index(
+            "ix_tasks_active_updated_at",
+            "tasks",
+            ["updated_at"],
+            postgresql_where=sa.text("status = 'active'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_updated_at",
+            "tasks",
+            ["updated_at"],
+            postgresql_concurrently=True,
+        )
+        # GET /tasks keyset pagination, with and without a status filter
+        op.create_index(
+            "ix_tasks_created_at_id",
+            "tasks",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_status_created_at_id",
+            "tasks",
+            ["status", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+
+        # Logs of one task, newest first (listing by task, include=logs,
+        # and the foreign key lookups when a task is deleted)
+        op.create_index(
+            "ix_task_logs_task_id_execution_time",
+            "task_logs",
+            ["task_id", sa.text("execution_time DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        # GET /task-logs keyset pagination, with and without a status filter
+        op.create_index(
+            "ix_task_logs_execution_time_id",
+            "task_logs",
+            [sa.text("execution_time DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_task_logs_status_execution_time",
+            "task_logs",
+            ["status", sa.text("execution_time DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_task_logs_status_execution_time", table_name="task_logs")
+    op.drop_index("ix_task_logs_execution_time_id", table_name="task_logs")
+    op.drop_index("ix_task_logs_task_id_execution_time", table_name="task_logs")
+    op.drop_index("ix_tasks_status_created_at_id", table_name="tasks")
+    op.drop_index("ix_tasks_created_at_id", table_name="tasks")
+    op.drop_index("ix_tasks_updated_at", table_name="tasks")
+    op.drop_index("ix_tasks_active_updated_at", table_name="tasks")
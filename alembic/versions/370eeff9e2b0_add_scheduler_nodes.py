@@ -0,0 +1,38 @@
+"""add scheduler_nodes membership table
+
+Revision ID: 370eeff9e2b0
+Revises: 6fdc30066fbe
+Create Date: 2026-10-17 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "370eeff9e2b0"
+down_revision: Union[str, Sequence[str], None] = "6fdc30066fbe"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "scheduler_nodes",
+        sa.Column("node_id", sa.String(), nullable=False),
+        sa.Column("hostname", sa.String(), nullable=True),
+        sa.Column(
+            "started_at", sa.DateTime(), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "heartbeat_at", sa.DateTime(), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("node_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("scheduler_nodes")
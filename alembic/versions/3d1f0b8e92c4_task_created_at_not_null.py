@@ -0,0 +1,45 @@
+"""make tasks.created_at NOT NULL
+
+Revision ID: 3d1f0b8e92c4
+Revises: 7a6e2376dc6f
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "3d1f0b8e92c4"
+down_revision: Union[str, Sequence[str], None] = "7a6e2376dc6f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # created_at is the keyset pagination key of the task listing, which
+    # cannot order or encode a cursor for NULLs
+    op.execute(
+        "UPDATE tasks SET created_at = COALESCE(updated_at, now() AT TIME ZONE 'utc') "
+        "WHERE created_at IS NULL"
+    )
+    op.alter_column(
+        "tasks",
+        "created_at",
+        existing_type=sa.DateTime(),
+        nullable=False,
+        server_default=sa.text("(now() AT TIME ZONE 'utc')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        "tasks",
+        "created_at",
+        existing_type=sa.DateTime(),
+        nullable=True,
+        server_default=None,
+    )
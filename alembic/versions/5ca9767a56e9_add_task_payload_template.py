@@ -0,0 +1,33 @@
+"""add tasks.payload_template
+
+Revision ID: 5ca9767a56e9
+Revises: cce6aafe5069
+Create Date: 2026-10-17 10:15:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5ca9767a56e9"
+down_revision: Union[str, Sequence[str], None] = "cce6aafe5069"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "payload_template", sa.Boolean(), nullable=True, server_default="false"
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("tasks", "payload_template")
@@ -0,0 +1,30 @@
+"""add scheduled_for and lag_ms to task_logs
+
+Revision ID: 600c3c115c75
+Revises: 84d9c45d1964
+Create Date: 2026-10-17 09:35:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "600c3c115c75"
+down_revision: Union[str, Sequence[str], None] = "84d9c45d1964"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Columns added to the partitioned parent propagate to every partition
+    op.add_column("task_logs", sa.Column("scheduled_for", sa.DateTime(), nullable=True))
+    op.add_column("task_logs", sa.Column("lag_ms", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("task_logs", "lag_ms")
+    op.drop_column("task_logs", "scheduled_for")
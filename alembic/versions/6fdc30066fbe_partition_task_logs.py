@@ -0,0 +1,108 @@
+"""partition task_logs by execution_time
+
+Revision ID: 6fdc30066fbe
+Revises: 200bcda136f5
+Create Date: 2026-10-17 09:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6fdc30066fbe"
+down_revision: Union[str, Sequence[str], None] = "200bcda136f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = """
+CREATE INDEX ix_task_logs_task_id_execution_time
+    ON task_logs (task_id, execution_time DESC, id DESC);
+CREATE INDEX ix_task_logs_execution_time_id
+    ON task_logs (execution_time DESC, id DESC);
+CREATE INDEX ix_task_logs_status_execution_time
+    ON task_logs (status, execution_time DESC, id DESC);
+"""
+
+DROP_INDEXES = """
+DROP INDEX ix_task_logs_task_id_execution_time;
+DROP INDEX ix_task_logs_execution_time_id;
+DROP INDEX ix_task_logs_status_execution_time;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rebuild task_logs as a table range-partitioned by month on
+    # execution_time. The primary key has to include the partition key.
+    op.execute("ALTER TABLE task_logs RENAME TO task_logs_unpartitioned")
+    op.execute(DROP_INDEXES)
+    op.execute(
+        """
+        CREATE TABLE task_logs (
+            id UUID NOT NULL,
+            task_id UUID NOT NULL REFERENCES tasks (id),
+            execution_time TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            status VARCHAR NOT NULL,
+            retry_count INTEGER,
+            message TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            PRIMARY KEY (id, execution_time)
+        ) PARTITION BY RANGE (execution_time)
+        """
+    )
+    op.execute("CREATE TABLE task_logs_default PARTITION OF task_logs DEFAULT")
+
+    # One partition per month from the oldest existing log up to two months
+    # ahead; the maintenance job keeps creating them from here on
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month_start DATE := date_trunc(
+                'month',
+                LEAST(
+                    (SELECT min(execution_time) FROM task_logs_unpartitioned),
+                    now()
+                )
+            );
+        BEGIN
+            WHILE month_start <= date_trunc('month', now()) + interval '2 months'
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF task_logs '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    'task_logs_p' || to_char(month_start, 'YYYY_MM'),
+                    month_start,
+                    month_start + interval '1 month'
+                );
+                month_start := month_start + interval '1 month';
+            END LOOP;
+        END $$
+        """
+    )
+    op.execute("INSERT INTO task_logs SELECT * FROM task_logs_unpartitioned")
+    op.execute("DROP TABLE task_logs_unpartitioned")
+    op.execute(INDEXES)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE task_logs RENAME TO task_logs_partitioned")
+    op.execute(DROP_INDEXES)
+    op.execute(
+        """
+        CREATE TABLE task_logs (
+            id UUID NOT NULL PRIMARY KEY,
+            task_id UUID NOT NULL REFERENCES tasks (id),
+            execution_time TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            status VARCHAR NOT NULL,
+            retry_count INTEGER,
+            message TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE
+        )
+        """
+    )
+    op.execute("INSERT INTO task_logs SELECT * FROM task_logs_partitioned")
+    op.execute("DROP TABLE task_logs_partitioned")
+    op.execute(INDEXES)
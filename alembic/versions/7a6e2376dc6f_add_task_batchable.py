@@ -0,0 +1,30 @@
+"""add tasks.batchable
+
+Revision ID: 7a6e2376dc6f
+Revises: 5ca9767a56e9
+Create Date: 2026-10-17 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7a6e2376dc6f"
+down_revision: Union[str, Sequence[str], None] = "5ca9767a56e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tasks",
+        sa.Column("batchable", sa.Boolean(), nullable=True, server_default="false"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("tasks", "batchable")
@@ -0,0 +1,53 @@
+"""add task_runs ledger of scheduled occurrences
+
+Revision ID: 7f65758cd516
+Revises: 370eeff9e2b0
+Create Date: 2026-10-17 09:25:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7f65758cd516"
+down_revision: Union[str, Sequence[str], None] = "370eeff9e2b0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_runs",
+        sa.Column("task_id", sa.UUID(), nullable=False),
+        sa.Column("scheduled_for", sa.DateTime(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("claimed_by", sa.String(), nullable=True),
+        sa.Column("claimed_at", sa.DateTime(), nullable=True),
+        sa.Column("claim_count", sa.Integer(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("task_id", "scheduled_for"),
+    )
+    op.create_index(
+        "ix_task_runs_pending_scheduled_for",
+        "task_runs",
+        ["scheduled_for"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.create_index(
+        "ix_task_runs_claimed_claimed_at",
+        "task_runs",
+        ["claimed_at"],
+        postgresql_where=sa.text("status = 'claimed'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_task_runs_claimed_claimed_at", table_name="task_runs")
+    op.drop_index("ix_task_runs_pending_scheduled_for", table_name="task_runs")
+    op.drop_table("task_runs")
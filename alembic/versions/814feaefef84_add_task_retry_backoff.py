@@ -0,0 +1,40 @@
+"""add task retry backoff settings
+
+Revision ID: 814feaefef84
+Revises: 9bf14e7382e3
+Create Date: 2026-10-17 09:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "814feaefef84"
+down_revision: Union[str, Sequence[str], None] = "9bf14e7382e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tasks",
+        sa.Column("retry_backoff_base", sa.Float(), nullable=True, server_default="2"),
+    )
+    op.add_column(
+        "tasks",
+        sa.Column("retry_backoff_cap", sa.Float(), nullable=True, server_default="300"),
+    )
+    op.add_column(
+        "tasks",
+        sa.Column("retry_jitter", sa.String(), nullable=True, server_default="none"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("tasks", "retry_jitter")
+    op.drop_column("tasks", "retry_backoff_cap")
+    op.drop_column("tasks", "retry_backoff_base")
@@ -0,0 +1,42 @@
+"""add task misfire policy
+
+Revision ID: 84d9c45d1964
+Revises: 7f65758cd516
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "84d9c45d1964"
+down_revision: Union[str, Sequence[str], None] = "7f65758cd516"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tasks",
+        sa.Column("misfire_policy", sa.String(), nullable=True, server_default="skip"),
+    )
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "misfire_grace_seconds", sa.Integer(), nullable=True, server_default="3600"
+        ),
+    )
+    op.add_column(
+        "tasks",
+        sa.Column("max_backfill", sa.Integer(), nullable=True, server_default="10"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("tasks", "max_backfill")
+    op.drop_column("tasks", "misfire_grace_seconds")
+    op.drop_column("tasks", "misfire_policy")
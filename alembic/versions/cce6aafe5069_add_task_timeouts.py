@@ -0,0 +1,32 @@
+"""add task request timeouts
+
+Revision ID: cce6aafe5069
+Revises: 07076e11c5e2
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "cce6aafe5069"
+down_revision: Union[str, Sequence[str], None] = "07076e11c5e2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("tasks", sa.Column("connect_timeout", sa.Float(), nullable=True))
+    op.add_column("tasks", sa.Column("read_timeout", sa.Float(), nullable=True))
+    op.add_column("tasks", sa.Column("total_timeout", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("tasks", "total_timeout")
+    op.drop_column("tasks", "read_timeout")
+    op.drop_column("tasks", "connect_timeout")
@@ -0,0 +1,70 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(sort_value: datetime, row_id: UUID) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor"""
+    raw = json.dumps([sort_value.isoformat(), str(row_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(sort_value), UUID(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def wants_total(include_total: Optional[bool], cursor: Optional[str]) -> bool:
+    """
+    Counting matching rows is a full scan, so cursor clients only get the
+    exact total when they ask for it; offset clients keep getting it.
+    """
+    return include_total if include_total is not None else cursor is None
+
+
+def paginate(
+    query: Query,
+    sort_column,
+    id_column,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+) -> Tuple[List, Optional[str]]:
+    """
+    Return one page of `query` ordered by (sort_column, id_column) and the
+    cursor for the page after it, or None on the last page.
+
+    With a cursor the page starts right after the row it encodes, which an
+    index on (sort_column, id_column) serves without scanning the skipped
+    rows. Without one, `skip` is applied as a plain offset.
+    """
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column, id_column)
+
+    if cursor:
+        key = tuple_(sort_column, id_column)
+        last = tuple_(*decode_cursor(cursor))
+        query = query.filter(key < last if descending else key > last)
+    elif skip:
+        query = query.offset(skip)
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last_row = rows[-1]
+    return rows, encode_cursor(
+        getattr(last_row, sort_column.key), getattr(last_row, id_column.key)
+    )
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import Optional
+from datetime import datetime, timezone
 from app.core.database import get_db
 from app.core.security import verify_token
+from app.api.pagination import paginate, wants_total
 from app.models.task_log import TaskLog
 from app.models.task import Task
 from app.schemas.task_log import (
@@ -72,6 +74,10 @@ def list_task_logs(
     limit: int = 100,
     task_id: Optional[UUID] = None,
     status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
     db: Session = Depends(get_db),
 ):
     query = db.query(TaskLog)
@@ -81,17 +87,9 @@ def list_task_logs(
         query = query.filter(TaskLog.task_id == task_id)
     if status:
         query = query.filter(TaskLog.status == status)
+    query = _filter_execution_time(query, since, until)
 
-    # Apply pagination
-    total = query.count()
-    task_logs = query.offset(skip).limit(min(limit, 1000)).all()
-
-    return {
-        "task_logs": task_logs,
-        "total": total,
-        "skip": skip,
-        "limit": min(limit, 1000),
-    }
+    return _paginate_task_logs(query, skip, limit, cursor, include_total)
 
 
 @router.get(
@@ -104,6 +102,10 @@ def list_task_logs_by_task(
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
     db: Session = Depends(get_db),
 ):
     # Verify task exists
@@ -116,14 +118,48 @@ def list_task_logs_by_task(
     # Apply filters
     if status:
         query = query.filter(TaskLog.status == status)
+    query = _filter_execution_time(query, since, until)
+
+    return _paginate_task_logs(query, skip, limit, cursor, include_total)
+
+
+def _filter_execution_time(query, since, until):
+    # task_logs is partitioned by execution_time, so a time range lets
+    # Postgres skip every partition outside it
+    if since:
+        query = query.filter(TaskLog.execution_time >= _as_utc(since))
+    if until:
+        query = query.filter(TaskLog.execution_time < _as_utc(until))
+    return query
+
+
+def _as_utc(value: datetime) -> datetime:
+    # execution_time is stored as naive UTC
+    if value.tzinfo:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _paginate_task_logs(query, skip, limit, cursor, include_total):
+    limit = min(limit, 1000)
+
+    total = query.count() if wants_total(include_total, cursor) else None
 
-    # Apply pagination
-    total = query.count()
-    task_logs = query.offset(skip).limit(min(limit, 1000)).all()
+    # Apply pagination, newest executions first
+    task_logs, next_cursor = paginate(
+        query,
+        TaskLog.execution_time,
+        TaskLog.id,
+        limit,
+        skip=skip,
+        cursor=cursor,
+        descending=True,
+    )
 
     return {
         "task_logs": task_logs,
         "total": total,
         "skip": skip,
-        "limit": min(limit, 1000),
+        "limit": limit,
+        "next_cursor": next_cursor,
     }
@@ -1,9 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import Optional, List
 from app.core.database import get_db
 from app.core.security import verify_token
+from app.api.pagination import paginate, wants_total
+from app.core.payloads import payload_cache
+from app.core.schedules import compile_schedule
+from app.core.task_changes import notify_task_change
 from app.models.task import Task
+from app.models.task_log import TaskLog
 from app.schemas.task import (
     TaskCreate,
     TaskUpdate,
@@ -11,6 +18,7 @@ from app.schemas.task import (
     TaskListResponse,
 )
 from uuid import UUID
+from datetime import datetime, timezone
 
 router = APIRouter()
 
@@ -18,7 +26,10 @@ router = APIRouter()
 @router.post("/", response_model=TaskSchema, dependencies=[Depends(verify_token)])
 def create_task(task: TaskCreate, db: Session = Depends(get_db)):
     db_task = Task(**task.dict())
+    _refresh_next_run_at(db_task)
     db.add(db_task)
+    db.flush()
+    db.execute(notify_task_change(db_task.id))
     db.commit()
     db.refresh(db_task)
     return db_task
@@ -27,10 +38,17 @@ def create_task(task: TaskCreate, db: Session = Depends(get_db)):
 @router.get(
     "/{task_id}", response_model=TaskSchema, dependencies=[Depends(verify_token)]
 )
-def read_task(task_id: UUID, db: Session = Depends(get_db)):
+def read_task(
+    task_id: UUID,
+    include: Optional[str] = None,
+    logs_limit: int = 10,
+    db: Session = Depends(get_db),
+):
     db_task = db.query(Task).filter(Task.id == task_id).first()
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
+    if _includes_logs(include):
+        _load_recent_logs(db, [db_task], logs_limit)
     return db_task
 
 
@@ -42,8 +60,14 @@ def update_task(task_id: UUID, task: TaskUpdate, db: Session = Depends(get_db)):
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    for key, value in task.dict(exclude_unset=True).items():
+    changes = task.dict(exclude_unset=True)
+    for key, value in changes.items():
         setattr(db_task, key, value)
+    if changes.keys() & {"schedule", "timezone", "status"}:
+        _refresh_next_run_at(db_task)
+    if "payload" in changes:
+        payload_cache.invalidate(db_task.id)
+    db.execute(notify_task_change(db_task.id))
 
     db.commit()
     db.refresh(db_task)
@@ -57,6 +81,8 @@ def delete_task(task_id: UUID, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Task not found")
 
     db.delete(db_task)
+    payload_cache.invalidate(db_task.id)
+    db.execute(notify_task_change(db_task.id, "delete"))
     db.commit()
     return {"message": "Task deleted successfully"}
 
@@ -67,9 +93,14 @@ def list_tasks(
     limit: int = 100,
     status: Optional[str] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
+    include: Optional[str] = None,
+    logs_limit: int = 10,
     db: Session = Depends(get_db),
 ):
     query = db.query(Task)
+    limit = min(limit, 1000)
 
     # Apply filters
     if status:
@@ -77,8 +108,76 @@ def list_tasks(
     if search:
         query = query.filter(Task.name.contains(search))
 
-    # Apply pagination
-    total = query.count()
-    tasks = query.offset(skip).limit(min(limit, 1000)).all()
+    total = query.count() if wants_total(include_total, cursor) else None
 
-    return {"tasks": tasks, "total": total, "skip": skip, "limit": min(limit, 1000)}
+    # Apply pagination
+    tasks, next_cursor = paginate(
+        query, Task.created_at, Task.id, limit, skip=skip, cursor=cursor
+    )
+    if _includes_logs(include):
+        _load_recent_logs(db, tasks, logs_limit)
+
+    return {
+        "tasks": tasks,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor,
+    }
+
+
+def _refresh_next_run_at(task: Task):
+    """Store the task's next occurrence, which the scheduler looks ahead on"""
+    if task.status != "active":
+        task.next_run_at = None
+        return
+    try:
+        schedule = compile_schedule(task.schedule, task.timezone)
+    except ValueError:
+        # A schedule stored before schedules were validated
+        task.next_run_at = None
+        return
+    next_run = schedule.next_after(datetime.now(timezone.utc))
+    task.next_run_at = next_run.replace(tzinfo=None)
+
+
+def _includes_logs(include: Optional[str]) -> bool:
+    return include is not None and "logs" in include.split(",")
+
+
+def _load_recent_logs(db: Session, tasks: List[Task], logs_limit: int):
+    """
+    Attach the `logs_limit` most recent logs to each task with one windowed
+    query for the whole page, instead of lazy-loading every task's full log
+    history separately.
+    """
+    if not tasks:
+        return
+    logs_limit = max(0, min(logs_limit, 100))
+
+    ranked = (
+        select(
+            TaskLog,
+            func.row_number()
+            .over(
+                partition_by=TaskLog.task_id,
+                order_by=(TaskLog.execution_time.desc(), TaskLog.id.desc()),
+            )
+            .label("position"),
+        )
+        .where(TaskLog.task_id.in_([task.id for task in tasks]))
+        .subquery()
+    )
+    recent_log = aliased(TaskLog, ranked)
+    logs = (
+        db.query(recent_log)
+        .filter(ranked.c.position <= logs_limit)
+        .order_by(ranked.c.task_id, ranked.c.position)
+        .all()
+    )
+
+    logs_by_task = {task.id: [] for task in tasks}
+    for log in logs:
+        logs_by_task[log.task_id].append(log)
+    for task in tasks:
+        set_committed_value(task, "logs", logs_by_task[task.id])
@@ -0,0 +1,24 @@
+import random
+from app.models.task import Task
+
+
+def retry_delay(task: Task, attempt: int) -> float:
+    """
+    Return how many seconds to wait before retrying a task after `attempt`
+    (1-based) has failed.
+
+    The delay grows exponentially from the task's retry_backoff_base and is
+    capped at retry_backoff_cap. With the defaults (base 2, no jitter) this is
+    2s, 4s, 8s, ... as before. "full" jitter picks a uniformly random delay
+    between 0 and the exponential delay; "equal" jitter keeps half of it and
+    randomizes the other half.
+    """
+    base = task.retry_backoff_base if task.retry_backoff_base is not None else 2.0
+    cap = task.retry_backoff_cap if task.retry_backoff_cap is not None else 300.0
+    delay = min(cap, base * 2 ** (attempt - 1))
+
+    if task.retry_jitter == "full":
+        return random.uniform(0, delay)
+    if task.retry_jitter == "equal":
+        return delay / 2 + random.uniform(0, delay / 2)
+    return delay
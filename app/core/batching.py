@@ -0,0 +1,103 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from app.models.task import Task
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+BatchItem = Tuple[Task, int]  # task and attempt number
+
+
+class WebhookBatcher:
+    """
+    Collects attempts of batchable tasks per webhook URL and hands each
+    group to `send` as one batch.
+
+    A batch is sent `window` seconds after its first attempt arrived, or as
+    soon as it holds `max_size` attempts. Sends run in their own asyncio
+    tasks, so collecting never holds a dispatcher worker, but at most
+    `concurrency` of them (the dispatcher's worker count) run at once.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str, List[BatchItem]], Awaitable[None]],
+        window: Optional[float] = None,
+        max_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ):
+        self.send = send
+        self.window = settings.BATCH_WINDOW_MS / 1000 if window is None else window
+        self.max_size = max_size or settings.BATCH_MAX_SIZE
+        self._slots = asyncio.Semaphore(concurrency or settings.DISPATCH_WORKERS)
+        self._pending: Dict[str, List[BatchItem]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._sending = set()
+        self.batches_sent = 0
+        self.items_sent = 0
+
+    def __len__(self) -> int:
+        return sum(len(items) for items in self._pending.values())
+
+    def add(self, task: Task, attempt: int):
+        """Queue an attempt into the batch for the task's webhook URL"""
+        url = task.webhook_url
+        items = self._pending.setdefault(url, [])
+        items.append((task, attempt))
+        if len(items) >= self.max_size:
+            self._flush(url)
+        elif url not in self._timers:
+            loop = asyncio.get_running_loop()
+            self._timers[url] = loop.call_later(self.window, self._flush, url)
+
+    async def join(self):
+        """Send every pending batch now and wait for all sends to finish"""
+        for url in list(self._pending):
+            self._flush(url)
+        while self._sending:
+            await asyncio.gather(*self._sending, return_exceptions=True)
+
+    async def close(self):
+        """Drop pending batches, then cancel sends in progress and wait for them"""
+        dropped = len(self)
+        if dropped:
+            logger.warning(f"Discarding {dropped} attempts waiting to be batched")
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        self._pending.clear()
+        sending = list(self._sending)
+        for send in sending:
+            send.cancel()
+        await asyncio.gather(*sending, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self),
+            "sending": len(self._sending),
+            "batches_sent": self.batches_sent,
+            "items_sent": self.items_sent,
+        }
+
+    def _flush(self, url: str):
+        timer = self._timers.pop(url, None)
+        if timer:
+            timer.cancel()
+        items = self._pending.pop(url, None)
+        if not items:
+            return
+        self.batches_sent += 1
+        self.items_sent += len(items)
+        sending = asyncio.create_task(self._send(url, items))
+        self._sending.add(sending)
+        sending.add_done_callback(self._sent)
+
+    async def _send(self, url: str, items: List[BatchItem]):
+        async with self._slots:
+            await self.send(url, items)
+
+    def _sent(self, sending: asyncio.Future):
+        self._sending.discard(sending)
+        if not sending.cancelled() and sending.exception():
+            logger.error(f"Error sending webhook batch: {sending.exception()}")
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 import os
 
 
@@ -13,6 +13,7 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = "localhost"
     POSTGRES_PORT: int = 5432
     DATABASE_URL: Optional[str] = None
+    DB_CREATE_TABLES: bool = True  # create missing tables at startup
 
     # API Security
     API_TOKEN: str = "your-super-secret-token-here"
@@ -20,6 +21,84 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
 
+    # Scheduler
+    EMBEDDED_SCHEDULER: bool = True  # run the scheduler inside the API process
+    WORKER_PROCESSES: int = 1  # processes started by `python -m app.worker`
+    SCHEDULER_SYNC_INTERVAL_SECONDS: int = 30  # pick up created/edited tasks
+    SCHEDULER_FULL_RESYNC_SECONDS: int = 600  # reload every active task
+    # Only load tasks whose next_run_at is this close, 0 = load every active task
+    SCHEDULER_LOOKAHEAD_SECONDS: int = 0
+    SCHEDULER_LISTEN_NOTIFY: bool = True  # apply task changes from pg_notify
+    SCHEDULE_CACHE_SIZE: int = 1024  # distinct (schedule, timezone) pairs kept parsed
+    # Replica coordination: "none", "leader" (failover) or "sharded"
+    SCHEDULER_COORDINATION: Literal["none", "leader", "sharded"] = "none"
+    SCHEDULER_HEARTBEAT_SECONDS: int = 10
+    SCHEDULER_NODE_TTL_SECONDS: int = 30  # a replica silent this long is dead
+    # Record occurrences in task_runs and claim them with SKIP LOCKED
+    SCHEDULER_RUN_LEDGER: bool = False
+    SCHEDULER_RUN_CLAIM_BATCH: int = 500
+    SCHEDULER_RUN_CLAIM_TIMEOUT_SECONDS: int = 900  # reclaim unfinished runs
+    TASK_RUN_RETENTION_DAYS: int = 7  # keep finished runs, 0 = forever
+    # Missed runs replayed after downtime, per misfire policy
+    SCHEDULER_BACKFILL_RATE: float = 5.0  # runs per second
+    SCHEDULER_BACKFILL_BURST: int = 10
+    # Scheduling lag (start of a run minus its scheduled time)
+    SCHEDULER_LAG_SLO_MS: int = 1000  # target p99
+    SCHEDULER_LAG_WINDOW: int = 10000  # recent runs the percentiles cover
+    SCHEDULER_STATS_LOG_SECONDS: int = 60  # log scheduler stats, 0 = never
+
+    # Dispatcher
+    DISPATCH_WORKERS: int = 50  # global concurrency limit
+    DISPATCH_PER_HOST_LIMIT: int = 0  # concurrent tasks per webhook host, 0 = off
+    DISPATCH_QUEUE_SIZE: int = 10000
+    EXECUTOR_PROCESSES: int = 0  # send webhooks from N child processes, 0 = off
+    # Tasks marked batchable that share a webhook URL are posted together
+    BATCH_WINDOW_MS: int = 100  # how long a batch collects, 0 = never batch
+    BATCH_MAX_SIZE: int = 100  # a full batch is sent right away
+
+    # Per-destination rate limits (requests per second for the whole cluster)
+    # keyed by URL prefix, e.g. {"discord.com/api/webhooks": 5}. In sharded
+    # mode each live replica gets an even share, whatever its traffic.
+    DESTINATION_RATE_LIMITS: Dict[str, float] = {}
+    DESTINATION_DEFAULT_RATE: float = 0  # per host without a prefix rule, 0 = off
+    DESTINATION_BURST: float = 0  # 0 = one second's worth
+    # Circuit breaker parking a destination that keeps failing
+    CIRCUIT_BREAKER_FAILURES: int = 5  # consecutive 5xx/connection errors, 0 = off
+    CIRCUIT_BREAKER_COOLDOWN_SECONDS: float = 30
+    CIRCUIT_BREAKER_MAX_COOLDOWN_SECONDS: float = 600
+
+    # Outgoing webhook HTTP connection pool
+    HTTP_POOL_LIMIT: int = 100  # total open connections
+    HTTP_POOL_LIMIT_PER_HOST: int = 20
+    HTTP_DNS_CACHE_TTL: int = 300  # seconds
+    HTTP_KEEPALIVE_TIMEOUT: float = 30  # seconds an idle connection is kept
+
+    # HTTP/2 webhook delivery through httpx, needs the h2 package
+    HTTP2_ENABLED: bool = False  # send every webhook over HTTP/2 where supported
+    HTTP2_DESTINATIONS: List[str] = []  # or only URLs starting with these
+    HTTP2_MAX_CONNECTIONS: int = 20  # each multiplexes many concurrent requests
+
+    # Webhook request timeouts in seconds, unless the task sets its own
+    WEBHOOK_CONNECT_TIMEOUT: float = 5
+    WEBHOOK_READ_TIMEOUT: float = 10  # between bytes of the response
+    WEBHOOK_TOTAL_TIMEOUT: float = 30  # whole request, including the body
+    # Response bodies are streamed: a prefix is kept for the task log and the
+    # rest discarded, closing the connection if the body is larger than this
+    WEBHOOK_RESPONSE_PREFIX_BYTES: int = 512
+    WEBHOOK_RESPONSE_DRAIN_BYTES: int = 65536
+    PAYLOAD_CACHE_SIZE: int = 10000  # tasks whose encoded request body is kept
+
+    # Buffered task log writer
+    TASK_LOG_BATCH_SIZE: int = 500  # records per INSERT
+    TASK_LOG_FLUSH_INTERVAL_MS: int = 200
+    TASK_LOG_BUFFER_SIZE: int = 10000  # writers wait once this many are pending
+
+    # Task log partitioning and retention
+    TASK_LOG_PARTITION_INTERVAL: Literal["day", "month"] = "month"
+    TASK_LOG_PARTITIONS_AHEAD: int = 2  # future partitions kept ready
+    TASK_LOG_RETENTION_DAYS: int = 0  # drop older partitions, 0 = keep forever
+    TASK_LOG_MAINTENANCE_INTERVAL_SECONDS: int = 3600
+
     # Computed database URL
     @property
     def SQLALCHEMY_DATABASE_URL(self) -> str:
@@ -27,6 +106,14 @@ class Settings(BaseSettings):
             return self.DATABASE_URL
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def SQLALCHEMY_ASYNC_DATABASE_URL(self) -> str:
+        # Same database, reached through the asyncpg driver
+        scheme, rest = self.SQLALCHEMY_DATABASE_URL.split("://", 1)
+        if scheme.split("+")[0] in ("postgres", "postgresql"):
+            scheme = "postgresql+asyncpg"
+        return f"{scheme}://{rest}"
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -0,0 +1,167 @@
+import asyncio
+import hashlib
+import os
+import socket
+import time
+import uuid
+from typing import Awaitable, Callable, List, Optional
+from sqlalchemy import delete, select, text
+from sqlalchemy.dialects.postgresql import insert
+from app.models.scheduler_node import SchedulerNode
+from app.core.database import AsyncSessionLocal
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def rendezvous_owner(task_id, nodes: List[str]) -> Optional[str]:
+    """
+    Pick the node that owns a task by rendezvous (highest random weight)
+    hashing. When a node joins or leaves, only the tasks it wins or held
+    move; every other task keeps its owner.
+    """
+    best_node, best_score = None, -1
+    for node in nodes:
+        digest = hashlib.blake2b(f"{node}:{task_id}".encode(), digest_size=8)
+        score = int.from_bytes(digest.digest(), "big")
+        if score > best_score:
+            best_node, best_score = node, score
+    return best_node
+
+
+class SchedulerCoordinator:
+    """
+    Decides which scheduler replica fires which task.
+
+    Every replica keeps a lease row in scheduler_nodes alive with periodic
+    heartbeats; rows whose heartbeat is older than the TTL are considered
+    dead. Modes (SCHEDULER_COORDINATION):
+
+    - "none": a single replica owns every task (the default)
+    - "leader": the longest-running live replica owns every task; another
+      replica takes over once the leader's lease expires
+    - "sharded": tasks are spread over all live replicas by rendezvous
+      hashing, and rebalance automatically when replicas join or leave
+
+    A replica whose own heartbeat has not succeeded within the TTL owns
+    nothing, since the others may already have taken over its tasks.
+
+    With `track_members`, the lease is kept in mode "none" as well, so the
+    live replicas can be counted even though each of them owns every task.
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        on_change: Optional[Callable[[], Awaitable[None]]] = None,
+        track_members: bool = False,
+    ):
+        self.mode = mode or settings.SCHEDULER_COORDINATION
+        self.on_change = on_change
+        self.track_members = track_members
+        self.node_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.members: List[str] = []
+        self._last_heartbeat = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "none"
+
+    @property
+    def heartbeats(self) -> bool:
+        """Whether this replica keeps a lease row in scheduler_nodes"""
+        return self.enabled or self.track_members
+
+    @property
+    def is_leader(self) -> bool:
+        return (
+            self._is_live() and bool(self.members) and self.members[0] == self.node_id
+        )
+
+    def owns(self, task_id) -> bool:
+        """Whether this replica should fire the given task"""
+        if not self.enabled:
+            return True
+        if not self._is_live():
+            return False
+        if self.mode == "leader":
+            return self.is_leader
+        return rendezvous_owner(task_id, self.members) == self.node_id
+
+    async def run_forever(self):
+        """Heartbeat every SCHEDULER_HEARTBEAT_SECONDS until cancelled"""
+        while True:
+            await asyncio.sleep(settings.SCHEDULER_HEARTBEAT_SECONDS)
+            await self.heartbeat()
+
+    async def heartbeat(self):
+        """Renew this replica's lease and refresh the list of live replicas"""
+        if not self.heartbeats:
+            return
+        ttl = f"{settings.SCHEDULER_NODE_TTL_SECONDS} seconds"
+        db = AsyncSessionLocal()
+        try:
+            await db.execute(
+                insert(SchedulerNode)
+                .values(node_id=self.node_id, hostname=socket.gethostname())
+                .on_conflict_do_update(
+                    index_elements=[SchedulerNode.node_id],
+                    set_={"heartbeat_at": text("now()")},
+                )
+            )
+            # Expired leases belong to replicas that died without leaving
+            await db.execute(
+                delete(SchedulerNode).where(
+                    SchedulerNode.heartbeat_at < text(f"now() - interval '{ttl}'")
+                )
+            )
+            result = await db.execute(
+                select(SchedulerNode.node_id).order_by(
+                    SchedulerNode.started_at, SchedulerNode.node_id
+                )
+            )
+            members = list(result.scalars().all())
+            await db.commit()
+        except Exception as e:
+            logger.error(f"Scheduler heartbeat failed: {str(e)}")
+            await db.rollback()
+            return
+        finally:
+            await db.close()
+
+        was_live = self._is_live()
+        self._last_heartbeat = time.monotonic()
+        if members != self.members or not was_live:
+            logger.info(
+                f"Scheduler membership changed: {len(members)} live replicas, "
+                f"this node is {self.node_id}"
+                + (" (leader)" if members and members[0] == self.node_id else "")
+            )
+            self.members = members
+            if self.on_change:
+                await self.on_change()
+
+    async def leave(self):
+        """Give up this replica's lease so the others rebalance immediately"""
+        if not self.heartbeats:
+            return
+        db = AsyncSessionLocal()
+        try:
+            await db.execute(
+                delete(SchedulerNode).where(SchedulerNode.node_id == self.node_id)
+            )
+            await db.commit()
+        except Exception as e:
+            logger.error(f"Error leaving scheduler membership: {str(e)}")
+        finally:
+            await db.close()
+        self.members = []
+        self._last_heartbeat = None
+
+    def _is_live(self) -> bool:
+        return (
+            self._last_heartbeat is not None
+            and time.monotonic() - self._last_heartbeat
+            < settings.SCHEDULER_NODE_TTL_SECONDS
+        )
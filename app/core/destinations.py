@@ -0,0 +1,237 @@
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+from app.core.rate_limit import TokenBucket
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# How long parked attempts wait while a half-open circuit's probe is in flight
+_PROBE_WAIT_SECONDS = 1.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        until = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if until.tzinfo is None:
+        until = until.replace(tzinfo=timezone.utc)
+    return max((until - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def url_target(url: str) -> str:
+    parts = urlsplit(url if "://" in url else f"//{url}")
+    return parts.netloc.lower() + parts.path
+
+
+class _Destination:
+    __slots__ = (
+        "bucket",
+        "rate",
+        "burst",
+        "blocked_until",
+        "failures",
+        "open_until",
+        "cooldown",
+        "probing",
+    )
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.blocked_until = 0.0  # Retry-After deadline
+        self.failures = 0  # consecutive failures
+        self.open_until = 0.0  # circuit open until, 0 = closed
+        self.cooldown = 0.0
+        self.probing = False
+
+
+class DestinationGuard:
+    """
+    Request budget and circuit breaker per webhook destination.
+
+    A destination is the longest DESTINATION_RATE_LIMITS prefix (host plus
+    path, e.g. "discord.com/api/webhooks/123") matching a task's URL, or
+    else its host. Each has:
+
+    - a token bucket of `rate` requests per second, split evenly between the
+      live scheduler replicas sending requests (`replicas`), so the limit
+      holds for the whole cluster. The split is static: in sharded mode a
+      replica whose tasks happen to hit one destination most still only
+      gets its even share of that destination's rate.
+    - a Retry-After deadline set by 429 (or 503 with Retry-After) responses
+    - a circuit breaker that opens after `failure_threshold` consecutive
+      5xx or connection failures; once the cooldown elapses a single probe
+      request is let through, closing the circuit on success and reopening
+      it with a doubled cooldown on failure
+
+    Attempts that are throttled or hit an open circuit are parked by the
+    dispatcher until the destination is usable again, without using up one
+    of the task's retries.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, float]] = None,
+        default_rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        failure_threshold: Optional[int] = None,
+        cooldown: Optional[float] = None,
+        max_cooldown: Optional[float] = None,
+        replicas: Optional[Callable[[], int]] = None,
+    ):
+        limits = settings.DESTINATION_RATE_LIMITS if limits is None else limits
+        self.limits = {url_target(prefix): rate for prefix, rate in limits.items()}
+        self._prefixes = sorted(self.limits, key=len, reverse=True)
+        self.default_rate = (
+            settings.DESTINATION_DEFAULT_RATE if default_rate is None else default_rate
+        )
+        self.burst = settings.DESTINATION_BURST if burst is None else burst
+        self.failure_threshold = (
+            settings.CIRCUIT_BREAKER_FAILURES
+            if failure_threshold is None
+            else failure_threshold
+        )
+        self.cooldown = (
+            settings.CIRCUIT_BREAKER_COOLDOWN_SECONDS if cooldown is None else cooldown
+        )
+        self.max_cooldown = (
+            settings.CIRCUIT_BREAKER_MAX_COOLDOWN_SECONDS
+            if max_cooldown is None
+            else max_cooldown
+        )
+        self.replicas = replicas
+        self.throttled = 0
+        self.circuit_opens = 0
+        self._destinations: Dict[str, _Destination] = {}
+
+    def key(self, url: str) -> str:
+        """The destination a webhook URL belongs to"""
+        target = url_target(url)
+        for prefix in self._prefixes:
+            if target.startswith(prefix):
+                return prefix
+        return target.split("/", 1)[0]
+
+    def acquire(self, url: str) -> float:
+        """
+        Claim a request to the URL's destination. Returns 0 if it may be sent
+        now, otherwise the seconds to wait before asking again.
+        """
+        key = self.key(url)
+        dest = self._destination(key)
+        now = time.monotonic()
+        if dest.blocked_until > now:
+            return dest.blocked_until - now
+        if dest.open_until:
+            if dest.open_until > now:
+                return dest.open_until - now
+            if dest.probing:
+                return _PROBE_WAIT_SECONDS
+        if dest.bucket is not None:
+            self._apply_share(dest)
+            if not dest.bucket.try_acquire():
+                return max(dest.bucket.delay(), 0.001)
+        if dest.open_until:
+            # Half open: this request is the probe
+            dest.probing = True
+        return 0.0
+
+    def record(
+        self,
+        url: str,
+        success: bool,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ) -> float:
+        """
+        Update the destination with the outcome of a request. Returns the
+        seconds it is unusable for if the attempt should be parked rather
+        than counted against the task's retries, otherwise 0.
+        """
+        key = self.key(url)
+        dest = self._destination(key)
+        now = time.monotonic()
+
+        if status == 429 or (status == 503 and retry_after is not None):
+            self.throttled += 1
+            dest.probing = False
+            wait = retry_after if retry_after is not None else self.cooldown
+            dest.blocked_until = max(dest.blocked_until, now + wait)
+            logger.warning(
+                f"Webhook destination {key} is throttling, pausing {wait:.1f}s"
+            )
+            return dest.blocked_until - now
+
+        if success:
+            if dest.open_until:
+                logger.info(f"Circuit for webhook destination {key} closed")
+            dest.failures = 0
+            dest.open_until = 0.0
+            dest.cooldown = 0.0
+            dest.probing = False
+            return 0.0
+
+        if status is not None and status < 500:
+            # The request was rejected, the destination itself is up
+            return 0.0
+
+        dest.failures += 1
+        if dest.probing or (
+            self.failure_threshold and dest.failures >= self.failure_threshold
+        ):
+            if not dest.open_until or dest.open_until <= now:
+                dest.cooldown = (
+                    min(dest.cooldown * 2, self.max_cooldown)
+                    if dest.probing
+                    else self.cooldown
+                )
+                dest.open_until = now + dest.cooldown
+                self.circuit_opens += 1
+                logger.warning(
+                    f"Circuit for webhook destination {key} opened after "
+                    f"{dest.failures} consecutive failures, "
+                    f"retrying in {dest.cooldown:.0f}s"
+                )
+            dest.probing = False
+        if dest.open_until > now:
+            return dest.open_until - now
+        return 0.0
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "destinations": len(self._destinations),
+            "throttled": self.throttled,
+            "circuit_opens": self.circuit_opens,
+            "open_circuits": sorted(
+                key for key, dest in self._destinations.items() if dest.open_until > now
+            ),
+        }
+
+    def _destination(self, key: str) -> _Destination:
+        dest = self._destinations.get(key)
+        if dest is None:
+            rate = self.limits.get(key, self.default_rate)
+            dest = _Destination(rate, self.burst or max(rate, 1))
+            self._destinations[key] = dest
+        return dest
+
+    def _apply_share(self, dest: _Destination):
+        # Every replica enforces its share of the cluster-wide limit
+        replicas = max(self.replicas(), 1) if self.replicas else 1
+        dest.bucket.rate = dest.rate / replicas
+        dest.bucket.burst = max(dest.burst / replicas, 1)
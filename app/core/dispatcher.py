@@ -0,0 +1,385 @@
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from app.models.task import Task
+from app.core.task_executor import TaskExecutor
+from app.core.retry_queue import RetryQueue
+from app.core.batching import WebhookBatcher
+from app.core.http_client import HttpClientPool
+from app.core.http2_client import Http2ClientPool
+from app.core.process_pool import ProcessDeliveryPool
+from app.core.log_sink import TaskLogSink
+from app.core.destinations import DestinationGuard
+from app.core.backoff import retry_delay
+from app.core.lag import LagTracker
+from app.core.payloads import payload_cache
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+Send = Callable[[], Awaitable[None]]
+
+
+class TaskDispatcher:
+    """
+    Runs due tasks on a fixed pool of asyncio workers.
+
+    The number of workers is the global concurrency limit. An optional
+    per-host limit keeps a burst of tasks for one webhook host from taking
+    every worker slot: attempts for a host that is at its limit are set
+    aside, and each request that finishes for that host hands its slot
+    straight to the next one, so no worker sits waiting for a slot.
+
+    Requests also pass a DestinationGuard: attempts against a destination
+    that is rate limited, answered 429 with Retry-After, or whose circuit
+    breaker is open are parked until it is usable again. Parked attempts do
+    not count against the task's retries, so a struggling endpoint cannot
+    get every task pointed at it deactivated.
+
+    Each queue entry is a single attempt. When an attempt fails and the task
+    has retries left, the next attempt is parked in a RetryQueue until its
+    backoff elapses, leaving the worker free to run other tasks meanwhile.
+
+    Attempts of tasks marked batchable are not sent one by one: a
+    WebhookBatcher collects them per URL for BATCH_WINDOW_MS and each group
+    is posted as one JSON array, with every task's outcome logged and
+    retried on its own.
+
+    With EXECUTOR_PROCESSES set, the webhook requests themselves are sent
+    from a ProcessDeliveryPool so they use every core, and the workers only
+    wait for their results.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        per_host_limit: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        executor_factory: Optional[Callable[[], TaskExecutor]] = None,
+        on_complete: Optional[Callable[[Task, bool], Awaitable[None]]] = None,
+        processes: Optional[int] = None,
+        replicas: Optional[Callable[[], int]] = None,
+    ):
+        self.workers = workers or settings.DISPATCH_WORKERS
+        self.per_host_limit = (
+            settings.DISPATCH_PER_HOST_LIMIT
+            if per_host_limit is None
+            else per_host_limit
+        )
+        self.queue: asyncio.Queue = asyncio.Queue(
+            maxsize=queue_size or settings.DISPATCH_QUEUE_SIZE
+        )
+        self.http = HttpClientPool()
+        self.http2 = Http2ClientPool.from_settings()
+        self.log_sink = TaskLogSink()
+        processes = settings.EXECUTOR_PROCESSES if processes is None else processes
+        self.delivery = ProcessDeliveryPool(processes) if processes else None
+        self.executor_factory = executor_factory or (
+            lambda: TaskExecutor(
+                session=self.http.session,
+                log_sink=self.log_sink,
+                delivery=self.delivery,
+                http2=self.http2,
+            )
+        )
+        self.on_complete = on_complete
+        # `replicas` reports how many scheduler replicas share the rate limits
+        self.destinations = DestinationGuard(replicas=replicas)
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.parked = 0
+        self._host_active: Dict[str, int] = {}  # host -> requests holding a slot
+        self._host_waiting: Dict[str, Deque[Send]] = {}  # host -> sends set aside
+        self._running_ids = set()
+        self._scheduled_for: Dict[object, datetime] = {}
+        self._started = set()  # tasks whose current run has had its lag recorded
+        self.lag = LagTracker()
+        self._workers = []
+        self.retries = RetryQueue(self._requeue)
+        self.batches = WebhookBatcher(self._send_batch, concurrency=self.workers)
+
+    def start(self):
+        """Spawn the worker pool"""
+        if self._workers:
+            return
+        if self.delivery:
+            self.delivery.start()
+        # Opened even with delivery processes: batches are sent from here
+        self.http.open()
+        if self.http2:
+            self.http2.open()
+        self.log_sink.start()
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.workers)
+        ]
+        logger.info(
+            f"Task dispatcher started with {self.workers} workers "
+            f"(per-host limit: {self.per_host_limit or 'none'})"
+        )
+
+    async def stop(self, drain: bool = False):
+        """Stop the workers, optionally waiting for queued tasks to finish first"""
+        if drain:
+            await self.join()
+        self.retries.clear()
+        self._host_waiting.clear()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        # After the workers, so none of them starts another batch meanwhile
+        await self.batches.close()
+        await self.http.close()
+        if self.http2:
+            await self.http2.close()
+        if self.delivery:
+            await self.delivery.stop()
+        await self.log_sink.stop()
+        logger.info("Task dispatcher stopped")
+
+    async def submit(
+        self, task: Task, scheduled_for: Optional[datetime] = None
+    ) -> bool:
+        """
+        Queue a task for execution, waiting if the queue is full. Returns
+        False if the occurrence was skipped.
+        """
+        # A slow or retrying task can still be running when its next
+        # occurrence comes due; never run two copies of the same task at once.
+        if task.id in self._running_ids:
+            logger.warning(f"Task {task.id} is still running, skipping this occurrence")
+            return False
+        self._running_ids.add(task.id)
+        if scheduled_for is not None:
+            self._scheduled_for[task.id] = scheduled_for
+        await self.queue.put((task, 1))
+        return True
+
+    def is_running(self, task_id) -> bool:
+        """Whether an attempt of the task is queued, running or waiting to retry"""
+        return task_id in self._running_ids
+
+    async def _requeue(self, task: Task, attempt: int):
+        await self.queue.put((task, attempt))
+
+    async def join(self):
+        """
+        Wait until every queued attempt has been processed, sending batches
+        that are still collecting right away. Retries that are still waiting
+        out their backoff are not waited for.
+        """
+        await self.queue.join()
+        await self.batches.join()
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._workers),
+            "queued": self.queue.qsize(),
+            "in_flight": self.in_flight,
+            "host_waiting": sum(len(sends) for sends in self._host_waiting.values()),
+            "retrying": len(self.retries),
+            "batches": self.batches.stats(),
+            "completed": self.completed,
+            "failed": self.failed,
+            "parked": self.parked,
+            "destinations": self.destinations.stats(),
+            "lag": self.lag.stats(),
+            "http": self.http.stats(),
+            "http2": self.http2.stats() if self.http2 else None,
+            "payload_cache": payload_cache.stats(),
+            "delivery_processes": self.delivery.stats() if self.delivery else None,
+            "task_logs": self.log_sink.stats(),
+        }
+
+    async def _worker(self, number: int):
+        while True:
+            task, attempt = await self.queue.get()
+            try:
+                await self._run(task, attempt)
+            except Exception as e:
+                logger.error(f"Worker {number} failed running task {task.id}: {str(e)}")
+                self._abandon(task)
+            finally:
+                self.queue.task_done()
+
+    async def _run(self, task: Task, attempt: int):
+        if attempt > task.max_retry:
+            # No attempts configured at all
+            await self._finish(task, False)
+            return
+
+        if task.batchable and self.batches.window:
+            # Sent together with other attempts for the same URL by _send_batch
+            self.batches.add(task, attempt)
+            return
+
+        wait_time = self.destinations.acquire(task.webhook_url)
+        if wait_time:
+            self._park(task, attempt, wait_time)
+            return
+
+        await self._with_host_slot(
+            task.webhook_url, lambda: self._deliver(task, attempt)
+        )
+
+    async def _deliver(self, task: Task, attempt: int):
+        scheduled_for = self._scheduled_for.get(task.id)
+        self.in_flight += 1
+        try:
+            lag_ms = self._record_lag(task, scheduled_for)
+            async with self.executor_factory() as executor:
+                success = await executor.execute_task(
+                    task, attempt, scheduled_for=scheduled_for, lag_ms=lag_ms
+                )
+                delivery = executor.last_delivery
+                parked_for = self.destinations.record(
+                    task.webhook_url,
+                    success,
+                    delivery.status if delivery else None,
+                    delivery.retry_after if delivery else None,
+                )
+
+                if not success and not parked_for and attempt >= task.max_retry:
+                    logger.error(
+                        f"Task {task.id} failed after {task.max_retry} retries"
+                    )
+                    # Deactivate the task after max retries
+                    await executor._deactivate_task(task)
+        except Exception as e:
+            logger.error(f"Failed running task {task.id}: {str(e)}")
+            self._abandon(task)
+            return
+        finally:
+            self.in_flight -= 1
+
+        await self._settle(task, attempt, success, parked_for)
+
+    async def _send_batch(self, url: str, items: List[Tuple[Task, int]]):
+        """Send collected attempts for one URL as a single request"""
+        wait_time = self.destinations.acquire(url)
+        if wait_time:
+            for task, attempt in items:
+                self._park(task, attempt, wait_time)
+            return
+        await self._with_host_slot(url, lambda: self._deliver_batch(url, items))
+
+    async def _deliver_batch(self, url: str, items: List[Tuple[Task, int]]):
+        self.in_flight += 1
+        try:
+            entries = []
+            for task, attempt in items:
+                scheduled_for = self._scheduled_for.get(task.id)
+                lag_ms = self._record_lag(task, scheduled_for)
+                entries.append((task, attempt, scheduled_for, lag_ms))
+            async with self.executor_factory() as executor:
+                batch, deliveries = await executor.execute_batch(url, entries)
+                parked_for = self.destinations.record(
+                    url, batch.success, batch.status, batch.retry_after
+                )
+                for (task, attempt), delivery in zip(items, deliveries):
+                    if (
+                        not delivery.success
+                        and not parked_for
+                        and attempt >= task.max_retry
+                    ):
+                        logger.error(
+                            f"Task {task.id} failed after {task.max_retry} retries"
+                        )
+                        await executor._deactivate_task(task)
+        except Exception as e:
+            logger.error(f"Failed sending a batch of {len(items)} tasks: {str(e)}")
+            for task, _ in items:
+                self._abandon(task)
+            return
+        finally:
+            self.in_flight -= 1
+
+        for (task, attempt), delivery in zip(items, deliveries):
+            await self._settle(task, attempt, delivery.success, parked_for)
+
+    async def _with_host_slot(self, url: str, send: Send):
+        """
+        Run `send` in one of the URL host's slots. If they are all taken it
+        is set aside, and the caller returns at once; whoever holds a slot
+        runs the sends set aside for its host before giving the slot up.
+        """
+        if not self.per_host_limit:
+            await send()
+            return
+        host = urlsplit(url).netloc.lower()
+        active = self._host_active.get(host, 0)
+        if active >= self.per_host_limit:
+            self._host_waiting.setdefault(host, deque()).append(send)
+            return
+
+        self._host_active[host] = active + 1
+        try:
+            await send()
+            # Sends handle their own errors, so only cancellation (stop)
+            # leaves any of these behind
+            waiting = self._host_waiting.get(host)
+            while waiting:
+                await waiting.popleft()()
+        finally:
+            self._host_active[host] -= 1
+            if not self._host_active[host]:
+                del self._host_active[host]
+                self._host_waiting.pop(host, None)
+
+    def _record_lag(
+        self, task: Task, scheduled_for: Optional[datetime]
+    ) -> Optional[float]:
+        # Measured once per run, when its first request is about to be sent
+        if scheduled_for is None or task.id in self._started:
+            return None
+        self._started.add(task.id)
+        lag = datetime.now(timezone.utc) - scheduled_for
+        lag_ms = max(lag.total_seconds() * 1000, 0)
+        self.lag.record(lag_ms)
+        return lag_ms
+
+    async def _settle(self, task: Task, attempt: int, success: bool, parked_for: float):
+        if not success and parked_for:
+            # The destination is throttling or down; try the same attempt again
+            self._park(task, attempt, parked_for)
+            return
+
+        if success:
+            logger.info(f"Task {task.id} executed successfully")
+        elif attempt < task.max_retry:
+            wait_time = retry_delay(task, attempt)
+            logger.info(
+                f"Task {task.id} failed, retrying in {wait_time:.1f} seconds... (retry {attempt + 1}/{task.max_retry})"
+            )
+            self.retries.schedule(task, attempt + 1, wait_time)
+            return
+
+        await self._finish(task, success)
+
+    def _park(self, task: Task, attempt: int, wait_time: float):
+        self.parked += 1
+        logger.debug(
+            f"Task {task.id} parked for {wait_time:.1f}s while its destination "
+            f"is unavailable (attempt {attempt}/{task.max_retry})"
+        )
+        self.retries.schedule(task, attempt, wait_time)
+
+    def _abandon(self, task: Task):
+        self._running_ids.discard(task.id)
+        self._scheduled_for.pop(task.id, None)
+        self._started.discard(task.id)
+
+    async def _finish(self, task: Task, success: bool):
+        self._running_ids.discard(task.id)
+        self._scheduled_for.pop(task.id, None)
+        self._started.discard(task.id)
+        if success:
+            self.completed += 1
+        else:
+            self.failed += 1
+        if self.on_complete:
+            await self.on_complete(task, success)
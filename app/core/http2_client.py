@@ -0,0 +1,103 @@
+import httpx
+from collections import Counter
+from typing import List, Optional
+from app.core.destinations import url_target
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class Http2ClientPool:
+    """
+    Long-lived httpx client for webhook destinations reached over HTTP/2.
+
+    aiohttp only speaks HTTP/1.1, where every in-flight request needs its
+    own connection. Over HTTP/2 concurrent requests to the same host are
+    multiplexed as streams over a handful of connections, which suits the
+    few API hosts most tasks post to.
+
+    Used for every webhook with HTTP2_ENABLED, or only for URLs matching a
+    HTTP2_DESTINATIONS prefix (e.g. "discord.com/api/webhooks"). Hosts that
+    do not negotiate HTTP/2 through ALPN are served over HTTP/1.1 instead.
+    With `prior_knowledge` HTTP/2 is spoken without negotiation, which also
+    works over plain http:// (used by the benchmark stub server).
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        destinations: Optional[List[str]] = None,
+        max_connections: Optional[int] = None,
+        prior_knowledge: bool = False,
+    ):
+        self.enabled = settings.HTTP2_ENABLED if enabled is None else enabled
+        destinations = (
+            settings.HTTP2_DESTINATIONS if destinations is None else destinations
+        )
+        self.destinations = tuple(url_target(prefix) for prefix in destinations)
+        self.max_connections = max_connections or settings.HTTP2_MAX_CONNECTIONS
+        self.prior_knowledge = prior_knowledge
+        self.client: Optional[httpx.AsyncClient] = None
+        self.requests_total = 0
+        self.requests_in_flight = 0
+        self.responses_by_version = Counter()
+
+    @classmethod
+    def from_settings(cls) -> Optional["Http2ClientPool"]:
+        """A pool if the settings route any webhook over HTTP/2, else None"""
+        if settings.HTTP2_ENABLED or settings.HTTP2_DESTINATIONS:
+            return cls()
+        return None
+
+    def handles(self, url: str) -> bool:
+        """Whether a webhook URL is sent over HTTP/2"""
+        return self.enabled or url_target(url).startswith(self.destinations)
+
+    def open(self) -> httpx.AsyncClient:
+        if self.client is None:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                raise RuntimeError(
+                    "HTTP/2 webhook delivery needs the h2 package, installed "
+                    "with the http2 extra: pip install '.[http2]'"
+                )
+            self.client = httpx.AsyncClient(
+                http1=not self.prior_knowledge,
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_TIMEOUT,
+                ),
+            )
+            logger.info(
+                f"HTTP/2 client opened ({self.max_connections} connections, "
+                f"destinations: {'all' if self.enabled else ', '.join(self.destinations)})"
+            )
+        return self.client
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            logger.info("HTTP/2 client closed")
+        self.client = None
+
+    def stream(self, url: str, body: bytes, content_type: str, timeout):
+        """Start a POST whose response body can be streamed"""
+        return self.client.stream(
+            "POST",
+            url,
+            content=body,
+            headers={"Content-Type": content_type},
+            timeout=timeout,
+        )
+
+    def stats(self) -> dict:
+        return {
+            "max_connections": self.max_connections,
+            "requests_total": self.requests_total,
+            "requests_in_flight": self.requests_in_flight,
+            "responses_by_version": dict(self.responses_by_version),
+        }
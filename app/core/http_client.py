@@ -0,0 +1,107 @@
+import aiohttp
+from typing import Optional
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class HttpClientPool:
+    """
+    Long-lived aiohttp session shared by every TaskExecutor in the process.
+
+    Reusing one session keeps TCP/TLS connections alive between webhook calls
+    instead of paying a new handshake for every execution. Connection and
+    request counters are collected through aiohttp trace hooks.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        dns_cache_ttl: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+    ):
+        self.limit = limit if limit is not None else settings.HTTP_POOL_LIMIT
+        self.limit_per_host = (
+            limit_per_host
+            if limit_per_host is not None
+            else settings.HTTP_POOL_LIMIT_PER_HOST
+        )
+        self.dns_cache_ttl = (
+            dns_cache_ttl if dns_cache_ttl is not None else settings.HTTP_DNS_CACHE_TTL
+        )
+        self.keepalive_timeout = (
+            keepalive_timeout
+            if keepalive_timeout is not None
+            else settings.HTTP_KEEPALIVE_TIMEOUT
+        )
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.connections_queued = 0
+        self.requests_total = 0
+        self.requests_in_flight = 0
+
+    def open(self) -> aiohttp.ClientSession:
+        """Create the shared session; must be called from the running event loop"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector, trace_configs=[self._trace_config()]
+            )
+            logger.info(
+                f"HTTP connection pool opened (limit {self.limit}, "
+                f"{self.limit_per_host} per host)"
+            )
+        return self.session
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+            logger.info("HTTP connection pool closed")
+        self.session = None
+
+    def stats(self) -> dict:
+        """Pool utilization counters"""
+        return {
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "connections_queued": self.connections_queued,
+            "requests_total": self.requests_total,
+            "requests_in_flight": self.requests_in_flight,
+        }
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+        trace_config.on_connection_queued_start.append(self._on_connection_queued)
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_request_end.append(self._on_request_done)
+        trace_config.on_request_exception.append(self._on_request_done)
+        return trace_config
+
+    async def _on_connection_created(self, session, context, params):
+        self.connections_created += 1
+
+    async def _on_connection_reused(self, session, context, params):
+        self.connections_reused += 1
+
+    async def _on_connection_queued(self, session, context, params):
+        # The pool was exhausted and the request had to wait for a connection
+        self.connections_queued += 1
+
+    async def _on_request_start(self, session, context, params):
+        self.requests_total += 1
+        self.requests_in_flight += 1
+
+    async def _on_request_done(self, session, context, params):
+        self.requests_in_flight -= 1
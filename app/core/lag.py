@@ -0,0 +1,40 @@
+import math
+from collections import deque
+from typing import Optional
+from app.core.config import settings
+
+
+class LagTracker:
+    """
+    Sliding window of scheduling lags: how late each run started compared to
+    the time it was scheduled for.
+    """
+
+    def __init__(self, window: Optional[int] = None, slo_ms: Optional[int] = None):
+        self.slo_ms = slo_ms or settings.SCHEDULER_LAG_SLO_MS
+        self._samples = deque(maxlen=window or settings.SCHEDULER_LAG_WINDOW)
+        self.total = 0
+
+    def record(self, lag_ms: float):
+        self._samples.append(lag_ms)
+        self.total += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The q-th percentile (0-100) of the window, by nearest rank"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(math.ceil(q / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+    def stats(self) -> dict:
+        p99 = self.percentile(99)
+        return {
+            "samples": len(self._samples),
+            "total": self.total,
+            "p50_ms": self.percentile(50),
+            "p99_ms": p99,
+            "max_ms": max(self._samples) if self._samples else None,
+            "slo_ms": self.slo_ms,
+            "slo_met": p99 is None or p99 <= self.slo_ms,
+        }
@@ -0,0 +1,160 @@
+import asyncio
+import uuid
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import insert
+from app.models.task_log import TaskLog
+from app.core.database import AsyncSessionLocal
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_STOP = object()
+
+
+class TaskLogSink:
+    """
+    Buffers TaskLog records and writes them in batches.
+
+    Records are flushed with one multi-row INSERT per transaction, either
+    once `batch_size` records are buffered or `flush_interval_ms` after the
+    first record of a batch arrived, whichever comes first. When the buffer
+    is full, writers wait (back-pressure) instead of growing memory without
+    bound. stop() drains everything still buffered.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval_ms: Optional[int] = None,
+        max_buffer: Optional[int] = None,
+    ):
+        self.batch_size = batch_size or settings.TASK_LOG_BATCH_SIZE
+        self.flush_interval = (
+            flush_interval_ms or settings.TASK_LOG_FLUSH_INTERVAL_MS
+        ) / 1000
+        self.queue: asyncio.Queue = asyncio.Queue(
+            maxsize=max_buffer or settings.TASK_LOG_BUFFER_SIZE
+        )
+        self.written = 0
+        self.failed = 0
+        self._flusher: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush every buffered record and stop the background flusher"""
+        if self._flusher is None:
+            return
+        await self.queue.put(_STOP)
+        await self._flusher
+        self._flusher = None
+        logger.info(f"Task log sink stopped ({self.written} records written)")
+
+    async def write(
+        self,
+        task_id,
+        status: str,
+        retry_count: int,
+        message: str,
+        execution_time: Optional[datetime] = None,
+        scheduled_for: Optional[datetime] = None,
+        lag_ms: Optional[float] = None,
+    ):
+        """Buffer one TaskLog record, waiting if the buffer is full"""
+        await self.queue.put(
+            {
+                "id": uuid.uuid4(),
+                "task_id": task_id,
+                "execution_time": execution_time or datetime.utcnow(),
+                "status": status,
+                "retry_count": retry_count,
+                "message": message,
+                "scheduled_for": scheduled_for,
+                "lag_ms": lag_ms,
+                "created_at": datetime.utcnow(),
+            }
+        )
+
+    def stats(self) -> dict:
+        return {
+            "buffered": self.queue.qsize(),
+            "written": self.written,
+            "failed": self.failed,
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            record = await self.queue.get()
+            if record is _STOP:
+                break
+            batch = [record]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    record = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if record is _STOP:
+                    stopping = True
+                    break
+                batch.append(record)
+            await self._flush(batch)
+
+        # Drain whatever was buffered behind the stop marker
+        batch = []
+        while not self.queue.empty():
+            record = self.queue.get_nowait()
+            if record is not _STOP:
+                batch.append(record)
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch = []
+        if batch:
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[dict]):
+        """
+        Write a batch in one INSERT, retrying once. If that fails again the
+        records are written one at a time, so a single bad record or a
+        transient error only loses the records that cannot be written.
+        """
+        for attempt in (1, 2):
+            try:
+                await self._insert(batch)
+                self.written += len(batch)
+                return
+            except Exception as e:
+                logger.error(
+                    f"Error writing {len(batch)} task logs "
+                    f"(attempt {attempt}): {str(e)}"
+                )
+
+        for record in batch:
+            try:
+                await self._insert([record])
+                self.written += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(
+                    f"Error writing task log of task {record['task_id']}: {str(e)}"
+                )
+
+    async def _insert(self, records: List[dict]):
+        db = AsyncSessionLocal()
+        try:
+            await db.execute(insert(TaskLog), records)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            await db.close()
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from app.models.task import Task
+from app.core.schedules import _aware, compile_schedule
+
+
+def missed_occurrences(
+    schedule: str,
+    since: datetime,
+    until: datetime,
+    limit: int,
+    tz: Optional[str] = None,
+) -> List[datetime]:
+    """
+    Return the latest `limit` fire times in the window (since, until), oldest
+    first.
+
+    The schedule is walked backwards from `until`, so the cost is bounded by
+    `limit` however long the window is.
+    """
+    since = _aware(since)
+    parsed = compile_schedule(schedule, tz)
+    missed = []
+    fire_time = _aware(until)
+    while len(missed) < limit:
+        fire_time = parsed.prev_before(fire_time)
+        if fire_time <= since:
+            break
+        missed.append(fire_time)
+    missed.reverse()
+    return missed
+
+
+def catch_up_times(
+    task: Task, last_fired: Optional[datetime], now: datetime
+) -> List[datetime]:
+    """
+    Return the occurrences of a task to fire now according to its misfire
+    policy, given when it last fired (or None if it never did).
+
+    - "skip": none, missed occurrences are dropped
+    - "fire_once": the latest missed occurrence, standing in for all of them
+    - "fire_all": every missed occurrence, at most max_backfill of them
+
+    Only occurrences within misfire_grace_seconds before now are considered.
+    """
+    policy = task.misfire_policy or "skip"
+    if policy == "skip":
+        return []
+
+    grace = task.misfire_grace_seconds
+    since = _aware(now) - timedelta(seconds=3600 if grace is None else grace)
+    if last_fired is not None and _aware(last_fired) > since:
+        since = _aware(last_fired)
+    if task.created_at is not None and _aware(task.created_at) > since:
+        since = _aware(task.created_at)
+
+    limit = 1 if policy == "fire_once" else max(task.max_backfill or 1, 1)
+    return missed_occurrences(task.schedule, since, now, limit, task.timezone)
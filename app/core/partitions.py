@@ -0,0 +1,264 @@
+import asyncio
+import re
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import text
+from app.core.database import async_engine
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+PARENT_TABLE = "task_logs"
+_PARTITION_NAME = re.compile(r"^task_logs_p(\d{4})_(\d{2})(?:_(\d{2}))?$")
+_RANGE_BOUND = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+# name -> [start, end) range, or None for the default partition
+Partitions = Dict[str, Optional[Tuple[datetime, datetime]]]
+
+
+def partition_bounds(moment: datetime, interval: str) -> Tuple[datetime, datetime]:
+    """Return the [start, end) range of the partition that contains moment"""
+    if interval == "day":
+        start = datetime(moment.year, moment.month, moment.day)
+        return start, start + timedelta(days=1)
+    start = datetime(moment.year, moment.month, 1)
+    if start.month == 12:
+        return start, start.replace(year=start.year + 1, month=1)
+    return start, start.replace(month=start.month + 1)
+
+
+def partition_name(start: datetime, interval: str) -> str:
+    if interval == "day":
+        return f"{PARENT_TABLE}_p{start:%Y_%m_%d}"
+    return f"{PARENT_TABLE}_p{start:%Y_%m}"
+
+
+def parse_partition_name(name: str) -> Optional[Tuple[datetime, datetime]]:
+    """Return the range covered by a partition this module created, if any"""
+    match = _PARTITION_NAME.match(name)
+    if not match:
+        return None
+    year, month, day = match.groups()
+    if day:
+        return partition_bounds(datetime(int(year), int(month), int(day)), "day")
+    return partition_bounds(datetime(int(year), int(month), 1), "month")
+
+
+def parse_partition_bound(bound: str) -> Optional[Tuple[datetime, datetime]]:
+    """Range of a partition from its pg_get_expr(relpartbound), None if DEFAULT"""
+    match = _RANGE_BOUND.search(bound)
+    if not match:
+        return None
+    return datetime.fromisoformat(match.group(1)), datetime.fromisoformat(
+        match.group(2)
+    )
+
+
+def overlapping_partitions(
+    start: datetime, end: datetime, partitions: Partitions
+) -> List[Tuple[str, Tuple[datetime, datetime]]]:
+    """Existing range partitions that share part of [start, end)"""
+    return sorted(
+        (
+            (name, bounds)
+            for name, bounds in partitions.items()
+            if bounds and bounds[0] < end and start < bounds[1]
+        ),
+        key=lambda partition: partition[1],
+    )
+
+
+def covered(
+    start: datetime,
+    end: datetime,
+    overlaps: List[Tuple[str, Tuple[datetime, datetime]]],
+) -> bool:
+    """Whether the overlapping partitions together cover all of [start, end)"""
+    for _, (lower, upper) in overlaps:
+        if lower > start:
+            return False
+        start = max(start, upper)
+    return start >= end
+
+
+class TaskLogPartitionManager:
+    """
+    Maintains the range partitions of task_logs.
+
+    Partitions (daily or monthly, by execution_time) are created a few periods
+    ahead so inserts never land in the default partition, and partitions that
+    fall entirely outside the retention window are detached and dropped, which
+    is much cheaper than deleting their rows.
+
+    The bounds of the existing partitions are read from the catalog, so
+    partitions of another interval (e.g. the monthly ones the migration
+    created, after switching to "day") are respected rather than collided
+    with. Rows that landed in the default partition before their range got
+    a partition are moved into it when it is created.
+
+    With `should_run`, maintenance is skipped on replicas for which it
+    returns False, so only one scheduler replica does it.
+    """
+
+    def __init__(
+        self,
+        interval: Optional[str] = None,
+        ahead: Optional[int] = None,
+        retention_days: Optional[int] = None,
+        should_run: Optional[Callable[[], bool]] = None,
+    ):
+        self.should_run = should_run
+        self.interval = interval or settings.TASK_LOG_PARTITION_INTERVAL
+        self.ahead = ahead if ahead is not None else settings.TASK_LOG_PARTITIONS_AHEAD
+        self.retention_days = (
+            retention_days
+            if retention_days is not None
+            else settings.TASK_LOG_RETENTION_DAYS
+        )
+
+    async def run_forever(self):
+        """Run maintenance now and then every TASK_LOG_MAINTENANCE_INTERVAL_SECONDS"""
+        while True:
+            try:
+                if self.should_run is None or self.should_run():
+                    await self.run_once()
+            except Exception as e:
+                logger.error(f"Error maintaining task log partitions: {str(e)}")
+            await asyncio.sleep(settings.TASK_LOG_MAINTENANCE_INTERVAL_SECONDS)
+
+    async def run_once(self, now: Optional[datetime] = None):
+        now = now or datetime.utcnow()
+        await self.ensure_partitions(now)
+        if self.retention_days:
+            await self.drop_expired_partitions(now)
+
+    def planned_partitions(self, now: datetime) -> List[Tuple[str, datetime, datetime]]:
+        """The current partition and the `ahead` partitions after it"""
+        partitions = []
+        start, end = partition_bounds(now, self.interval)
+        for _ in range(self.ahead + 1):
+            partitions.append((partition_name(start, self.interval), start, end))
+            start, end = partition_bounds(end, self.interval)
+        return partitions
+
+    def expired_partitions(self, names: List[str], now: datetime) -> List[str]:
+        """Partitions whose whole range is older than the retention window"""
+        cutoff = now - timedelta(days=self.retention_days)
+        expired = []
+        for name in names:
+            bounds = parse_partition_name(name)
+            if bounds and bounds[1] <= cutoff:
+                expired.append(name)
+        return sorted(expired)
+
+    async def existing_partitions(self) -> Partitions:
+        async with async_engine.connect() as conn:
+            result = await conn.execute(
+                text(
+                    "SELECT child.relname, "
+                    "pg_get_expr(child.relpartbound, child.oid) FROM pg_inherits "
+                    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                    "WHERE pg_inherits.inhparent = CAST(:parent AS regclass)"
+                ),
+                {"parent": PARENT_TABLE},
+            )
+            return {name: parse_partition_bound(bound) for name, bound in result}
+
+    async def ensure_partitions(self, now: datetime):
+        partitions = await self.existing_partitions()
+        default = next(
+            (name for name, bounds in partitions.items() if bounds is None), None
+        )
+        for name, start, end in self.planned_partitions(now):
+            if name in partitions:
+                continue
+            overlaps = overlapping_partitions(start, end, partitions)
+            if overlaps:
+                if not covered(start, end, overlaps):
+                    logger.warning(
+                        f"Not creating partition {name}: its range overlaps "
+                        f"{', '.join(other for other, _ in overlaps)}, and logs "
+                        f"in the rest of it go to the default partition "
+                        f"(TASK_LOG_PARTITION_INTERVAL is {self.interval})"
+                    )
+                continue
+            try:
+                moved = await self._create_partition(name, start, end, default)
+            except Exception as e:
+                logger.error(f"Error creating partition {name}: {str(e)}")
+                continue
+            partitions[name] = (start, end)
+            if moved:
+                logger.info(f"Moved {moved} task logs from {default} into {name}")
+
+    async def _create_partition(
+        self, name: str, start: datetime, end: datetime, default: Optional[str]
+    ) -> int:
+        """
+        Create a partition, moving the rows of its range out of the default
+        partition, which would otherwise make Postgres refuse to create it.
+        Returns the number of rows moved.
+        """
+        in_range = "execution_time >= :start AND execution_time < :end"
+        bounds = {"start": start, "end": end}
+        async with async_engine.begin() as conn:
+            stranded = 0
+            if default:
+                stranded = (
+                    await conn.execute(
+                        text(f"SELECT count(*) FROM {default} WHERE {in_range}"),
+                        bounds,
+                    )
+                ).scalar()
+            if stranded:
+                # Inserts wait on the lock until the transaction commits
+                await conn.execute(
+                    text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {default}")
+                )
+            await conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF "
+                    f"{PARENT_TABLE} FOR VALUES FROM ('{start.isoformat()}') "
+                    f"TO ('{end.isoformat()}')"
+                )
+            )
+            if stranded:
+                await conn.execute(
+                    text(
+                        f"INSERT INTO {name} SELECT * FROM {default} WHERE {in_range}"
+                    ),
+                    bounds,
+                )
+                await conn.execute(
+                    text(f"DELETE FROM {default} WHERE {in_range}"), bounds
+                )
+                await conn.execute(
+                    text(
+                        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {default} DEFAULT"
+                    )
+                )
+            return stranded
+
+    async def drop_expired_partitions(self, now: datetime):
+        partitions = await self.existing_partitions()
+        for name in self.expired_partitions(list(partitions), now):
+            async with async_engine.begin() as conn:
+                await conn.execute(
+                    text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}")
+                )
+                await conn.execute(text(f"DROP TABLE {name}"))
+            logger.info(f"Dropped expired task log partition {name}")
+
+        # Rows of ranges that never got a partition can only be deleted
+        cutoff = now - timedelta(days=self.retention_days)
+        for name, bounds in partitions.items():
+            if bounds is not None:
+                continue
+            async with async_engine.begin() as conn:
+                result = await conn.execute(
+                    text(f"DELETE FROM {name} WHERE execution_time < :cutoff"),
+                    {"cutoff": cutoff},
+                )
+            if result.rowcount:
+                logger.info(f"Deleted {result.rowcount} expired task logs from {name}")
@@ -0,0 +1,216 @@
+import json
+import re
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional, Set, Tuple
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # optional: faster encoding when installed
+    orjson = None
+
+JSON_CONTENT_TYPE = "application/json"
+
+# Variables a templated payload can use as {{name}}
+TEMPLATE_VARIABLES = ("scheduled_for", "fired_at", "attempt", "task.id", "task.name")
+
+# A placeholder that is a whole JSON string ("{{attempt}}") is replaced by
+# the JSON value; one inside a longer string by the escaped text. An opening
+# quote is never preceded by a backslash, while an escaped one always is.
+_PLACEHOLDER = re.compile(rb'(?<!\\)"\{\{\s*([\w.]+)\s*\}\}"|\{\{\s*([\w.]+)\s*\}\}')
+
+
+def encode_json(value) -> bytes:
+    """Compact JSON encoding, with orjson when it is available"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            # e.g. integers wider than 64 bits, which the stdlib handles
+            pass
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def template_variables(payload) -> Set[str]:
+    """Names of the {{placeholders}} used anywhere in a payload"""
+    return {
+        (match.group(1) or match.group(2)).decode()
+        for match in _PLACEHOLDER.finditer(encode_json(payload or {}))
+    }
+
+
+def _encode_variable(value, whole_string: bool) -> bytes:
+    if type(value) is int:
+        return str(value).encode()
+    text = str(value)
+    if text.isprintable() and '"' not in text and "\\" not in text:
+        # Nothing to escape, skip the encoder
+        encoded = text.encode()
+        return b'"' + encoded + b'"' if whole_string else encoded
+    encoded = encode_json(text)
+    return encoded if whole_string else encoded[1:-1]
+
+
+class PayloadTemplate:
+    """
+    A request body compiled once per task version.
+
+    The encoded JSON is split around its {{variable}} placeholders, so a
+    render only joins the literal segments with the encoded values instead
+    of walking and re-encoding the payload. Values that are fixed for the
+    task version (`constants`, e.g. task.name) are substituted while
+    compiling. Bodies without placeholders, or of tasks that don't use
+    templating, are returned as they are.
+    """
+
+    __slots__ = ("body", "names", "_parts")
+
+    def __init__(
+        self, body: bytes, templated: bool = False, constants: Optional[dict] = None
+    ):
+        self.body = body
+        self.names = frozenset()
+        self._parts = None
+        if not templated:
+            return
+        constants = constants or {}
+        parts, literal, position = [], [], 0
+        for match in _PLACEHOLDER.finditer(body):
+            name = (match.group(1) or match.group(2)).decode()
+            if name not in TEMPLATE_VARIABLES:
+                continue  # left as written
+            whole_string = match.group(1) is not None
+            literal.append(body[position : match.start()])
+            position = match.end()
+            if name in constants:
+                literal.append(_encode_variable(constants[name], whole_string))
+            else:
+                parts.append(b"".join(literal))
+                parts.append((name, whole_string))
+                literal = []
+        literal.append(body[position:])
+        if parts:
+            parts.append(b"".join(literal))
+            self._parts = parts
+            self.names = frozenset(part[0] for part in parts[1::2])
+        else:
+            self.body = b"".join(literal)
+
+    @property
+    def templated(self) -> bool:
+        return self._parts is not None
+
+    def render(self, variables: dict) -> bytes:
+        if self._parts is None:
+            return self.body
+        rendered = []
+        for part in self._parts:
+            if isinstance(part, bytes):
+                rendered.append(part)
+            else:
+                rendered.append(_encode_variable(variables[part[0]], part[1]))
+        return b"".join(rendered)
+
+
+def template_constants(task) -> dict:
+    """Template variables that only change with the task version"""
+    return {"task.id": str(task.id), "task.name": task.name}
+
+
+def template_context(
+    attempt: int = 1,
+    scheduled_for: Optional[datetime] = None,
+    names=TEMPLATE_VARIABLES,
+) -> dict:
+    """Values of the per-fire template variables in `names`"""
+    context = {}
+    if "attempt" in names:
+        context["attempt"] = attempt
+    if "fired_at" in names or ("scheduled_for" in names and scheduled_for is None):
+        fired_at = datetime.now(timezone.utc)
+        context["fired_at"] = fired_at.isoformat()
+    if "scheduled_for" in names:
+        if scheduled_for is None:
+            context["scheduled_for"] = context["fired_at"]
+        else:
+            context["scheduled_for"] = _format_scheduled_for(scheduled_for)
+    return context
+
+
+@lru_cache(maxsize=64)
+def _format_scheduled_for(scheduled_for: datetime) -> str:
+    # Tasks due together share their scheduled time, so format it once
+    if scheduled_for.tzinfo is not None:
+        scheduled_for = scheduled_for.astimezone(timezone.utc)
+    return scheduled_for.isoformat()
+
+
+class PayloadCache:
+    """
+    LRU cache of compiled webhook request bodies keyed by task id.
+
+    An entry is only valid for the task version (updated_at) it was encoded
+    from, so an edited payload is re-encoded on its next fire even in a
+    process that never saw the edit. Tasks without an updated_at (not yet
+    stored) are encoded on every call.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self.maxsize = maxsize or settings.PAYLOAD_CACHE_SIZE
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, task, attempt: int = 1, scheduled_for: Optional[datetime] = None
+    ) -> Tuple[bytes, str]:
+        """Return the task's request body for an attempt and its content type"""
+        template = self.compile(task)
+        if not template.templated:
+            return template.body, JSON_CONTENT_TYPE
+        context = template_context(attempt, scheduled_for, template.names)
+        return template.render(context), JSON_CONTENT_TYPE
+
+    def compile(self, task) -> PayloadTemplate:
+        """The task's compiled body, encoding it if its version isn't cached"""
+        entry = self._entries.get(task.id)
+        if entry is not None and entry[0] == task.updated_at:
+            self.hits += 1
+            self._entries.move_to_end(task.id)
+            return entry[1]
+
+        self.misses += 1
+        templated = bool(task.payload_template)
+        template = PayloadTemplate(
+            encode_json(task.payload or {}),
+            templated,
+            template_constants(task) if templated else None,
+        )
+        if task.updated_at is not None:
+            self._entries[task.id] = (task.updated_at, template)
+            self._entries.move_to_end(task.id)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return template
+
+    def invalidate(self, task_id):
+        self._entries.pop(task_id, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "encoder": "orjson" if orjson is not None else "json",
+        }
+
+
+payload_cache = PayloadCache()
@@ -0,0 +1,207 @@
+import asyncio
+import itertools
+import multiprocessing
+import queue
+import signal
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+from app.core.task_executor import Delivery
+from app.core.config import settings
+from app.core.logging_config import setup_logging, get_logger
+
+logger = get_logger(__name__)
+
+_LIVENESS_CHECK_SECONDS = 1.0
+
+# Task attributes a delivery process needs to send the request
+_TASK_FIELDS = (
+    "id",
+    "name",
+    "updated_at",
+    "webhook_url",
+    "payload",
+    "payload_template",
+    "connect_timeout",
+    "read_timeout",
+    "total_timeout",
+)
+
+
+def _child_main(requests, results):
+    """Entry point of a delivery process"""
+    # The parent decides when children stop, through the request queue
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    setup_logging()
+    asyncio.run(_serve(requests, results))
+
+
+async def _serve(requests, results):
+    from app.core.http_client import HttpClientPool
+    from app.core.http2_client import Http2ClientPool
+    from app.core.task_executor import TaskExecutor
+
+    http = HttpClientPool()
+    http2 = Http2ClientPool.from_settings()
+    if http2:
+        http2.open()
+    executor = TaskExecutor(session=http.open(), http2=http2)
+    loop = asyncio.get_running_loop()
+    pending = set()
+
+    async def deliver(request_id, task, attempt, scheduled_for):
+        delivery = await executor.deliver(task, attempt, scheduled_for)
+        results.put((request_id, *delivery))
+
+    while True:
+        item = await loop.run_in_executor(None, requests.get)
+        if item is None:
+            break
+        request_id, fields, attempt, scheduled_for = item
+        task = SimpleNamespace(**fields)
+        delivery = asyncio.create_task(
+            deliver(request_id, task, attempt, scheduled_for)
+        )
+        pending.add(delivery)
+        delivery.add_done_callback(pending.discard)
+
+    await asyncio.gather(*pending, return_exceptions=True)
+    await http.close()
+    if http2:
+        await http2.close()
+
+
+class ProcessDeliveryPool:
+    """
+    Sends webhook requests from a pool of child processes.
+
+    A single event loop tops out at a few thousand webhook requests per
+    second, since payload encoding, TLS and response parsing share one core.
+    Each child runs its own event loop and pooled HTTP session; the parent
+    hands every request to the least busy child and awaits its result, while
+    logging, retries and bookkeeping stay in the parent.
+
+    A child that dies fails its outstanding requests and is replaced.
+    """
+
+    def __init__(self, processes: Optional[int] = None):
+        self.processes = processes or settings.EXECUTOR_PROCESSES
+        self._context = multiprocessing.get_context("spawn")
+        self._children: List[Tuple[multiprocessing.Process, object]] = []
+        self._results = None
+        self._reader: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[int, Tuple[int, asyncio.Future]] = {}
+        self._load: List[int] = []
+        self._ids = itertools.count()
+        self._running = False
+        self.restarts = 0
+
+    def start(self):
+        """Start the child processes; must be called from the running event loop"""
+        if self._running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._results = self._context.Queue()
+        self._children = [self._spawn(i) for i in range(self.processes)]
+        self._load = [0] * self.processes
+        self._running = True
+        self._reader = threading.Thread(
+            target=self._read_results, name="delivery-results", daemon=True
+        )
+        self._reader.start()
+        logger.info(f"Webhook delivery pool started with {self.processes} processes")
+
+    async def stop(self):
+        """Let the children finish their requests, then stop them"""
+        if not self._running:
+            return
+        self._running = False
+        for _, requests in self._children:
+            requests.put(None)
+        for process, _ in self._children:
+            await self._loop.run_in_executor(None, process.join, 10)
+            if process.is_alive():
+                process.terminate()
+        self._results.put(None)
+        await self._loop.run_in_executor(None, self._reader.join)
+        self._fail_pending(lambda child: True, "executor pool stopped")
+        self._children = []
+        logger.info("Webhook delivery pool stopped")
+
+    async def deliver(
+        self, task, attempt: int = 1, scheduled_for: Optional[datetime] = None
+    ) -> Delivery:
+        """Send a task's webhook request from a child process"""
+        if not self._running:
+            return Delivery(
+                False, "Task execution failed: executor pool is not running"
+            )
+        child = min(range(len(self._children)), key=self._load.__getitem__)
+        request_id = next(self._ids)
+        future = self._loop.create_future()
+        self._pending[request_id] = (child, future)
+        self._load[child] += 1
+        fields = {name: getattr(task, name) for name in _TASK_FIELDS}
+        self._children[child][1].put((request_id, fields, attempt, scheduled_for))
+        return await future
+
+    def stats(self) -> dict:
+        return {
+            "processes": len(self._children),
+            "pending": len(self._pending),
+            "restarts": self.restarts,
+        }
+
+    def _spawn(self, index: int):
+        requests = self._context.Queue()
+        process = self._context.Process(
+            target=_child_main,
+            args=(requests, self._results),
+            name=f"webhook-delivery-{index}",
+            daemon=True,
+        )
+        process.start()
+        return process, requests
+
+    def _read_results(self):
+        # Runs in a thread: blocking queue reads must stay off the event loop
+        while True:
+            try:
+                item = self._results.get(timeout=_LIVENESS_CHECK_SECONDS)
+            except queue.Empty:
+                if self._running:
+                    self._loop.call_soon_threadsafe(self._check_children)
+                continue
+            if item is None:
+                return
+            self._loop.call_soon_threadsafe(self._resolve, *item)
+
+    def _resolve(self, request_id: int, *outcome):
+        entry = self._pending.pop(request_id, None)
+        if entry is None:
+            return
+        child, future = entry
+        self._load[child] -= 1
+        if not future.done():
+            future.set_result(Delivery(*outcome))
+
+    def _check_children(self):
+        if not self._running:
+            return
+        for index, (process, _) in enumerate(self._children):
+            if process.is_alive():
+                continue
+            logger.error(
+                f"Webhook delivery process {process.name} exited with code "
+                f"{process.exitcode}, restarting it"
+            )
+            self._fail_pending(lambda child: child == index, "executor process exited")
+            self._children[index] = self._spawn(index)
+            self.restarts += 1
+
+    def _fail_pending(self, belongs, reason: str):
+        for request_id, (child, future) in list(self._pending.items()):
+            if belongs(child):
+                self._resolve(request_id, False, f"Task execution failed: {reason}")
@@ -0,0 +1,35 @@
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter: up to `burst` acquisitions at once, refilled
+    at `rate` tokens per second.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take tokens if they are available right now"""
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    def delay(self, tokens: float = 1) -> float:
+        """Seconds until `tokens` will be available"""
+        self._refill()
+        if self._tokens >= tokens:
+            return 0.0
+        return (tokens - self._tokens) / self.rate
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
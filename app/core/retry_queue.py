@@ -0,0 +1,51 @@
+import asyncio
+from typing import Awaitable, Callable, Dict
+from app.models.task import Task
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class RetryQueue:
+    """
+    In-memory queue of delayed retries.
+
+    A failed attempt is parked here with a timer instead of sleeping in the
+    worker, so the worker can pick up other tasks while the backoff elapses.
+    When the timer fires the next attempt is handed back to `resubmit`.
+    """
+
+    def __init__(self, resubmit: Callable[[Task, int], Awaitable[None]]):
+        self.resubmit = resubmit
+        self._timers: Dict[object, asyncio.TimerHandle] = {}
+        self._requeues = set()
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def schedule(self, task: Task, attempt: int, delay: float):
+        """Run `attempt` of `task` after `delay` seconds"""
+        self.cancel(task.id)
+        loop = asyncio.get_running_loop()
+        self._timers[task.id] = loop.call_later(delay, self._fire, task, attempt)
+
+    def cancel(self, task_id):
+        timer = self._timers.pop(task_id, None)
+        if timer:
+            timer.cancel()
+
+    def clear(self):
+        """Drop every pending retry"""
+        if self._timers:
+            logger.warning(f"Discarding {len(self._timers)} pending retries")
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for requeue in self._requeues:
+            requeue.cancel()
+
+    def _fire(self, task: Task, attempt: int):
+        self._timers.pop(task.id, None)
+        requeue = asyncio.ensure_future(self.resubmit(task, attempt))
+        self._requeues.add(requeue)
+        requeue.add_done_callback(self._requeues.discard)
@@ -0,0 +1,222 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import and_, delete, func, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from app.models.task_run import TaskRun
+from app.core.database import AsyncSessionLocal
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+FINISHED_STATUSES = ("done", "failed", "skipped")
+
+# Rows per INSERT; each row has 5 bind parameters and asyncpg allows 32767
+RECORD_CHUNK_SIZE = 5000
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    # task_runs stores naive UTC timestamps, like the rest of the schema
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+class TaskRunLedger:
+    """
+    Durable record of scheduled occurrences, keyed by (task_id, scheduled_for).
+
+    A due occurrence is first recorded as a pending row; recording the same
+    occurrence twice, from this node or another one, is a no-op. Dispatchers
+    then claim pending rows in batches with SELECT ... FOR UPDATE SKIP LOCKED,
+    so concurrent claimers never wait on each other and every occurrence is
+    handed to exactly one of them. Claims that are never finished (the
+    claiming process died) become claimable again after
+    SCHEDULER_RUN_CLAIM_TIMEOUT_SECONDS. A live claimer renews the claims of
+    runs it is still executing, retrying or parking, and releases them on
+    shutdown.
+    """
+
+    def __init__(
+        self,
+        node_id: str,
+        batch_size: Optional[int] = None,
+        claim_timeout: Optional[int] = None,
+        retention_days: Optional[int] = None,
+    ):
+        self.node_id = node_id
+        self.batch_size = batch_size or settings.SCHEDULER_RUN_CLAIM_BATCH
+        self.claim_timeout = (
+            settings.SCHEDULER_RUN_CLAIM_TIMEOUT_SECONDS
+            if claim_timeout is None
+            else claim_timeout
+        )
+        self.retention_days = (
+            settings.TASK_RUN_RETENTION_DAYS
+            if retention_days is None
+            else retention_days
+        )
+
+    async def record(self, occurrences: Iterable[Tuple[object, datetime]]):
+        """Record due (task_id, scheduled_for) occurrences as pending runs"""
+        rows = [
+            {"task_id": task_id, "scheduled_for": _naive_utc(scheduled_for)}
+            for task_id, scheduled_for in occurrences
+        ]
+        if not rows:
+            return
+        db = AsyncSessionLocal()
+        try:
+            for start in range(0, len(rows), RECORD_CHUNK_SIZE):
+                chunk = rows[start : start + RECORD_CHUNK_SIZE]
+                await db.execute(
+                    insert(TaskRun)
+                    .values(
+                        [
+                            {**row, "status": "pending", "claim_count": 0}
+                            for row in chunk
+                        ]
+                    )
+                    .on_conflict_do_nothing(
+                        index_elements=[TaskRun.task_id, TaskRun.scheduled_for]
+                    )
+                )
+            await db.commit()
+        finally:
+            await db.close()
+
+    async def claim(
+        self, now: Optional[datetime] = None
+    ) -> List[Tuple[object, datetime]]:
+        """
+        Claim up to batch_size due runs for this node and return their
+        (task_id, scheduled_for) keys, oldest first.
+        """
+        now = _naive_utc(now or datetime.now(timezone.utc))
+        stale = now - timedelta(seconds=self.claim_timeout)
+        due = (
+            select(TaskRun.task_id, TaskRun.scheduled_for)
+            .where(
+                or_(
+                    and_(TaskRun.status == "pending", TaskRun.scheduled_for <= now),
+                    and_(TaskRun.status == "claimed", TaskRun.claimed_at < stale),
+                )
+            )
+            .order_by(TaskRun.scheduled_for)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        db = AsyncSessionLocal()
+        try:
+            result = await db.execute(
+                update(TaskRun)
+                .where(tuple_(TaskRun.task_id, TaskRun.scheduled_for).in_(due))
+                .values(
+                    status="claimed",
+                    claimed_by=self.node_id,
+                    claimed_at=now,
+                    claim_count=TaskRun.claim_count + 1,
+                )
+                .returning(TaskRun.task_id, TaskRun.scheduled_for)
+            )
+            keys = sorted(
+                ((row.task_id, row.scheduled_for) for row in result),
+                key=lambda key: key[1],
+            )
+            await db.commit()
+            return keys
+        finally:
+            await db.close()
+
+    async def renew(self, keys: Iterable[Tuple[object, datetime]]):
+        """Refresh claimed_at of this node's runs that are still executing"""
+        keys = [(task_id, _naive_utc(scheduled_for)) for task_id, scheduled_for in keys]
+        if not keys:
+            return
+        db = AsyncSessionLocal()
+        try:
+            await db.execute(
+                update(TaskRun)
+                .where(
+                    tuple_(TaskRun.task_id, TaskRun.scheduled_for).in_(keys),
+                    TaskRun.status == "claimed",
+                    TaskRun.claimed_by == self.node_id,
+                )
+                .values(claimed_at=datetime.utcnow())
+            )
+            await db.commit()
+        finally:
+            await db.close()
+
+    async def release(self, keys: Iterable[Tuple[object, datetime]]):
+        """Hand this node's unfinished runs back so another node claims them"""
+        keys = [(task_id, _naive_utc(scheduled_for)) for task_id, scheduled_for in keys]
+        if not keys:
+            return
+        db = AsyncSessionLocal()
+        try:
+            await db.execute(
+                update(TaskRun)
+                .where(
+                    tuple_(TaskRun.task_id, TaskRun.scheduled_for).in_(keys),
+                    TaskRun.status == "claimed",
+                    TaskRun.claimed_by == self.node_id,
+                )
+                .values(status="pending", claimed_by=None, claimed_at=None)
+            )
+            await db.commit()
+        finally:
+            await db.close()
+
+    async def last_scheduled(self, task_ids) -> dict:
+        """Latest recorded occurrence of each task"""
+        db = AsyncSessionLocal()
+        try:
+            result = await db.execute(
+                select(TaskRun.task_id, func.max(TaskRun.scheduled_for))
+                .where(TaskRun.task_id.in_(task_ids))
+                .group_by(TaskRun.task_id)
+            )
+            return {task_id: last for task_id, last in result}
+        finally:
+            await db.close()
+
+    async def finish(self, task_id, scheduled_for: datetime, status: str):
+        """Mark a claimed run as done, failed or skipped"""
+        db = AsyncSessionLocal()
+        try:
+            await db.execute(
+                update(TaskRun)
+                .where(
+                    TaskRun.task_id == task_id,
+                    TaskRun.scheduled_for == _naive_utc(scheduled_for),
+                    TaskRun.claimed_by == self.node_id,
+                )
+                .values(status=status, finished_at=datetime.utcnow())
+            )
+            await db.commit()
+        except Exception as e:
+            logger.error(f"Error finishing run of task {task_id}: {str(e)}")
+        finally:
+            await db.close()
+
+    async def prune(self):
+        """Delete finished runs older than the retention window"""
+        if not self.retention_days:
+            return
+        cutoff = datetime.utcnow() - timedelta(days=self.retention_days)
+        db = AsyncSessionLocal()
+        try:
+            result = await db.execute(
+                delete(TaskRun).where(
+                    TaskRun.status.in_(FINISHED_STATUSES),
+                    TaskRun.scheduled_for < cutoff,
+                )
+            )
+            await db.commit()
+            if result.rowcount:
+                logger.info(f"Pruned {result.rowcount} finished task runs")
+        except Exception as e:
+            logger.error(f"Error pruning task runs: {str(e)}")
+        finally:
+            await db.close()
@@ -0,0 +1,76 @@
+import heapq
+import itertools
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class ScheduleQueue:
+    """
+    Min-heap of schedule entries keyed by their next fire time.
+
+    Rescheduling or removing an entry does not search the heap: the old heap
+    item is simply invalidated and skipped when it reaches the top, so every
+    operation stays O(log n) in the number of scheduled entries.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int, Hashable]] = []
+        self._entries: Dict[Hashable, Tuple[datetime, int]] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def push(self, key: Hashable, fire_time: datetime):
+        """Schedule (or reschedule) an entry to fire at fire_time"""
+        seq = next(self._counter)
+        self._entries[key] = (fire_time, seq)
+        heapq.heappush(self._heap, (fire_time, seq, key))
+        self._compact()
+
+    def remove(self, key: Hashable):
+        """Unschedule an entry, if present"""
+        self._entries.pop(key, None)
+
+    def fire_time(self, key: Hashable) -> Optional[datetime]:
+        """Return the fire time an entry is currently scheduled for"""
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def peek_time(self) -> Optional[datetime]:
+        """Return the earliest fire time in the queue, or None if it is empty"""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> List[Tuple[Hashable, datetime]]:
+        """
+        Remove and return every entry whose fire time is at or before now,
+        as (key, fire_time) pairs in fire-time order.
+        """
+        due = []
+        while True:
+            self._discard_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return due
+            fire_time, _, key = heapq.heappop(self._heap)
+            del self._entries[key]
+            due.append((key, fire_time))
+
+    def _discard_stale(self):
+        while self._heap:
+            fire_time, seq, key = self._heap[0]
+            if self._entries.get(key) == (fire_time, seq):
+                return
+            heapq.heappop(self._heap)
+
+    def _compact(self):
+        # Rebuild once invalidated items outnumber live ones, so memory stays
+        # proportional to the number of scheduled entries.
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [
+                (fire_time, seq, key) for key, (fire_time, seq) in self._entries.items()
+            ]
+            heapq.heapify(self._heap)
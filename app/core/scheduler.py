@@ -1,25 +1,100 @@
 import asyncio
-from datetime import datetime, timezone
-from croniter import croniter
+import json
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
 from app.models.task import Task
-from app.core.database import SessionLocal
-from app.core.task_executor import TaskExecutor
+from sqlalchemy import func, or_, select, update
+from app.models.task_log import TaskLog
+from app.core.database import AsyncSessionLocal
+from app.core.dispatcher import TaskDispatcher
+from app.core.schedule_queue import ScheduleQueue
+from app.core.partitions import TaskLogPartitionManager
+from app.core.coordination import SchedulerCoordinator
+from app.core.run_ledger import TaskRunLedger
+from app.core.misfire import catch_up_times, missed_occurrences
+from app.core.rate_limit import TokenBucket
+from app.core.schedules import compile_schedule, schedule_cache
+from app.core.task_changes import TaskChangeListener
+from app.core.config import settings
 from app.core.logging_config import get_logger
-from sqlalchemy import and_
 
 logger = get_logger(__name__)
 
+# Task ids per IN list; asyncpg allows 32767 bind parameters per statement
+ID_CHUNK_SIZE = 10000
+
 
 class TaskScheduler:
     def __init__(self):
         self.running = False
         self.last_check = None
+        # Heap entries are groups of tasks sharing a schedule, timezone and
+        # next fire time, so tasks with a common schedule cost one entry
+        self.queue = ScheduleQueue()
+        self._groups = {}  # (schedule, timezone, fire time) -> task ids
+        self._task_group = {}  # task id -> its key in _groups
+        self._tasks = {}  # task id -> detached Task snapshot
+        self._next_run_updates = {}  # task id -> next_run_at not yet stored
+        self.lookahead = settings.SCHEDULER_LOOKAHEAD_SECONDS
+        self._sync_watermark = None  # highest Task.updated_at seen so far
+        self._next_sync = None
+        self._next_full_resync = None
+        self._wakeup = asyncio.Event()
+        # Replicas are counted in ledger mode, where all of them send requests
+        self.coordinator = SchedulerCoordinator(
+            on_change=self._on_membership_change,
+            track_members=settings.SCHEDULER_RUN_LEDGER,
+        )
+        self.dispatcher = TaskDispatcher(
+            on_complete=self._on_task_complete, replicas=self._live_replicas
+        )
+        self.partitions = TaskLogPartitionManager(should_run=self._runs_maintenance)
+        self.ledger = (
+            TaskRunLedger(self.coordinator.node_id)
+            if settings.SCHEDULER_RUN_LEDGER
+            else None
+        )
+        self._claimed = {}  # task id -> scheduled_for of its run being executed
+        # task id -> scheduled_for of claimed runs waiting for the one executing
+        self._waiting_runs = {}
+        self._unrecorded = []  # due occurrences the ledger failed to record
+        self._next_claim_renewal = None
+        self._caught_up = False
+        self._backfill = deque()  # (task id, scheduled_for) of missed runs
+        self._backfill_blocked = False
+        self._backfill_limiter = TokenBucket(
+            settings.SCHEDULER_BACKFILL_RATE, settings.SCHEDULER_BACKFILL_BURST
+        )
+        self.listener = (
+            TaskChangeListener(
+                on_change=self._wakeup.set, on_connect=self._on_listener_connect
+            )
+            if settings.SCHEDULER_LISTEN_NOTIFY
+            else None
+        )
+        self._next_stats_log = None
+        self._maintenance = None
+        self._heartbeat = None
+        self._listening = None
 
     async def start(self):
         """Start the task scheduler"""
         self.running = True
         self.last_check = datetime.now(timezone.utc)
-        logger.info("Task scheduler started")
+        self.dispatcher.start()
+        if self.listener:
+            self._listening = asyncio.create_task(self.listener.run_forever())
+        if self.coordinator.heartbeats:
+            await self.coordinator.heartbeat()
+            self._heartbeat = asyncio.create_task(self.coordinator.run_forever())
+        # Started after the first heartbeat, which tells whether this is the leader
+        self._maintenance = asyncio.create_task(self.partitions.run_forever())
+        logger.info(
+            f"Task scheduler started (coordination: {self.coordinator.mode}, "
+            f"node {self.coordinator.node_id})"
+        )
 
         while self.running:
             try:
@@ -27,90 +102,606 @@ class TaskScheduler:
                 logger.debug(
                     f"Scheduler check - Last: {self.last_check.isoformat()}, Current: {current_time.isoformat()}"
                 )
-                await self._check_and_execute_tasks(self.last_check, current_time)
+                await self._sync_tasks(current_time)
+                await self._check_and_execute_tasks(current_time)
+                await self._store_next_runs()
+                if self._backfill:
+                    await self._drain_backfill()
+                if self._unrecorded:
+                    await self._record([])
+                if self.ledger:
+                    await self._renew_claims(current_time)
+                    await self._dispatch_claimed_runs(current_time)
                 self.last_check = current_time
+                self._log_stats(current_time)
 
-                # Check every minute
-                await asyncio.sleep(60)
+                await self._sleep_until_next_deadline()
             except Exception as e:
                 logger.error(f"Error in scheduler: {str(e)}")
-                await asyncio.sleep(60)
+                await asyncio.sleep(settings.SCHEDULER_SYNC_INTERVAL_SECONDS)
 
     async def stop(self):
         """Stop the task scheduler"""
         self.running = False
+        self._wakeup.set()
+        if self._maintenance:
+            self._maintenance.cancel()
+        if self._heartbeat:
+            self._heartbeat.cancel()
+        if self._listening:
+            self._listening.cancel()
+        await self.coordinator.leave()
+        await self.dispatcher.stop()
+        held = self._held_runs()
+        if self.ledger and held:
+            # Let another node pick up the runs cut short, instead of waiting
+            # for their claims to time out
+            try:
+                await self.ledger.release(held)
+                logger.info(f"Released {len(held)} unfinished runs")
+            except Exception as e:
+                logger.error(f"Error releasing unfinished runs: {str(e)}")
+            self._claimed.clear()
+            self._waiting_runs.clear()
         logger.info("Task scheduler stopped")
 
-    async def _check_and_execute_tasks(
-        self, last_check: datetime, current_time: datetime
-    ):
-        """Check for tasks that need to be executed and execute them"""
-        db = SessionLocal()
+    def stats(self) -> dict:
+        return {
+            "tracked_tasks": len(self._tasks),
+            "schedule_groups": len(self._groups),
+            "backfill": len(self._backfill),
+            "listening": self._live_registry,
+            "schedule_cache": schedule_cache.stats(),
+            "dispatcher": self.dispatcher.stats(),
+        }
+
+    def _log_stats(self, current_time: datetime):
+        """Log stats() as JSON every SCHEDULER_STATS_LOG_SECONDS"""
+        interval = settings.SCHEDULER_STATS_LOG_SECONDS
+        if not interval or (
+            self._next_stats_log is not None and current_time < self._next_stats_log
+        ):
+            return
+        self._next_stats_log = current_time + timedelta(seconds=interval)
+        logger.info(f"Scheduler stats: {json.dumps(self.stats(), default=str)}")
+
+    async def _sleep_until_next_deadline(self):
+        """
+        Sleep until the earliest scheduled fire time, or until the next task
+        sync or backfill slot if that comes first. stop() interrupts the sleep.
+        """
+        now = datetime.now(timezone.utc)
+        deadline = self._next_sync
+        next_fire = self.queue.peek_time()
+        if next_fire is not None and next_fire < deadline:
+            deadline = next_fire
+        if self._backfill and not self._backfill_blocked:
+            next_slot = now + timedelta(seconds=self._backfill_limiter.delay())
+            if next_slot < deadline:
+                deadline = next_slot
+
+        timeout = max((deadline - now).total_seconds(), 0)
+        self._wakeup.clear()
         try:
-            # Get all active tasks
-            tasks = db.query(Task).filter(Task.status == "active").all()
-
-            if tasks:
-                logger.debug(f"Checking {len(tasks)} active tasks")
-
-            for task in tasks:
-                logger.debug(f"Checking task {task.id} with schedule '{task.schedule}'")
-                if self._should_execute_task(task, last_check, current_time):
-                    # Refresh task from database to ensure it's still active
-                    db.refresh(task)
-                    if task.status != "active":
-                        logger.debug(f"Task {task.id} is no longer active, skipping")
-                        continue
-                    
-                    logger.info(f"Executing task {task.id}: {task.name}")
-
-                    # Execute task with retry logic
-                    async with TaskExecutor() as executor:
-                        success = await executor.execute_task_with_retry(task)
-                        
-                        # If task was deactivated during execution, refresh and skip
-                        if not success:
-                            db.refresh(task)
-                            if task.status != "active":
-                                logger.debug(f"Task {task.id} was deactivated during execution, skipping")
-                                continue
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _sync_tasks(self, current_time: datetime):
+        """
+        Bring the in-memory schedule up to date with the database.
+
+        Only tasks changed since the last sync are loaded, so cron expressions
+        are evaluated for new or edited tasks only. A periodic full resync
+        catches anything the incremental pass could not see, such as deleted
+        tasks or transactions that committed out of order.
+
+        With SCHEDULER_LOOKAHEAD_SECONDS set, every sync interval instead loads
+        only the active tasks whose next_run_at falls within the lookahead
+        window, so memory and sync cost follow the number of tasks due soon.
+
+        While change notifications are being received, the incremental pass
+        is replaced by loading just the tasks that were reported as changed.
+        """
+        resync = (
+            self._next_full_resync is None or current_time >= self._next_full_resync
+        )
+        sync_due = self._next_sync is None or current_time >= self._next_sync
+        full = resync or (self.lookahead > 0 and sync_due)
+        if full or sync_due:
+            # Moved on while listening too, as the loop sleeps until _next_sync
+            self._next_sync = current_time + timedelta(
+                seconds=settings.SCHEDULER_SYNC_INTERVAL_SECONDS
+            )
+        if not full and self._live_registry:
+            await self._apply_task_changes(current_time)
+            return
+        if not full and not sync_due:
+            return
+
+        db = AsyncSessionLocal()
+        try:
+            query = select(Task)
+            if full:
+                query = query.where(Task.status == "active")
+                if self.lookahead > 0:
+                    horizon = current_time + timedelta(seconds=self.lookahead)
+                    query = query.where(
+                        or_(
+                            Task.next_run_at.is_(None),
+                            Task.next_run_at <= horizon.replace(tzinfo=None),
+                        )
+                    )
+            else:
+                query = query.where(Task.updated_at >= self._sync_watermark)
+            tasks = (await db.execute(query)).scalars().all()
         except Exception as e:
-            logger.error(f"Error checking tasks: {str(e)}")
+            logger.error(f"Error loading tasks: {str(e)}")
+            return
         finally:
-            db.close()
+            await db.close()
+
+        seen = set()
+        for task in tasks:
+            seen.add(task.id)
+            self._track_task(task, current_time)
+            if task.updated_at and (
+                self._sync_watermark is None or task.updated_at > self._sync_watermark
+            ):
+                self._sync_watermark = task.updated_at
+
+        if full:
+            for task_id in [task_id for task_id in self._tasks if task_id not in seen]:
+                self._untrack_task(task_id)
+            logger.debug(f"Full resync loaded {len(tasks)} active tasks")
+        elif tasks:
+            logger.debug(f"Incremental sync picked up {len(tasks)} changed tasks")
+
+        if resync:
+            self._next_full_resync = current_time + timedelta(
+                seconds=settings.SCHEDULER_FULL_RESYNC_SECONDS
+            )
+            if self.ledger:
+                await self.ledger.prune()
+
+        if self._sync_watermark is None:
+            self._sync_watermark = datetime.utcnow()
+
+        if full and not self._caught_up:
+            self._caught_up = await self._plan_catch_up(current_time)
+
+    @property
+    def _live_registry(self) -> bool:
+        """Whether change notifications keep the task snapshots current"""
+        return self.listener is not None and self.listener.connected
+
+    async def _apply_task_changes(self, current_time: datetime):
+        changes = self.listener.drain()
+        if not changes:
+            return
+        task_ids = [UUID(task_id) for task_id in changes]
+        tasks = await self._load_tasks(task_ids)
+        if tasks is None:
+            # The changes are lost; reload everything instead
+            self._next_full_resync = None
+            return
+        for task_id in task_ids:
+            task = tasks.get(task_id)
+            if task is None:
+                self._untrack_task(task_id)
+            else:
+                self._track_task(task, current_time)
+        logger.debug(f"Applied {len(task_ids)} task change notifications")
+
+    def _on_listener_connect(self):
+        # Changes made while not listening were missed
+        self._next_full_resync = None
+        self._wakeup.set()
 
-    def _should_execute_task(
-        self, task: Task, last_check: datetime, current_time: datetime
-    ) -> bool:
+    async def _plan_catch_up(self, current_time: datetime) -> bool:
         """
-        Check if a task should be executed based on its schedule.
-        We determine this by checking if we've moved from a time before the scheduled
-        execution to a time at or after it.
+        Queue the occurrences missed while no scheduler was running, according
+        to each task's misfire policy. Returns False if it has to be retried.
         """
+        tasks = [
+            task
+            for task in self._tasks.values()
+            if (task.misfire_policy or "skip") != "skip"
+        ]
+        if not tasks:
+            return True
         try:
-            # Create a cron iterator based on the last check time
-            cron = croniter(task.schedule, last_check)
+            last_fired = await self._last_fired_times([task.id for task in tasks])
+        except Exception as e:
+            logger.error(f"Error loading last run times for catch-up: {str(e)}")
+            return False
 
-            # Get the next scheduled execution time after last_check
-            next_execution = cron.get_next(datetime)
+        missed = []
+        for task in tasks:
+            for scheduled_for in catch_up_times(
+                task, last_fired.get(task.id), current_time
+            ):
+                missed.append((scheduled_for, task.id))
+        missed.sort()
+        self._backfill.extend(
+            (task_id, scheduled_for) for scheduled_for, task_id in missed
+        )
+        if missed:
+            logger.info(f"Queued {len(missed)} missed runs for catch-up")
+        return True
 
-            # Log scheduler information for debugging
-            logger.debug(
-                f"Task {task.id}: Last check: {last_check.isoformat()}, "
-                f"Next execution: {next_execution.isoformat()}, "
-                f"Current time: {current_time.isoformat()}"
+    async def _last_fired_times(self, task_ids) -> dict:
+        """When each task last fired, from the run ledger or else its logs"""
+        if self.ledger:
+            return await self.ledger.last_scheduled(task_ids)
+        db = AsyncSessionLocal()
+        try:
+            # The occurrence a log belongs to, not when its attempt ran (retries
+            # and slow deliveries run later); logs written before scheduled_for
+            # was recorded only have their attempt time
+            result = await db.execute(
+                select(
+                    TaskLog.task_id,
+                    func.coalesce(
+                        func.max(TaskLog.scheduled_for),
+                        func.max(TaskLog.execution_time),
+                    ),
+                )
+                .where(TaskLog.task_id.in_(task_ids))
+                .group_by(TaskLog.task_id)
             )
+            return {task_id: last for task_id, last in result}
+        finally:
+            await db.close()
+
+    async def _drain_backfill(self):
+        """
+        Fire missed runs as fast as the backfill rate limit allows, so a
+        restart does not flood the webhooks. Runs of a task that is still
+        executing wait for it to finish.
+        """
+        occurrences = []
+        deferred = []
+        busy = set()
+        exhausted = True
+        while self._backfill:
+            task_id, scheduled_for = self._backfill[0]
+            task = self._tasks.get(task_id)
+            if task is None:
+                # Deactivated, deleted or handed to another replica
+                self._backfill.popleft()
+                continue
+            if task_id in busy or self.dispatcher.is_running(task_id):
+                deferred.append(self._backfill.popleft())
+                continue
+            if not self._backfill_limiter.try_acquire():
+                exhausted = False
+                break
+            self._backfill.popleft()
+            busy.add(task_id)
+            await self._fire(task, scheduled_for, occurrences)
+
+        self._backfill.extendleft(reversed(deferred))
+        self._backfill_blocked = exhausted and bool(deferred)
+        await self._record(occurrences)
+
+    def _track_task(self, task: Task, current_time: datetime):
+        """Add, reschedule or drop a task according to its latest state"""
+        if task.status != "active" or not self.coordinator.owns(task.id):
+            self._untrack_task(task.id)
+            return
+
+        known = self._tasks.get(task.id)
+        self._tasks[task.id] = task
+        if (
+            known is not None
+            and known.schedule == task.schedule
+            and known.timezone == task.timezone
+            and task.id in self._task_group
+        ):
+            return
+        self._schedule_task(task, current_time)
+
+    def _untrack_task(self, task_id):
+        self._tasks.pop(task_id, None)
+        self._next_run_updates.pop(task_id, None)
+        self._unschedule_task(task_id)
+
+    def _schedule_task(self, task: Task, current_time: datetime):
+        """Queue the task's next occurrence with the tasks that share it"""
+        self._unschedule_task(task.id)
+        stored = task.next_run_at and task.next_run_at.replace(tzinfo=timezone.utc)
+        if stored and stored > current_time:
+            # Stored on write as the first occurrence after that write
+            next_execution = stored
+        else:
+            next_execution = self._next_fire_time(task, current_time)
+            if next_execution is None:
+                return
+            self._next_run_updates[task.id] = next_execution
+        key = (task.schedule, task.timezone, next_execution)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = set()
+            self.queue.push(key, next_execution)
+        group.add(task.id)
+        self._task_group[task.id] = key
+
+    def _unschedule_task(self, task_id):
+        key = self._task_group.pop(task_id, None)
+        group = self._groups.get(key)
+        if group is None:
+            return
+        group.discard(task_id)
+        if not group:
+            del self._groups[key]
+            self.queue.remove(key)
+
+    async def _check_and_execute_tasks(self, current_time: datetime):
+        """
+        Pop the tasks that are due and hand them to the dispatcher, or record
+        them in the run ledger when it is enabled
+        """
+        due = []
+        for key, scheduled_for in self.queue.pop_due(current_time):
+            for task_id in self._groups.pop(key, ()):
+                self._task_group.pop(task_id, None)
+                due.append((task_id, scheduled_for))
+        if not due:
+            return
+
+        logger.debug(f"{len(due)} tasks due")
+        if self._live_registry:
+            # Change notifications already keep the snapshots current
+            fresh = self._tasks
+        else:
+            fresh = await self._load_tasks([task_id for task_id, _ in due])
+            if fresh is None:
+                # Fall back to the snapshots rather than dropping the due tasks
+                fresh = self._tasks
 
-            # Check if the next execution time is at or before the current time
-            # This means we've crossed into or past the scheduled execution time
-            should_execute = next_execution <= current_time
+        occurrences = []
+        for task_id, scheduled_for in due:
+            # Check the fresh copy to ensure the task is still active and has
+            # not been rescheduled since it was queued
+            task = fresh.get(task_id)
+            if task is None or task.status != "active":
+                logger.debug(f"Task {task_id} is no longer active, skipping")
+                self._untrack_task(task_id)
+                continue
+            if not self.coordinator.owns(task_id):
+                # Ownership moved to another replica, or this replica's lease
+                # lapsed and another one may already be firing it
+                logger.debug(f"Task {task_id} is not owned by this node, skipping")
+                self._untrack_task(task_id)
+                continue
 
-            if should_execute:
-                logger.info(
-                    f"Task {task.id} scheduled for {next_execution.isoformat()} should execute now"
+            known = self._tasks.get(task_id)
+            self._tasks[task_id] = task
+            self._schedule_task(task, current_time)
+            if known is not None and (
+                known.schedule != task.schedule or known.timezone != task.timezone
+            ):
+                logger.debug(f"Task {task_id} was rescheduled, skipping")
+                continue
+
+            if task.misfire_policy == "fire_all":
+                # Occurrences that came due while the scheduler was lagging
+                grace = timedelta(seconds=task.misfire_grace_seconds or 0)
+                lagged = missed_occurrences(
+                    task.schedule,
+                    max(scheduled_for, current_time - grace),
+                    current_time,
+                    task.max_backfill or 1,
+                    task.timezone,
                 )
+                self._backfill.extend((task_id, when) for when in lagged)
+            await self._fire(task, scheduled_for, occurrences)
+
+        await self._record(occurrences)
+
+    async def _store_next_runs(self):
+        """
+        Write recomputed next_run_at values back, one UPDATE per fire time and
+        chunk of ids. The values are dropped after a failed write rather than
+        retried on every loop: a stale next_run_at is recomputed whenever the
+        task is loaded again.
+        """
+        if not self._next_run_updates:
+            return
+        by_time = {}
+        for task_id, next_run in self._next_run_updates.items():
+            by_time.setdefault(next_run, []).append(task_id)
+        self._next_run_updates = {}
+        db = AsyncSessionLocal()
+        try:
+            for next_run, task_ids in by_time.items():
+                for start in range(0, len(task_ids), ID_CHUNK_SIZE):
+                    chunk = task_ids[start : start + ID_CHUNK_SIZE]
+                    await db.execute(
+                        update(Task).where(Task.id.in_(chunk))
+                        # Keep updated_at so this does not look like an edit
+                        .values(
+                            next_run_at=next_run.replace(tzinfo=None),
+                            updated_at=Task.updated_at,
+                        )
+                    )
+            await db.commit()
+        except Exception as e:
+            logger.error(f"Error storing next run times: {str(e)}")
+            await db.rollback()
+        finally:
+            await db.close()
+
+    async def _fire(self, task: Task, scheduled_for: datetime, occurrences: list):
+        """Dispatch one occurrence, or collect it for the run ledger"""
+        if self.ledger:
+            occurrences.append((task.id, scheduled_for))
+            return
+        logger.info(
+            f"Dispatching task {task.id}: {task.name} (scheduled for {scheduled_for.isoformat()})"
+        )
+        await self.dispatcher.submit(task, scheduled_for)
+
+    async def _record(self, occurrences: list):
+        if self._unrecorded:
+            occurrences = self._unrecorded + occurrences
+            self._unrecorded = []
+        if not occurrences:
+            return
+        try:
+            await self.ledger.record(occurrences)
+        except Exception as e:
+            # Kept and recorded on a later pass; recording is idempotent
+            logger.error(
+                f"Error recording {len(occurrences)} due runs, will retry: {str(e)}"
+            )
+            self._unrecorded = occurrences
+
+    async def _dispatch_claimed_runs(self, current_time: datetime):
+        """
+        Claim due runs from the ledger, including runs recorded by other nodes
+        and stale claims of nodes that died, and dispatch them. Claimed runs
+        of a task that is still executing an earlier run wait for it.
+        """
+        try:
+            claimed = await self.ledger.claim(current_time)
+        except Exception as e:
+            logger.error(f"Error claiming due runs: {str(e)}")
+            claimed = []
+        ready = [
+            (task_id, runs[0])
+            for task_id, runs in self._waiting_runs.items()
+            if task_id not in self._claimed
+        ]
+        if not claimed and not ready:
+            return
 
-            return should_execute
+        tasks = await self._load_tasks(
+            {task_id for task_id, _ in claimed} | {task_id for task_id, _ in ready}
+        )
+        if tasks is None:
+            tasks = self._tasks
+
+        for task_id, scheduled_for in ready:
+            runs = self._waiting_runs[task_id]
+            runs.popleft()
+            if not runs:
+                del self._waiting_runs[task_id]
+            await self._start_run(tasks.get(task_id), task_id, scheduled_for)
+
+        for task_id, scheduled_for in claimed:
+            scheduled_for = scheduled_for.replace(tzinfo=timezone.utc)
+            if self._claimed.get(task_id) == scheduled_for or (
+                scheduled_for in self._waiting_runs.get(task_id, ())
+            ):
+                # This node's own run, whose claim lapsed while it was still
+                # retrying or waiting; it is reported when it finishes
+                continue
+            if task_id in self._claimed:
+                # Never run two occurrences of a task at once
+                self._waiting_runs.setdefault(task_id, deque()).append(scheduled_for)
+                continue
+            await self._start_run(tasks.get(task_id), task_id, scheduled_for)
+
+    async def _start_run(self, task: Optional[Task], task_id, scheduled_for: datetime):
+        if task is None or task.status != "active":
+            await self.ledger.finish(task_id, scheduled_for, "skipped")
+            return
+        logger.info(
+            f"Dispatching task {task.id}: {task.name} (scheduled for {scheduled_for.isoformat()})"
+        )
+        if await self.dispatcher.submit(task, scheduled_for):
+            self._claimed[task_id] = scheduled_for
+        else:
+            # Busy with a run this node did not claim; claimed again later
+            await self.ledger.release([(task_id, scheduled_for)])
+
+    def _held_runs(self) -> list:
+        """(task id, scheduled_for) of the runs this node claimed and not finished"""
+        held = list(self._claimed.items())
+        for task_id, runs in self._waiting_runs.items():
+            held.extend((task_id, scheduled_for) for scheduled_for in runs)
+        return held
+
+    async def _renew_claims(self, current_time: datetime):
+        """
+        Keep the claims of runs that are still executing, retrying, parked or
+        waiting fresh, so they are not claimed again by another node
+        """
+        held = self._held_runs()
+        if not held:
+            return
+        if self._next_claim_renewal and current_time < self._next_claim_renewal:
+            return
+        try:
+            await self.ledger.renew(held)
+        except Exception as e:
+            logger.error(f"Error renewing {len(held)} run claims: {str(e)}")
+            return
+        self._next_claim_renewal = current_time + timedelta(
+            seconds=self.ledger.claim_timeout / 3
+        )
+
+    def _live_replicas(self) -> int:
+        # Replicas splitting the per-destination rate limits between them.
+        # With the run ledger every replica claims and sends runs; otherwise
+        # only the owners do, which in leader mode is the leader alone
+        if not self.ledger and self.coordinator.mode != "sharded":
+            return 1
+        return len(self.coordinator.members)
+
+    def _runs_maintenance(self) -> bool:
+        # Task log partitions are maintained by the leader replica only
+        return not self.coordinator.enabled or self.coordinator.is_leader
+
+    async def _on_membership_change(self):
+        if not self.coordinator.enabled:
+            # Only counted for the rate limits; every replica owns every task
+            return
+        # Ownership of some tasks moved; reload every active task to pick up
+        # newly owned ones (tasks handed off are dropped as they are tracked)
+        self._next_full_resync = None
+        self._wakeup.set()
+
+    async def _on_task_complete(self, task: Task, success: bool):
+        if self._backfill_blocked:
+            # A missed run may have been waiting for this task to finish
+            self._backfill_blocked = False
+            self._wakeup.set()
+        scheduled_for = self._claimed.pop(task.id, None)
+        if scheduled_for is not None:
+            await self.ledger.finish(
+                task.id, scheduled_for, "done" if success else "failed"
+            )
+            if task.id in self._waiting_runs:
+                # Its next claimed run can start now
+                self._wakeup.set()
+        # A failed task with retries configured has been deactivated
+        if not success and task.max_retry > 0:
+            self._untrack_task(task.id)
+
+    async def _load_tasks(self, task_ids) -> Optional[dict]:
+        """Fetch the current state of the given tasks, one query per chunk of ids"""
+        task_ids = list(task_ids)
+        tasks = {}
+        db = AsyncSessionLocal()
+        try:
+            for start in range(0, len(task_ids), ID_CHUNK_SIZE):
+                chunk = task_ids[start : start + ID_CHUNK_SIZE]
+                result = await db.execute(select(Task).where(Task.id.in_(chunk)))
+                tasks.update((task.id, task) for task in result.scalars().all())
+            return tasks
+        except Exception as e:
+            logger.error(f"Error loading due tasks: {str(e)}")
+            return None
+        finally:
+            await db.close()
+
+    def _next_fire_time(self, task: Task, after: datetime) -> Optional[datetime]:
+        """Return the first scheduled execution time strictly after `after`"""
+        try:
+            return compile_schedule(task.schedule, task.timezone).next_after(after)
         except Exception as e:
             logger.error(f"Error parsing cron for task {task.id}: {str(e)}")
-            return False
+            return None
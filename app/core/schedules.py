@@ -0,0 +1,206 @@
+import bisect
+import re
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from zoneinfo import ZoneInfo
+from croniter import croniter
+from app.core.config import settings
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_INTERVAL = re.compile(r"^@every\s+((?:\d+[dhms])+)$")
+_INTERVAL_PART = re.compile(r"(\d+)([dhms])")
+_UNITS = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+_TABLE_SIZE = 16  # fire times precomputed per cron schedule
+_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+
+def _aware(moment: datetime) -> datetime:
+    # Database timestamps are naive UTC
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+class CronSchedule:
+    """
+    A cron expression: the classic five fields, or six fields with a leading
+    seconds field ("*/15 * * * * *" fires every 15 seconds), evaluated in the
+    given timezone (UTC by default).
+
+    The next few fire times are precomputed into a table, so the many
+    next_after() lookups made while they are current cost a bisect instead of
+    a croniter evaluation.
+    """
+
+    def __init__(self, expression: str, tz: Optional[str] = None):
+        fields = _MACROS.get(expression.strip().lower(), expression).split()
+        if len(fields) == 6:
+            # croniter expects the seconds field last
+            fields = fields[1:] + fields[:1]
+        elif len(fields) != 5:
+            raise ValueError(
+                f"Cron expression must have 5 or 6 fields, got {len(fields)}"
+            )
+        self.expression = expression
+        self.tz = ZoneInfo(tz) if tz else timezone.utc
+        self._cron = " ".join(fields)
+        if not croniter.is_valid(self._cron):
+            raise ValueError(f"Invalid cron expression: {expression}")
+        self._table_start: Optional[datetime] = None
+        self._table: List[datetime] = []
+
+    def next_after(self, after: datetime) -> datetime:
+        """First fire time strictly after `after`"""
+        after = _aware(after)
+        if self._table_start is None or not (
+            self._table_start <= after < self._table[-1]
+        ):
+            cron = croniter(self._cron, after.astimezone(self.tz))
+            self._table_start = after
+            self._table = [
+                cron.get_next(datetime).astimezone(timezone.utc)
+                for _ in range(_TABLE_SIZE)
+            ]
+        return self._table[bisect.bisect_right(self._table, after)]
+
+    def prev_before(self, before: datetime) -> datetime:
+        """Last fire time strictly before `before`"""
+        cron = croniter(self._cron, _aware(before).astimezone(self.tz))
+        return cron.get_prev(datetime).astimezone(timezone.utc)
+
+
+class IntervalSchedule:
+    """
+    A fixed interval, written "@every 30s", "@every 5m" or "@every 1h30m".
+
+    Fire times are aligned to multiples of the interval since the Unix epoch
+    rather than to when the task was loaded, so they are the same on every
+    replica and after a restart.
+    """
+
+    def __init__(self, expression: str):
+        match = _INTERVAL.match(expression.strip())
+        if not match:
+            raise ValueError(f"Invalid interval schedule: {expression}")
+        seconds = sum(
+            int(amount) * _UNITS[unit]
+            for amount, unit in _INTERVAL_PART.findall(match.group(1))
+        )
+        if seconds <= 0:
+            raise ValueError("Interval must be at least one second")
+        self.expression = expression
+        self.interval = timedelta(seconds=seconds)
+
+    def next_after(self, after: datetime) -> datetime:
+        """First fire time strictly after `after`"""
+        periods = (_aware(after) - EPOCH) // self.interval
+        return EPOCH + (periods + 1) * self.interval
+
+    def prev_before(self, before: datetime) -> datetime:
+        """Last fire time strictly before `before`"""
+        before = _aware(before)
+        fire_time = EPOCH + ((before - EPOCH) // self.interval) * self.interval
+        if fire_time >= before:
+            fire_time -= self.interval
+        return fire_time
+
+
+def _format_interval(interval: timedelta) -> str:
+    seconds = int(interval.total_seconds())
+    parts = []
+    for unit, size in _UNITS.items():
+        amount, seconds = divmod(seconds, size)
+        if amount:
+            parts.append(f"{amount}{unit}")
+    return "".join(parts)
+
+
+def canonical_schedule(expression: str) -> str:
+    """
+    Validate a schedule and return its canonical spelling, so equivalent
+    schedules are stored (and cached) as the same string: whitespace is
+    collapsed, macros such as "@daily" are expanded, a six-field expression
+    with a zero seconds field becomes five fields, and intervals are written
+    in their largest units ("@every 90s" becomes "@every 1m30s").
+    Raises ValueError if the schedule is invalid.
+    """
+    schedule = parse_schedule(expression)
+    if isinstance(schedule, IntervalSchedule):
+        return f"@every {_format_interval(schedule.interval)}"
+    fields = _MACROS.get(expression.strip().lower(), expression).split()
+    if len(fields) == 6 and fields[0] == "0":
+        fields = fields[1:]
+    return " ".join(fields)
+
+
+def parse_schedule(expression: str, tz: Optional[str] = None):
+    """Parse a task schedule; raises ValueError if it is invalid"""
+    if expression.strip().startswith("@every"):
+        return IntervalSchedule(expression)
+    try:
+        return CronSchedule(expression, tz)
+    except KeyError:
+        # Unknown timezone (ZoneInfoNotFoundError)
+        raise ValueError(f"Unknown timezone: {tz}")
+
+
+class ScheduleCache:
+    """
+    LRU cache of parsed schedules keyed by (expression, timezone).
+
+    Tasks typically share a small number of distinct schedules, so each
+    expression is parsed once, and tasks with the same schedule also share
+    its precomputed fire-time table.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self.maxsize = maxsize or settings.SCHEDULE_CACHE_SIZE
+        self._schedules: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, expression: str, tz: Optional[str] = None):
+        """Return the parsed schedule; raises ValueError if it is invalid"""
+        key = (expression, tz)
+        schedule = self._schedules.get(key)
+        if schedule is not None:
+            self.hits += 1
+            self._schedules.move_to_end(key)
+            return schedule
+
+        self.misses += 1
+        schedule = parse_schedule(expression, tz)
+        self._schedules[key] = schedule
+        if len(self._schedules) > self.maxsize:
+            self._schedules.popitem(last=False)
+        return schedule
+
+    def clear(self):
+        self._schedules.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._schedules),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+        }
+
+
+schedule_cache = ScheduleCache()
+
+
+def compile_schedule(expression: str, tz: Optional[str] = None):
+    """Parsed schedule from the shared cache"""
+    return schedule_cache.get(expression, tz)
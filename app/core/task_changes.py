@@ -0,0 +1,93 @@
+import asyncio
+import json
+from typing import Callable, Dict, Optional
+import asyncpg
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TASK_CHANGES_CHANNEL = "task_changes"
+_RECONNECT_SECONDS = 5
+
+
+def notify_task_change(task_id, op: str = "upsert"):
+    """
+    Statement that announces a task change to listening schedulers.
+
+    Executed in the transaction that makes the change: Postgres only delivers
+    the notification once that transaction commits, and drops it on rollback.
+    """
+    payload = json.dumps({"id": str(task_id), "op": op})
+    return text("SELECT pg_notify(:channel, :payload)").bindparams(
+        channel=TASK_CHANGES_CHANNEL, payload=payload
+    )
+
+
+def _listen_dsn() -> str:
+    # asyncpg takes a plain postgresql:// URL, without a SQLAlchemy driver
+    scheme, rest = settings.SQLALCHEMY_DATABASE_URL.split("://", 1)
+    return f"postgresql://{rest}"
+
+
+class TaskChangeListener:
+    """
+    Keeps a dedicated connection LISTENing on the task_changes channel and
+    collects the ids of changed tasks until the scheduler drains them.
+
+    Notifications sent while the connection is down are lost, so on every
+    (re)connect `on_connect` is called to let the scheduler resync in full.
+    """
+
+    def __init__(
+        self,
+        on_change: Optional[Callable[[], None]] = None,
+        on_connect: Optional[Callable[[], None]] = None,
+    ):
+        self.on_change = on_change
+        self.on_connect = on_connect
+        self.connected = False
+        self.received = 0
+        self._pending: Dict[str, str] = {}  # task id -> last op
+
+    def drain(self) -> Dict[str, str]:
+        """Return and forget the changes received so far"""
+        pending, self._pending = self._pending, {}
+        return pending
+
+    async def run_forever(self):
+        """Listen until cancelled, reconnecting whenever the connection drops"""
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(_listen_dsn())
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(TASK_CHANGES_CHANNEL, self._on_notify)
+                self.connected = True
+                logger.info(f"Listening for task changes on '{TASK_CHANGES_CHANNEL}'")
+                if self.on_connect:
+                    self.on_connect()
+                await lost.wait()
+                logger.warning("Task change listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Task change listener failed: {str(e)}")
+            finally:
+                self.connected = False
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(_RECONNECT_SECONDS)
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            change = json.loads(payload)
+            self._pending[change["id"]] = change.get("op", "upsert")
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed task change notification: {payload}")
+            return
+        self.received += 1
+        if self.on_change:
+            self.on_change()
@@ -1,59 +1,341 @@
 import asyncio
+import json
 import aiohttp
-from datetime import datetime
+import httpx
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, NamedTuple, Optional, Tuple
 from app.models.task import Task
 from app.models.task_log import TaskLog
-from app.core.database import SessionLocal
+from sqlalchemy import select
+from app.core.database import AsyncSessionLocal
 from app.core.config import settings
+from app.core.backoff import retry_delay
+from app.core.log_sink import TaskLogSink
+from app.core.task_changes import notify_task_change
+from app.core.destinations import parse_retry_after
+from app.core.payloads import JSON_CONTENT_TYPE, payload_cache
+from app.core.http2_client import Http2ClientPool
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+class Delivery(NamedTuple):
+    """Outcome of one webhook request"""
+
+    success: bool
+    message: str
+    status: Optional[int] = None  # HTTP status, None if no response arrived
+    retry_after: Optional[float] = None  # seconds, from a Retry-After header
+
+
+def request_timeouts(task: Task) -> Tuple[float, float, float]:
+    """The task's connect, read and total timeouts, or the global defaults"""
+    return (
+        task.connect_timeout or settings.WEBHOOK_CONNECT_TIMEOUT,
+        task.read_timeout or settings.WEBHOOK_READ_TIMEOUT,
+        task.total_timeout or settings.WEBHOOK_TOTAL_TIMEOUT,
+    )
+
+
+async def read_body_prefix(
+    chunks: AsyncIterator[bytes], keep: int, drain: int
+) -> bytes:
+    """
+    Stream up to `drain` bytes of a response body, returning the first
+    `keep`. A longer body is left unread rather than buffered in memory; the
+    connection (HTTP/1.1) or stream (HTTP/2) is then reset instead of reused.
+    """
+    prefix = bytearray()
+    read = 0
+    async for chunk in chunks:
+        if len(prefix) < keep:
+            prefix += chunk[: keep - len(prefix)]
+        read += len(chunk)
+        if read >= drain:
+            break
+    return bytes(prefix)
+
+
+async def _response_prefix(chunks: AsyncIterator[bytes], keep: int) -> bytes:
+    try:
+        return await read_body_prefix(
+            chunks, keep, max(keep, settings.WEBHOOK_RESPONSE_DRAIN_BYTES)
+        )
+    except Exception:
+        # The status is what counts; the body only adds detail
+        return b""
+
+
+def delivered(status: int) -> bool:
+    """Whether a webhook response status means the payload was accepted"""
+    return status == 200 or status == 204
+
+
+def _response_delivery(status: int, prefix: bytes, retry_after: Optional[str]):
+    if delivered(status):
+        return Delivery(True, "Task executed successfully", status)
+    message = f"Webhook request failed with status {status}"
+    if prefix:
+        message += f": {prefix.decode('utf-8', 'replace')}"
+    return Delivery(False, message, status, parse_retry_after(retry_after))
+
+
+def _request_failed(error: Exception) -> Delivery:
+    if isinstance(error, (asyncio.TimeoutError, httpx.TimeoutException)):
+        message = "Task execution failed: webhook request timed out"
+        if str(error):
+            message += f" ({str(error)})"
+    else:
+        message = f"Task execution failed: {str(error)}"
+    return Delivery(False, message)
+
+
+def _item_outcome(result) -> Tuple[bool, Optional[int]]:
+    # An entry of a batch response: a status code, a boolean, or an object
+    # with "status" or "ok"/"success". Only an explicit success marker counts
+    # as delivered; anything else (null, "failed", {"error": ...}) failed.
+    if isinstance(result, bool):
+        return result, None
+    if isinstance(result, int):
+        return delivered(result), result
+    if isinstance(result, dict):
+        status = result.get("status")
+        if isinstance(status, int) and not isinstance(status, bool):
+            return delivered(status), status
+        for key in ("ok", "success"):
+            if isinstance(result.get(key), bool):
+                return result[key], None
+    return False, None
+
+
+def batch_deliveries(
+    status: int, body: bytes, retry_after: Optional[str], count: int
+) -> Tuple[Delivery, List[Delivery]]:
+    """
+    Outcome of a batched request and of each task in it.
+
+    A successful response whose body is a JSON array with one entry per
+    task gives every task its own outcome, judged by the same statuses as a
+    single request; entries that are not recognised count as failures.
+    Otherwise the response's status applies to all of them.
+    """
+    prefix = body[: settings.WEBHOOK_RESPONSE_PREFIX_BYTES]
+    results = None
+    if delivered(status) and body:
+        try:
+            results = json.loads(body)
+        except ValueError:
+            pass
+    if not isinstance(results, list) or len(results) != count:
+        delivery = _response_delivery(status, prefix, retry_after)
+        if delivery.success:
+            delivery = delivery._replace(
+                message=f"Task executed successfully (batch of {count})"
+            )
+        return delivery, [delivery] * count
+
+    batch = Delivery(True, f"Batch of {count} delivered", status)
+    deliveries = []
+    for result in results:
+        success, item_status = _item_outcome(result)
+        if success:
+            message = f"Task executed successfully (batch of {count})"
+        else:
+            detail = json.dumps(result)[: settings.WEBHOOK_RESPONSE_PREFIX_BYTES]
+            message = f"Batched webhook item failed: {detail}"
+        deliveries.append(Delivery(success, message, item_status or status))
+    return batch, deliveries
+
+
 class TaskExecutor:
-    def __init__(self):
-        self.session = None
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        log_sink: Optional[TaskLogSink] = None,
+        delivery=None,
+        http2: Optional[Http2ClientPool] = None,
+    ):
+        # A session passed in (normally the scheduler's shared HttpClientPool
+        # session) is borrowed; otherwise the executor creates and closes its own
+        self.session = session
+        # Webhook requests can also be handed to a ProcessDeliveryPool, in
+        # which case this executor only logs their outcome
+        self.delivery = delivery
+        self._owns_session = session is None and delivery is None
+        # Destinations it handles are sent over HTTP/2 instead of the session
+        self.http2 = http2
+        # Without a sink every attempt is logged in its own transaction
+        self.log_sink = log_sink
+        self.last_delivery: Optional[Delivery] = None
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        if self._owns_session:
+            self.session = aiohttp.ClientSession()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        if self._owns_session and self.session:
             await self.session.close()
 
-    async def execute_task(self, task: Task, retry_count: int = 0) -> bool:
+    async def execute_task(
+        self,
+        task: Task,
+        retry_count: int = 0,
+        scheduled_for: Optional[datetime] = None,
+        lag_ms: Optional[float] = None,
+    ) -> bool:
         """
         Execute a task by sending a POST request to the webhook URL.
         Returns True if successful, False otherwise.
         """
+        delivery = await self.deliver(task, retry_count, scheduled_for)
+        self.last_delivery = delivery
+        success = delivery.success
+        await self._log_task_execution(
+            task,
+            retry_count,
+            "success" if success else "failed",
+            delivery.message,
+            scheduled_for=scheduled_for,
+            lag_ms=lag_ms,
+        )
+        return success
+
+    async def deliver(
+        self,
+        task: Task,
+        attempt: int = 1,
+        scheduled_for: Optional[datetime] = None,
+    ) -> Delivery:
+        """
+        Send the webhook request without logging it.
+        Returns whether it succeeded, the message to log and the response
+        status and Retry-After delay, if any.
+        """
+        if self.delivery is not None:
+            return await self.delivery.deliver(task, attempt, scheduled_for)
+
         try:
-            # Send webhook request
-            payload = task.payload or {}
-            async with self.session.post(task.webhook_url, json=payload) as response:
-                if response.status == 200 or response.status == 204:
-                    # Log success
-                    self._log_task_execution(
-                        task, retry_count, "success", "Task executed successfully"
-                    )
-                    return True
-                else:
-                    # Log failure
-                    message = f"Webhook request failed with status {response.status}"
-                    self._log_task_execution(task, retry_count, "failed", message)
-                    return False
+            # Send webhook request; the body is compiled once per task version
+            body, content_type = payload_cache.get(task, attempt, scheduled_for)
+            status, prefix, retry_after = await self._post(
+                task.webhook_url,
+                body,
+                content_type,
+                request_timeouts(task),
+                settings.WEBHOOK_RESPONSE_PREFIX_BYTES,
+            )
+            return _response_delivery(status, prefix, retry_after)
+        except Exception as e:
+            delivery = _request_failed(e)
+            logger.error(f"Error executing task {task.id}: {delivery.message}")
+            return delivery
 
+    async def execute_batch(
+        self,
+        url: str,
+        items: List[Tuple[Task, int, Optional[datetime], Optional[float]]],
+    ) -> Tuple[Delivery, List[Delivery]]:
+        """
+        Send the payloads of tasks sharing a webhook URL as one JSON array and
+        log every task's outcome. `items` are (task, attempt, scheduled_for,
+        lag_ms). Returns the outcome of the request and of each task.
+        """
+        try:
+            bodies = [
+                payload_cache.get(task, attempt, scheduled_for)[0]
+                for task, attempt, scheduled_for, _ in items
+            ]
+            # The tasks share a URL; the first one's timeouts apply
+            status, body, retry_after = await self._post(
+                url,
+                b"[" + b",".join(bodies) + b"]",
+                JSON_CONTENT_TYPE,
+                request_timeouts(items[0][0]),
+                settings.WEBHOOK_RESPONSE_DRAIN_BYTES,
+            )
+            batch, deliveries = batch_deliveries(status, body, retry_after, len(items))
         except Exception as e:
-            # Log the error
-            message = f"Task execution failed: {str(e)}"
-            logger.error(f"Error executing task {task.id}: {message}")
-            self._log_task_execution(task, retry_count, "failed", message)
-            return False
+            batch = _request_failed(e)
+            logger.error(
+                f"Error sending a batch of {len(items)} tasks: {batch.message}"
+            )
+            deliveries = [batch] * len(items)
+
+        for (task, attempt, scheduled_for, lag_ms), delivery in zip(items, deliveries):
+            await self._log_task_execution(
+                task,
+                attempt,
+                "success" if delivery.success else "failed",
+                delivery.message,
+                scheduled_for=scheduled_for,
+                lag_ms=lag_ms,
+            )
+        return batch, deliveries
+
+    async def _post(
+        self,
+        url: str,
+        body: bytes,
+        content_type: str,
+        timeouts: Tuple[float, float, float],
+        keep: int,
+    ) -> Tuple[int, bytes, Optional[str]]:
+        """
+        POST a body, over HTTP/2 if the URL is routed there. Returns the
+        response status, the first `keep` bytes of its body and its
+        Retry-After header.
+        """
+        if self.http2 is not None and self.http2.handles(url):
+            return await self._post_http2(url, body, content_type, timeouts, keep)
+        connect, read, total = timeouts
+        timeout = aiohttp.ClientTimeout(
+            total=total, sock_connect=connect, sock_read=read
+        )
+        async with self.session.post(
+            url, data=body, headers={"Content-Type": content_type}, timeout=timeout
+        ) as response:
+            prefix = await _response_prefix(response.content.iter_chunked(8192), keep)
+            return response.status, prefix, response.headers.get("Retry-After")
+
+    async def _post_http2(
+        self,
+        url: str,
+        body: bytes,
+        content_type: str,
+        timeouts: Tuple[float, float, float],
+        keep: int,
+    ) -> Tuple[int, bytes, Optional[str]]:
+        connect, read, total = timeouts
+        # httpx has no overall timeout; the whole exchange is bounded instead
+        timeout = httpx.Timeout(read, connect=connect, pool=total)
+        http2 = self.http2
+
+        async def exchange():
+            async with http2.stream(url, body, content_type, timeout) as response:
+                http2.responses_by_version[response.http_version] += 1
+                prefix = await _response_prefix(response.aiter_raw(), keep)
+                return (
+                    response.status_code,
+                    prefix,
+                    response.headers.get("Retry-After"),
+                )
+
+        http2.requests_total += 1
+        http2.requests_in_flight += 1
+        try:
+            return await asyncio.wait_for(exchange(), total)
+        finally:
+            http2.requests_in_flight -= 1
 
     async def execute_task_with_retry(self, task: Task) -> bool:
         """
-        Execute a task with retry logic.
+        Execute a task with retry logic, waiting out the backoff inline.
         Returns True if successful, False otherwise.
+
+        The scheduler does not use this: TaskDispatcher runs one attempt at a
+        time and parks retries in a RetryQueue so workers are never blocked.
         """
         retry_count = 1
         success = False
@@ -63,9 +345,9 @@ class TaskExecutor:
 
             if not success and retry_count < task.max_retry:
                 # Wait before retrying (exponential backoff)
-                wait_time = 2**retry_count
+                wait_time = retry_delay(task, retry_count)
                 logger.info(
-                    f"Task {task.id} failed, retrying in {wait_time} seconds... (retry {retry_count + 1}/{task.max_retry})"
+                    f"Task {task.id} failed, retrying in {wait_time:.1f} seconds... (retry {retry_count + 1}/{task.max_retry})"
                 )
                 await asyncio.sleep(wait_time)
                 retry_count += 1
@@ -79,13 +361,32 @@ class TaskExecutor:
 
         return success
 
-    def _log_task_execution(
-        self, task: Task, retry_count: int, status: str, message: str
+    async def _log_task_execution(
+        self,
+        task: Task,
+        retry_count: int,
+        status: str,
+        message: str,
+        scheduled_for: Optional[datetime] = None,
+        lag_ms: Optional[float] = None,
     ):
         """
         Log task execution to the database.
         """
-        db = SessionLocal()
+        if scheduled_for is not None and scheduled_for.tzinfo is not None:
+            scheduled_for = scheduled_for.astimezone(timezone.utc).replace(tzinfo=None)
+        if self.log_sink:
+            await self.log_sink.write(
+                task.id,
+                status,
+                retry_count,
+                message,
+                scheduled_for=scheduled_for,
+                lag_ms=lag_ms,
+            )
+            return
+
+        db = AsyncSessionLocal()
         try:
             task_log = TaskLog(
                 task_id=task.id,
@@ -93,25 +394,30 @@ class TaskExecutor:
                 status=status,
                 retry_count=retry_count,
                 message=message,
+                scheduled_for=scheduled_for,
+                lag_ms=lag_ms,
             )
             db.add(task_log)
-            db.commit()
+            await db.commit()
         except Exception as e:
             logger.error(f"Error logging task execution for task {task.id}: {str(e)}")
         finally:
-            db.close()
+            await db.close()
 
     async def _deactivate_task(self, task: Task):
         """
         Deactivate a task after it has failed all retry attempts.
         """
-        db = SessionLocal()
+        db = AsyncSessionLocal()
         try:
             # Get fresh task instance from database
-            fresh_task = db.query(Task).filter(Task.id == task.id).first()
+            result = await db.execute(select(Task).where(Task.id == task.id))
+            fresh_task = result.scalars().first()
             if fresh_task:
                 fresh_task.status = "inactive"
-                db.commit()
+                fresh_task.next_run_at = None
+                await db.execute(notify_task_change(task.id))
+                await db.commit()
                 logger.info(
                     f"Task {task.id} has been deactivated after exceeding max retry attempts"
                 )
@@ -119,6 +425,6 @@ class TaskExecutor:
                 logger.warning(f"Task {task.id} not found in database for deactivation")
         except Exception as e:
             logger.error(f"Error deactivating task {task.id}: {str(e)}")
-            db.rollback()
+            await db.rollback()
         finally:
-            db.close()
+            await db.close()
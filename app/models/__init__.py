@@ -1,4 +1,6 @@
 from .task import Task
 from .task_log import TaskLog
+from .task_run import TaskRun
+from .scheduler_node import SchedulerNode
 
-__all__ = ["Task", "TaskLog"]
+__all__ = ["Task", "TaskLog", "TaskRun", "SchedulerNode"]
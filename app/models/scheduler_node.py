@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, DateTime, func
+from app.core.database import Base
+
+
+class SchedulerNode(Base):
+    """Membership lease of a running scheduler replica"""
+
+    __tablename__ = "scheduler_nodes"
+
+    node_id = Column(String, primary_key=True)
+    hostname = Column(String, nullable=True)
+    started_at = Column(DateTime, nullable=False, server_default=func.now())
+    heartbeat_at = Column(DateTime, nullable=False, server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, UUID, Enum
+from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, Text, ForeignKey, UUID, Enum, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -14,15 +14,47 @@ class TaskStatusEnum(str, Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Scheduler syncs: all active tasks, and tasks changed since a point
+        Index(
+            "ix_tasks_active_updated_at",
+            "updated_at",
+            postgresql_where=text("status = 'active'"),
+        ),
+        Index("ix_tasks_updated_at", "updated_at"),
+        # Scheduler lookahead: active tasks due within the next window
+        Index(
+            "ix_tasks_active_next_run_at",
+            "next_run_at",
+            postgresql_where=text("status = 'active'"),
+        ),
+        # Keyset pagination of GET /tasks, with and without a status filter
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_status_created_at_id", "status", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
     schedule = Column(String, nullable=False)  # cron expression
+    timezone = Column(String, nullable=True)  # IANA name the schedule uses, UTC if unset
     webhook_url = Column(String, nullable=False)
     payload = Column(JSONB, nullable=True)
+    payload_template = Column(Boolean, default=False)  # render {{variables}}
+    batchable = Column(Boolean, default=False)  # may share a request with others
     max_retry = Column(Integer, default=3)
+    retry_backoff_base = Column(Float, default=2.0)  # seconds
+    retry_backoff_cap = Column(Float, default=300.0)  # seconds
+    retry_jitter = Column(String, default="none")  # none, full, equal
+    misfire_policy = Column(String, default="skip")  # skip, fire_once, fire_all
+    misfire_grace_seconds = Column(Integer, default=3600)
+    max_backfill = Column(Integer, default=10)  # occurrences replayed by fire_all
+    # Webhook request timeouts in seconds, the WEBHOOK_*_TIMEOUT settings if unset
+    connect_timeout = Column(Float, nullable=True)
+    read_timeout = Column(Float, nullable=True)
+    total_timeout = Column(Float, nullable=True)
     status = Column(String, default="active")  # active, inactive, deleted
-    created_at = Column(DateTime, default=datetime.utcnow)
+    next_run_at = Column(DateTime, nullable=True)  # next occurrence, UTC
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationship
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, UUID, Enum
+from sqlalchemy import Column, String, Integer, Float, DateTime, Text, ForeignKey, UUID, Enum, Index, DDL, event
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -16,11 +16,43 @@ class TaskLog(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), nullable=False)
-    execution_time = Column(DateTime, nullable=False)
+    # Part of the primary key because the table is partitioned on it
+    execution_time = Column(DateTime, primary_key=True, nullable=False)
     status = Column(String, nullable=False)  # success, failed
     retry_count = Column(Integer, default=0)
     message = Column(Text, nullable=True)
+    scheduled_for = Column(DateTime, nullable=True)  # occurrence this run is for
+    lag_ms = Column(Float, nullable=True)  # start delay of the first attempt
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationship
     task = relationship("Task", back_populates="logs")
+
+    __table_args__ = (
+        # Logs of one task, newest first
+        Index(
+            "ix_task_logs_task_id_execution_time",
+            task_id,
+            execution_time.desc(),
+            id.desc(),
+        ),
+        # Keyset pagination of GET /task-logs, with and without a status filter
+        Index("ix_task_logs_execution_time_id", execution_time.desc(), id.desc()),
+        Index(
+            "ix_task_logs_status_execution_time",
+            status,
+            execution_time.desc(),
+            id.desc(),
+        ),
+        # Range partitions are managed by app.core.partitions
+        {"postgresql_partition_by": "RANGE (execution_time)"},
+    )
+
+
+# Catch-all partition so inserts never fail for a period that has no
+# partition yet; the maintenance job creates the real ones ahead of time
+event.listen(
+    TaskLog.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS task_logs_default PARTITION OF task_logs DEFAULT"),
+)
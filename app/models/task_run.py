@@ -0,0 +1,37 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, UUID, Index, text
+from app.core.database import Base
+from datetime import datetime
+
+
+class TaskRun(Base):
+    """One scheduled occurrence of a task and its dispatch state"""
+
+    __tablename__ = "task_runs"
+    __table_args__ = (
+        # Claim query: runs waiting to be dispatched, oldest first
+        Index(
+            "ix_task_runs_pending_scheduled_for",
+            "scheduled_for",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        # Stale claim recovery
+        Index(
+            "ix_task_runs_claimed_claimed_at",
+            "claimed_at",
+            postgresql_where=text("status = 'claimed'"),
+        ),
+    )
+
+    task_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("tasks.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    scheduled_for = Column(DateTime, primary_key=True)
+    status = Column(String, nullable=False, default="pending")
+    # pending, claimed, done, failed, skipped
+    claimed_by = Column(String, nullable=True)
+    claimed_at = Column(DateTime, nullable=True)
+    claim_count = Column(Integer, nullable=False, default=0)
+    finished_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,34 +1,93 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field, field_validator, model_validator
+from sqlalchemy import inspect
+from typing import Optional, List, Literal
 from datetime import datetime
 from uuid import UUID
+from zoneinfo import ZoneInfo
 from app.schemas.task_log import TaskLogBase
+from app.core.schedules import canonical_schedule
+from app.core.payloads import TEMPLATE_VARIABLES, template_variables
+
+
+def _check_timezone(value: Optional[str]) -> Optional[str]:
+    if value is not None:
+        try:
+            ZoneInfo(value)
+        except (KeyError, ValueError):
+            raise ValueError(f"Unknown timezone: {value}")
+    return value
 
 
 class TaskBase(BaseModel):
     name: str
     schedule: str
+    timezone: Optional[str] = None  # IANA name, e.g. "Asia/Jakarta"; UTC if unset
     webhook_url: str
     payload: Optional[dict] = None
+    payload_template: bool = False  # render {{variables}} in the payload
+    batchable: bool = False  # may be posted in a JSON array with other tasks
     max_retry: int = 3
+    retry_backoff_base: float = 2.0
+    retry_backoff_cap: float = 300.0
+    retry_jitter: Literal["none", "full", "equal"] = "none"
+    misfire_policy: Literal["skip", "fire_once", "fire_all"] = "skip"
+    misfire_grace_seconds: int = Field(3600, ge=0)
+    max_backfill: int = Field(10, ge=1)
+    # Seconds; the server-wide defaults apply when unset
+    connect_timeout: Optional[float] = Field(None, gt=0)
+    read_timeout: Optional[float] = Field(None, gt=0)
+    total_timeout: Optional[float] = Field(None, gt=0)
     status: str = "active"
 
 
 class TaskCreate(TaskBase):
-    pass
-
-
-class TaskUpdate(TaskBase):
+    # Validated on write only, so tasks stored before validation still load
+    @field_validator("schedule")
+    @classmethod
+    def validate_schedule(cls, value):
+        # Rejected here rather than failing on every scheduler pass later
+        return canonical_schedule(value) if value is not None else value
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, value):
+        return _check_timezone(value)
+
+    @model_validator(mode="after")
+    def validate_payload_template(self):
+        if self.payload_template:
+            unknown = template_variables(self.payload) - set(TEMPLATE_VARIABLES)
+            if unknown:
+                raise ValueError(
+                    f"Unknown template variables: {', '.join(sorted(unknown))}"
+                )
+        return self
+
+
+class TaskUpdate(TaskCreate):
     name: Optional[str] = None
     schedule: Optional[str] = None
+    timezone: Optional[str] = None
     webhook_url: Optional[str] = None
     payload: Optional[dict] = None
+    payload_template: Optional[bool] = None
+    batchable: Optional[bool] = None
     max_retry: Optional[int] = None
+    retry_backoff_base: Optional[float] = None
+    retry_backoff_cap: Optional[float] = None
+    retry_jitter: Optional[Literal["none", "full", "equal"]] = None
+    misfire_policy: Optional[Literal["skip", "fire_once", "fire_all"]] = None
+    misfire_grace_seconds: Optional[int] = Field(None, ge=0)
+    max_backfill: Optional[int] = Field(None, ge=1)
+    connect_timeout: Optional[float] = Field(None, gt=0)
+    read_timeout: Optional[float] = Field(None, gt=0)
+    total_timeout: Optional[float] = Field(None, gt=0)
     status: Optional[str] = None
 
 
 class TaskInDBBase(TaskBase):
     id: UUID
+    next_run_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
@@ -37,7 +96,21 @@ class TaskInDBBase(TaskBase):
 
 
 class Task(TaskInDBBase):
-    logs: Optional[list["TaskLogBase"]] = []
+    logs: Optional[list["TaskLogBase"]] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def skip_unloaded_logs(cls, data):
+        # Reading Task.logs off a model would lazy-load every historic log, one
+        # query per task; logs are only serialized when the endpoint loaded them
+        state = inspect(data, raiseerr=False)
+        if state is not None and "logs" in state.unloaded:
+            return {
+                field: getattr(data, field)
+                for field in cls.model_fields
+                if field != "logs"
+            }
+        return data
 
 
 class TaskInDB(TaskInDBBase):
@@ -46,9 +119,10 @@ class TaskInDB(TaskInDBBase):
 
 class TaskListResponse(BaseModel):
     tasks: List[Task]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
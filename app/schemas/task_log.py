@@ -10,6 +10,8 @@ class TaskLogBase(BaseModel):
     status: str
     retry_count: int = 0
     message: Optional[str] = None
+    scheduled_for: Optional[datetime] = None
+    lag_ms: Optional[float] = None
 
 
 class TaskLogCreate(TaskLogBase):
@@ -42,9 +44,10 @@ class TaskLogInDB(TaskLogInDBBase):
 
 class TaskLogListResponse(BaseModel):
     task_logs: List[TaskLog]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
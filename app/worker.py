@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+import multiprocessing
+import signal
+import sys
+from typing import Optional
+from app.core.config import settings
+from app.core.scheduler import TaskScheduler
+from app.core.logging_config import setup_logging, get_logger
+
+logger = get_logger(__name__)
+
+# Runs the scheduler without the API (`python -m app.worker --processes 4`),
+# so webhook fan-out does not share an event loop with API requests. Start
+# the API with EMBEDDED_SCHEDULER=false when a worker is running.
+
+
+async def run_scheduler():
+    """Run one scheduler until SIGINT or SIGTERM"""
+    scheduler = TaskScheduler()
+    loop = asyncio.get_running_loop()
+    stopping = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    scheduler_task = asyncio.create_task(scheduler.start())
+    await stopping.wait()
+    logger.info("Shutting down scheduler worker...")
+    await scheduler.stop()
+    scheduler_task.cancel()
+    try:
+        await scheduler_task
+    except asyncio.CancelledError:
+        pass
+
+
+def _worker_main(concurrency: Optional[int], executor_processes: Optional[int] = None):
+    setup_logging()
+    if concurrency:
+        settings.DISPATCH_WORKERS = concurrency
+    if executor_processes is not None:
+        settings.EXECUTOR_PROCESSES = executor_processes
+    asyncio.run(run_scheduler())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m app.worker", description="Run the task scheduler worker"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=settings.WORKER_PROCESSES,
+        help="scheduler processes to run (default: WORKER_PROCESSES)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="concurrent webhook executions per process (default: DISPATCH_WORKERS)",
+    )
+    parser.add_argument(
+        "--executor-processes",
+        type=int,
+        default=None,
+        help="child processes sending webhooks for each scheduler process "
+        "(default: EXECUTOR_PROCESSES)",
+    )
+    args = parser.parse_args(argv)
+    if args.processes < 1:
+        parser.error("--processes must be at least 1")
+    if (
+        args.processes > 1
+        and settings.SCHEDULER_COORDINATION == "none"
+        and not settings.SCHEDULER_RUN_LEDGER
+    ):
+        # Every process would fire every task
+        parser.error(
+            "running several processes requires SCHEDULER_COORDINATION "
+            "or SCHEDULER_RUN_LEDGER"
+        )
+
+    setup_logging()
+    if args.processes == 1:
+        _worker_main(args.concurrency, args.executor_processes)
+        return 0
+
+    logger.info(f"Starting {args.processes} scheduler processes")
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=_worker_main,
+            args=(args.concurrency, args.executor_processes),
+            name=f"scheduler-{i}",
+        )
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def _forward(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, _forward)
+    signal.signal(signal.SIGINT, _forward)
+    for process in processes:
+        process.join()
+    return max((process.exitcode or 0) for process in processes)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
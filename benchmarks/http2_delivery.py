@@ -0,0 +1,193 @@
+"""
+Compare webhook delivery throughput of the aiohttp (HTTP/1.1) path with the
+httpx HTTP/2 path against local stub servers. Needs the h2 package
+(pip install '.[http2]'); no database is used:
+
+    python -m benchmarks.http2_delivery --requests 5000 --concurrency 500 --latency-ms 20
+
+Both stubs answer every POST with 204 after --latency-ms, standing in for a
+remote API. The HTTP/1.1 client is capped at HTTP_POOL_LIMIT_PER_HOST
+connections, so its throughput is bounded by connections / latency; the
+HTTP/2 client multiplexes the same load over a few connections.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+from aiohttp import web
+from app.core.config import settings
+from app.core.http_client import HttpClientPool
+from app.core.http2_client import Http2ClientPool
+from app.core.task_executor import TaskExecutor
+
+
+class H2StubServer:
+    """Minimal cleartext HTTP/2 server (prior knowledge) answering 204"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self.port = None
+        self._server = None
+
+    async def start(self, host: str = "127.0.0.1"):
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(lambda: _H2StubProtocol(self), host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    def url(self, path: str = "/webhook") -> str:
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+
+class _H2StubProtocol(asyncio.Protocol):
+    def __init__(self, server: H2StubServer):
+        from h2.config import H2Configuration
+        from h2.connection import H2Connection
+
+        self.server = server
+        self.conn = H2Connection(H2Configuration(client_side=False))
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.server.connections += 1
+        self.transport = transport
+        self.conn.initiate_connection()
+        transport.write(self.conn.data_to_send())
+
+    def data_received(self, data: bytes):
+        from h2.events import ConnectionTerminated, DataReceived, StreamEnded
+        from h2.exceptions import ProtocolError
+
+        try:
+            events = self.conn.receive_data(data)
+        except ProtocolError:
+            self.transport.write(self.conn.data_to_send())
+            self.transport.close()
+            return
+        loop = asyncio.get_running_loop()
+        for event in events:
+            if isinstance(event, DataReceived):
+                self.conn.acknowledge_received_data(
+                    event.flow_controlled_length, event.stream_id
+                )
+            elif isinstance(event, StreamEnded):
+                self.server.requests += 1
+                loop.call_later(self.server.latency, self._respond, event.stream_id)
+            elif isinstance(event, ConnectionTerminated):
+                self.transport.close()
+        self.transport.write(self.conn.data_to_send())
+
+    def _respond(self, stream_id: int):
+        from h2.exceptions import ProtocolError, StreamClosedError
+
+        if self.transport.is_closing():
+            return
+        try:
+            self.conn.send_headers(stream_id, [(":status", "204")], end_stream=True)
+        except (ProtocolError, StreamClosedError):
+            return
+        self.transport.write(self.conn.data_to_send())
+
+
+async def start_http1_stub(latency: float):
+    async def webhook(request):
+        await request.read()
+        await asyncio.sleep(latency)
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_post("/webhook", webhook)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/webhook"
+
+
+def make_task(url: str):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        name="Benchmark task",
+        updated_at=None,
+        webhook_url=url,
+        payload={"content": "benchmark"},
+        payload_template=False,
+        connect_timeout=None,
+        read_timeout=None,
+        total_timeout=None,
+    )
+
+
+async def run_load(executor: TaskExecutor, url: str, requests: int, concurrency: int):
+    """Send `requests` webhooks, `concurrency` at a time; returns (ok, seconds)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [make_task(url) for _ in range(requests)]
+
+    async def send(task):
+        async with semaphore:
+            return (await executor.deliver(task)).success
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(send(task) for task in tasks))
+    return sum(results), time.perf_counter() - started
+
+
+async def main(args):
+    latency = args.latency_ms / 1000
+
+    runner, url = await start_http1_stub(latency)
+    http = HttpClientPool()
+    try:
+        executor = TaskExecutor(session=http.open())
+        await run_load(executor, url, min(args.requests, 100), args.concurrency)
+        ok, elapsed = await run_load(executor, url, args.requests, args.concurrency)
+        print(
+            f"aiohttp HTTP/1.1: {ok}/{args.requests} ok, "
+            f"{args.requests / elapsed:8.0f} req/s, "
+            f"{http.stats()['connections_created']} connections "
+            f"(limit {settings.HTTP_POOL_LIMIT_PER_HOST} per host)"
+        )
+    finally:
+        await http.close()
+        await runner.cleanup()
+
+    server = await H2StubServer(latency).start()
+    http2 = Http2ClientPool(
+        enabled=True, max_connections=args.h2_connections, prior_knowledge=True
+    )
+    try:
+        http2.open()
+        executor = TaskExecutor(session=None, http2=http2)
+        await run_load(
+            executor, server.url(), min(args.requests, 100), args.concurrency
+        )
+        ok, elapsed = await run_load(
+            executor, server.url(), args.requests, args.concurrency
+        )
+        print(
+            f"httpx HTTP/2:     {ok}/{args.requests} ok, "
+            f"{args.requests / elapsed:8.0f} req/s, "
+            f"{server.connections} connections "
+            f"(versions: {http2.stats()['responses_by_version']})"
+        )
+    finally:
+        await http2.close()
+        await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--h2-connections", type=int, default=4)
+    asyncio.run(main(parser.parse_args()))
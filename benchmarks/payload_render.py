@@ -0,0 +1,105 @@
+"""
+Measure the per-fire cost of building a webhook request body.
+
+No database is needed:
+
+    python -m benchmarks.payload_render --fields 50 --iterations 20000
+
+Compares, for a payload of --fields entries:
+
+- encoding the payload dict on every fire (what `json=payload` did)
+- the cached encoded body of a plain payload
+- rendering a cached, compiled template with --placeholders variables
+- compiling the template on every fire, for reference
+"""
+
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from app.core.payloads import (
+    PayloadCache,
+    PayloadTemplate,
+    encode_json,
+    orjson,
+    template_constants,
+    template_context,
+)
+
+VARIABLES = ["{{scheduled_for}}", "{{attempt}}", "{{task.name}}", "{{fired_at}}"]
+
+
+def make_task(fields: int, placeholders: int, templated: bool):
+    payload = {f"field_{i}": f"value {i} " * 4 for i in range(fields)}
+    for i in range(placeholders):
+        payload[f"templated_{i}"] = f"at {VARIABLES[i % len(VARIABLES)]}"
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        name="Benchmark task",
+        updated_at=datetime.utcnow(),
+        payload=payload,
+        payload_template=templated,
+    )
+
+
+def compile_and_render(task, attempt: int, scheduled_for: datetime) -> bytes:
+    template = PayloadTemplate(
+        encode_json(task.payload), True, template_constants(task)
+    )
+    return template.render(template_context(attempt, scheduled_for, template.names))
+
+
+def measure(label: str, iterations: int, fire) -> float:
+    fire(1)  # warm up
+    started = time.perf_counter()
+    for attempt in range(iterations):
+        fire(attempt)
+    per_fire = (time.perf_counter() - started) / iterations * 1e6
+    print(f"{label:<42} {per_fire:9.2f} us/fire")
+    return per_fire
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fields", type=int, default=50)
+    parser.add_argument("--placeholders", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    cache = PayloadCache(maxsize=10)
+    plain = make_task(args.fields, args.placeholders, templated=False)
+    templated = make_task(args.fields, args.placeholders, templated=True)
+    scheduled_for = datetime.now(timezone.utc)
+    size = len(encode_json(plain.payload))
+    print(
+        f"payload: {args.fields} fields, {size} bytes, "
+        f"{args.placeholders} placeholders, encoder: "
+        f"{'orjson' if orjson is not None else 'json'}"
+    )
+
+    measure(
+        "stdlib json.dumps per fire (uncached)",
+        args.iterations,
+        lambda attempt: json.dumps(plain.payload).encode(),
+    )
+    measure(
+        "cached body, no template",
+        args.iterations,
+        lambda attempt: cache.get(plain, attempt, scheduled_for),
+    )
+    measure(
+        "cached compiled template, rendered",
+        args.iterations,
+        lambda attempt: cache.get(templated, attempt, scheduled_for),
+    )
+    measure(
+        "template compiled per fire (uncached)",
+        args.iterations,
+        lambda attempt: compile_and_render(templated, attempt, scheduled_for),
+    )
+
+
+if __name__ == "__main__":
+    main()
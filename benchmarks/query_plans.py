@@ -0,0 +1,195 @@
+"""
+Compare query plans of the scheduler and listing hot queries with and
+without the indexes added in migration 200bcda136f5.
+
+Runs against the database configured in .env / DATABASE_URL:
+
+    python -m benchmarks.query_plans --seed-tasks 20000 --logs-per-task 50
+
+Each query is run with EXPLAIN (ANALYZE, BUFFERS) twice: once as-is and once
+inside a transaction that drops the indexes first and is rolled back
+afterwards, so the schema is left untouched. Seeded rows are removed at the
+end unless --keep is given.
+"""
+
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from app.core.database import engine
+
+INDEXES = [
+    "ix_tasks_active_updated_at",
+    "ix_tasks_updated_at",
+    "ix_tasks_created_at_id",
+    "ix_tasks_status_created_at_id",
+    "ix_task_logs_task_id_execution_time",
+    "ix_task_logs_execution_time_id",
+    "ix_task_logs_status_execution_time",
+]
+
+QUERIES = {
+    "scheduler full resync": "SELECT * FROM tasks WHERE status = 'active'",
+    "scheduler incremental sync": (
+        "SELECT * FROM tasks WHERE updated_at >= now() - interval '1 minute'"
+    ),
+    "GET /tasks?status=active (cursor)": (
+        "SELECT * FROM tasks WHERE status = 'active' "
+        "AND (created_at, id) > (:created_at, :task_id) "
+        "ORDER BY created_at, id LIMIT 101"
+    ),
+    "GET /task-logs/task/{id}?status=failed": (
+        "SELECT * FROM task_logs WHERE task_id = :task_id AND status = 'failed' "
+        "ORDER BY execution_time DESC, id DESC LIMIT 101"
+    ),
+    "GET /task-logs (deep cursor page)": (
+        "SELECT * FROM task_logs WHERE (execution_time, id) < (:log_time, :log_id) "
+        "ORDER BY execution_time DESC, id DESC LIMIT 101"
+    ),
+}
+
+BENCH_PREFIX = "bench-query-plans"
+
+
+def seed(conn, tasks: int, logs_per_task: int):
+    now = datetime.utcnow()
+    task_rows = [
+        {
+            "id": uuid.uuid4(),
+            "name": f"{BENCH_PREFIX} {i}",
+            "schedule": "* * * * *",
+            "webhook_url": "https://example.com/webhook",
+            "status": "active" if i % 10 else "inactive",
+            "created_at": now - timedelta(seconds=i),
+            "updated_at": now - timedelta(hours=1, seconds=i),
+        }
+        for i in range(tasks)
+    ]
+    conn.execute(
+        text(
+            "INSERT INTO tasks (id, name, schedule, webhook_url, status, max_retry, "
+            "created_at, updated_at) VALUES (:id, :name, :schedule, :webhook_url, "
+            ":status, 3, :created_at, :updated_at)"
+        ),
+        task_rows,
+    )
+    for offset in range(0, tasks, 1000):
+        log_rows = [
+            {
+                "id": uuid.uuid4(),
+                "task_id": task["id"],
+                "execution_time": now - timedelta(minutes=n),
+                "status": "failed" if n % 7 == 0 else "success",
+                "retry_count": 1,
+            }
+            for task in task_rows[offset : offset + 1000]
+            for n in range(logs_per_task)
+        ]
+        conn.execute(
+            text(
+                "INSERT INTO task_logs (id, task_id, execution_time, status, "
+                "retry_count) VALUES (:id, :task_id, :execution_time, :status, "
+                ":retry_count)"
+            ),
+            log_rows,
+        )
+    conn.execute(text("ANALYZE tasks"))
+    conn.execute(text("ANALYZE task_logs"))
+
+
+def cleanup(conn):
+    conn.execute(
+        text(
+            "DELETE FROM task_logs WHERE task_id IN "
+            "(SELECT id FROM tasks WHERE name LIKE :prefix)"
+        ),
+        {"prefix": f"{BENCH_PREFIX}%"},
+    )
+    conn.execute(
+        text("DELETE FROM tasks WHERE name LIKE :prefix"),
+        {"prefix": f"{BENCH_PREFIX}%"},
+    )
+
+
+def explain(conn, sql: str, params: dict) -> dict:
+    result = conn.execute(
+        text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params
+    ).scalar()
+    plan = result[0] if isinstance(result, list) else json.loads(result)[0]
+    root = plan["Plan"]
+    return {
+        "node": _describe(root),
+        "execution_ms": plan["Execution Time"],
+        "shared_blocks": root.get("Shared Hit Blocks", 0)
+        + root.get("Shared Read Blocks", 0),
+    }
+
+
+def _describe(node: dict) -> str:
+    # Report the innermost scan, which is where the index makes a difference
+    while node.get("Plans"):
+        node = node["Plans"][0]
+    name = node["Node Type"]
+    if node.get("Index Name"):
+        name += f" using {node['Index Name']}"
+    return name
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed-tasks", type=int, default=0)
+    parser.add_argument("--logs-per-task", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="keep seeded rows")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        if args.seed_tasks:
+            started = time.perf_counter()
+            seed(conn, args.seed_tasks, args.logs_per_task)
+            conn.commit()
+            print(
+                f"Seeded {args.seed_tasks} tasks in {time.perf_counter() - started:.1f}s"
+            )
+
+        sample = conn.execute(
+            text(
+                "SELECT t.id, t.created_at, l.id, l.execution_time FROM tasks t "
+                "JOIN task_logs l ON l.task_id = t.id "
+                "ORDER BY l.execution_time LIMIT 1 OFFSET 1000"
+            )
+        ).first()
+        if sample is None:
+            print("Not enough data; run with --seed-tasks")
+            return
+        params = {
+            "task_id": sample[0],
+            "created_at": sample[1],
+            "log_id": sample[2],
+            "log_time": sample[3],
+        }
+
+        print(f"{'query':42} {'indexes':8} {'ms':>9} {'blocks':>8}  plan")
+        for name, sql in QUERIES.items():
+            with_indexes = explain(conn, sql, params)
+            conn.rollback()
+
+            for index in INDEXES:
+                conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+            without_indexes = explain(conn, sql, params)
+            conn.rollback()
+
+            for label, result in (("yes", with_indexes), ("no", without_indexes)):
+                print(
+                    f"{name:42} {label:8} {result['execution_ms']:9.2f} "
+                    f"{result['shared_blocks']:8}  {result['node']}"
+                )
+
+        if args.seed_tasks and not args.keep:
+            cleanup(conn)
+            conn.commit()
+
+
+if __name__ == "__main__":
+    main()
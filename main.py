@@ -3,6 +3,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import api_router
 from app.core.database import Base, engine
+from app.core.config import settings
 from app.core.scheduler import TaskScheduler
 from app.core.logging_config import setup_logging, get_logger
 
@@ -21,8 +22,9 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Create tables (deployments managed with `alembic upgrade head` can disable this)
+if settings.DB_CREATE_TABLES:
+    Base.metadata.create_all(bind=engine)
 
 app.include_router(api_router)
 
@@ -36,8 +38,9 @@ async def startup_event():
     global scheduler, scheduler_task
     logger.info("Starting application...")
 
-    # Initialize and start scheduler only if not already running
-    if scheduler is None:
+    # Initialize and start scheduler only if not already running, and only
+    # when it is not run separately with `python -m app.worker`
+    if scheduler is None and settings.EMBEDDED_SCHEDULER:
         scheduler = TaskScheduler()
         scheduler_task = asyncio.create_task(scheduler.start())
 
@@ -0,0 +1,22 @@
+import pytest
+from app.models.task import Task
+
+
+@pytest.fixture
+def make_task():
+    """Build an unsaved Task, using test defaults for the fields not given"""
+
+    def make(**fields):
+        values = {
+            "id": "123e4567-e89b-12d3-a456-426614174000",
+            "name": "Test Task",
+            "schedule": "* * * * *",
+            "webhook_url": "https://discord.com/api/webhooks/test",
+            "payload": {"content": "Test message"},
+            "max_retry": 3,
+            "status": "active",
+        }
+        values.update(fields)
+        return Task(**values)
+
+    return make
@@ -0,0 +1,107 @@
+import time
+import uuid
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.core.config import settings
+from app.core.coordination import SchedulerCoordinator, rendezvous_owner
+from app.core.scheduler import TaskScheduler
+from app.models.task import Task
+
+
+def _live(coordinator, members):
+    coordinator.members = members
+    coordinator._last_heartbeat = time.monotonic()
+
+
+def test_rendezvous_only_moves_tasks_of_the_changed_node():
+    task_ids = [uuid.uuid4() for _ in range(1000)]
+    before = {t: rendezvous_owner(t, ["a", "b", "c"]) for t in task_ids}
+    after = {t: rendezvous_owner(t, ["a", "b", "c", "d"]) for t in task_ids}
+
+    moved = [t for t in task_ids if before[t] != after[t]]
+    assert all(after[t] == "d" for t in moved)
+    # Roughly a quarter of the tasks move to the new node
+    assert 150 < len(moved) < 350
+
+
+def test_sharded_nodes_partition_the_tasks():
+    nodes = [SchedulerCoordinator(mode="sharded") for _ in range(3)]
+    members = [node.node_id for node in nodes]
+    for node in nodes:
+        _live(node, members)
+
+    for task_id in [uuid.uuid4() for _ in range(100)]:
+        assert sum(node.owns(task_id) for node in nodes) == 1
+
+
+def test_leader_mode_and_lapsed_lease():
+    leader = SchedulerCoordinator(mode="leader")
+    follower = SchedulerCoordinator(mode="leader")
+    members = [leader.node_id, follower.node_id]
+    _live(leader, members)
+    _live(follower, members)
+    task_id = uuid.uuid4()
+
+    assert leader.owns(task_id) and not follower.owns(task_id)
+
+    leader._last_heartbeat = time.monotonic() - 3600
+    assert not leader.owns(task_id)
+    assert SchedulerCoordinator(mode="none").owns(task_id)
+
+
+def test_scheduler_does_not_track_tasks_owned_elsewhere():
+    scheduler = TaskScheduler()
+    scheduler.coordinator = SchedulerCoordinator(mode="sharded")
+    _live(scheduler.coordinator, [scheduler.coordinator.node_id, "other-node"])
+    now = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+    for _ in range(50):
+        task = Task(
+            id=uuid.uuid4(),
+            name="Test Task",
+            schedule="* * * * *",
+            webhook_url="https://example.com/hook",
+            max_retry=0,
+            status="active",
+        )
+        scheduler._track_task(task, now)
+        assert (task.id in scheduler._task_group) == scheduler.coordinator.owns(task.id)
+
+
+def test_destination_rate_is_only_split_between_sharded_replicas():
+    scheduler = TaskScheduler()
+    members = [scheduler.coordinator.node_id, "other-node", "third-node"]
+
+    scheduler.coordinator = SchedulerCoordinator(mode="leader")
+    _live(scheduler.coordinator, members)
+    assert scheduler._live_replicas() == 1
+
+    scheduler.coordinator = SchedulerCoordinator(mode="sharded")
+    _live(scheduler.coordinator, members)
+    assert scheduler._live_replicas() == 3
+
+
+@pytest.mark.asyncio
+async def test_every_replica_counts_when_the_run_ledger_dispatches():
+    with patch.object(settings, "SCHEDULER_RUN_LEDGER", True):
+        scheduler = TaskScheduler()
+    assert scheduler.coordinator.mode == "none"
+    assert scheduler.coordinator.heartbeats
+
+    session = AsyncMock()
+    session.execute.return_value = MagicMock()
+    # Two replicas (or two --processes workers) have a lease
+    session.execute.return_value.scalars.return_value.all.return_value = [
+        scheduler.coordinator.node_id,
+        "other-node",
+    ]
+    with patch("app.core.coordination.AsyncSessionLocal", return_value=session):
+        await scheduler.coordinator.heartbeat()
+
+    assert scheduler._live_replicas() == 2
+    assert scheduler.coordinator.owns(uuid.uuid4())
+
+    scheduler.coordinator = SchedulerCoordinator(mode="leader")
+    _live(scheduler.coordinator, ["leader-node", scheduler.coordinator.node_id])
+    assert scheduler._live_replicas() == 2
@@ -0,0 +1,113 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import patch
+from app.core.destinations import DestinationGuard, parse_retry_after
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with (
+        patch("app.core.destinations.time.monotonic", clock),
+        patch("app.core.rate_limit.time.monotonic", clock),
+    ):
+        yield clock
+
+
+def make_guard(**kwargs):
+    options = dict(
+        limits={},
+        default_rate=0,
+        burst=0,
+        failure_threshold=3,
+        cooldown=30,
+        max_cooldown=100,
+    )
+    options.update(kwargs)
+    return DestinationGuard(**options)
+
+
+def test_destination_is_longest_matching_prefix_or_host():
+    guard = make_guard(
+        limits={"https://discord.com/api/webhooks": 5, "discord.com/api/webhooks/1": 1}
+    )
+
+    assert guard.key("https://discord.com/api/webhooks/1/abc") == (
+        "discord.com/api/webhooks/1"
+    )
+    assert guard.key("https://Discord.com/api/webhooks/2/abc") == (
+        "discord.com/api/webhooks"
+    )
+    assert guard.key("https://hooks.slack.com/services/x") == "hooks.slack.com"
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    later = datetime.now(timezone.utc) + timedelta(seconds=60)
+    assert 55 < parse_retry_after(format_datetime(later, usegmt=True)) <= 60
+
+
+def test_rate_limit_is_split_between_replicas(clock):
+    replicas = 1
+    guard = make_guard(
+        limits={"discord.com/api/webhooks": 4}, replicas=lambda: replicas
+    )
+    url = "https://discord.com/api/webhooks/1/abc"
+
+    assert [guard.acquire(url) for _ in range(4)] == [0, 0, 0, 0]
+    assert guard.acquire(url) == pytest.approx(0.25)
+
+    replicas = 2
+    clock.now += 10
+    assert [guard.acquire(url) == 0 for _ in range(3)] == [True, True, False]
+    assert guard.acquire(url) == pytest.approx(0.5)
+    # Hosts without a rule are not limited
+    assert guard.acquire("https://example.com/hook") == 0
+
+
+def test_retry_after_blocks_the_destination(clock):
+    guard = make_guard()
+    url = "https://discord.com/api/webhooks/1/abc"
+
+    assert guard.record(url, False, 429, 5) == 5
+    assert guard.acquire("https://discord.com/api/webhooks/2/def") == 5
+    clock.now += 5
+    assert guard.acquire(url) == 0
+    # Throttling is not a failure of the destination
+    assert guard.stats()["circuit_opens"] == 0
+
+
+def test_circuit_opens_probes_and_closes(clock):
+    guard = make_guard()
+    url = "https://flaky.example.com/hook"
+
+    assert guard.record(url, False, 502) == 0
+    assert guard.record(url, False, None) == 0
+    # Rejected requests do not count, the host is answering
+    assert guard.record(url, False, 404) == 0
+    assert guard.record(url, False, 500) == 30
+    assert guard.acquire(url) == 30
+    assert guard.stats()["open_circuits"] == ["flaky.example.com"]
+
+    # After the cooldown a single probe goes through; its failure doubles it
+    clock.now += 30
+    assert guard.acquire(url) == 0
+    assert guard.acquire(url) == 1.0
+    assert guard.record(url, False, 503) == 60
+
+    clock.now += 60
+    assert guard.acquire(url) == 0
+    assert guard.record(url, True, 204) == 0
+    assert guard.acquire(url) == 0
+    assert guard.stats()["open_circuits"] == []
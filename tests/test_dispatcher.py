@@ -0,0 +1,296 @@
+import pytest
+import asyncio
+from unittest.mock import patch
+from app.core.backoff import retry_delay
+from app.core.batching import WebhookBatcher
+from app.core.dispatcher import TaskDispatcher
+from app.core.task_executor import Delivery
+
+
+class FakeExecutor:
+    """Stands in for TaskExecutor and records how many tasks overlap"""
+
+    running = 0
+    peak = 0
+    last_delivery = None
+    peak_by_host = {}
+    running_by_host = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    async def execute_task(self, task, retry_count=0, **kwargs):
+        cls = FakeExecutor
+        host = task.webhook_url.split("/")[2]
+        cls.running += 1
+        cls.running_by_host[host] = cls.running_by_host.get(host, 0) + 1
+        cls.peak = max(cls.peak, cls.running)
+        cls.peak_by_host[host] = max(
+            cls.peak_by_host.get(host, 0), cls.running_by_host[host]
+        )
+        await asyncio.sleep(0.05)
+        cls.running -= 1
+        cls.running_by_host[host] -= 1
+        return True
+
+
+@pytest.fixture(autouse=True)
+def reset_fake_executor():
+    FakeExecutor.running = 0
+    FakeExecutor.peak = 0
+    FakeExecutor.peak_by_host = {}
+    FakeExecutor.running_by_host = {}
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_runs_tasks_concurrently_within_limit(make_task):
+    dispatcher = TaskDispatcher(workers=10, executor_factory=FakeExecutor)
+    dispatcher.start()
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    for i in range(100):
+        await dispatcher.submit(
+            make_task(id=f"task-{i}", webhook_url="https://hooks.example.com/webhook")
+        )
+    await dispatcher.join()
+    elapsed = loop.time() - started
+    await dispatcher.stop()
+
+    # 100 tasks of 50ms on 10 workers take ~0.5s instead of 5s
+    assert elapsed < 2
+    assert FakeExecutor.peak == 10
+    assert dispatcher.stats()["completed"] == 100
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_enforces_per_host_limit(make_task):
+    dispatcher = TaskDispatcher(
+        workers=20, per_host_limit=2, executor_factory=FakeExecutor
+    )
+    dispatcher.start()
+
+    for i in range(10):
+        await dispatcher.submit(
+            make_task(id=f"task-{i}", webhook_url="https://slow.example.com/webhook")
+        )
+        await dispatcher.submit(
+            make_task(
+                id=f"task-{i + 10}", webhook_url="https://fast.example.com/webhook"
+            )
+        )
+    await dispatcher.join()
+    await dispatcher.stop()
+
+    assert FakeExecutor.peak_by_host == {"slow.example.com": 2, "fast.example.com": 2}
+
+
+@pytest.mark.asyncio
+async def test_tasks_waiting_for_a_host_slot_do_not_hold_workers(make_task):
+    dispatcher = TaskDispatcher(
+        workers=2, per_host_limit=1, executor_factory=FakeExecutor
+    )
+    dispatcher.start()
+
+    for i in range(10):
+        await dispatcher.submit(
+            make_task(id=f"task-{i}", webhook_url="https://slow.example.com/webhook")
+        )
+    await dispatcher.submit(
+        make_task(id="task-10", webhook_url="https://fast.example.com/webhook")
+    )
+    await asyncio.sleep(0.08)
+    # One worker works through the slow host's backlog, the other is free
+    assert dispatcher.stats()["completed"] >= 2
+    assert "fast.example.com" in FakeExecutor.peak_by_host
+
+    await dispatcher.join()
+    await dispatcher.stop()
+
+    assert FakeExecutor.peak_by_host == {"slow.example.com": 1, "fast.example.com": 1}
+    assert dispatcher.stats()["completed"] == 11
+    assert dispatcher.stats()["host_waiting"] == 0
+
+
+class FlakyExecutor:
+    """Fails every attempt of tasks whose URL contains 'broken'"""
+
+    attempts = []
+    deactivated = []
+    last_delivery = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    async def execute_task(self, task, retry_count=0, **kwargs):
+        FlakyExecutor.attempts.append((task.id, retry_count))
+        return "broken" not in task.webhook_url
+
+    async def _deactivate_task(self, task):
+        FlakyExecutor.deactivated.append(task.id)
+
+
+@pytest.mark.asyncio
+async def test_failed_attempts_are_retried_without_blocking_the_worker(make_task):
+    FlakyExecutor.attempts = []
+    FlakyExecutor.deactivated = []
+    broken = make_task(id="task-1", webhook_url="https://broken.example.com/webhook")
+    broken.retry_backoff_base = 0.05
+    healthy = make_task(id="task-2")
+    dispatcher = TaskDispatcher(workers=1, executor_factory=FlakyExecutor)
+    dispatcher.start()
+
+    await dispatcher.submit(broken)
+    await dispatcher.submit(healthy)
+    await dispatcher.join()
+    # The single worker ran the healthy task while the broken one backed off
+    assert FlakyExecutor.attempts == [(broken.id, 1), (healthy.id, 1)]
+    assert dispatcher.stats()["retrying"] == 1
+
+    await asyncio.sleep(0.3)
+    await dispatcher.join()
+    await dispatcher.stop()
+
+    assert FlakyExecutor.attempts[2:] == [(broken.id, 2), (broken.id, 3)]
+    assert FlakyExecutor.deactivated == [broken.id]
+    assert dispatcher.stats()["failed"] == 1
+
+
+class ThrottledExecutor(FlakyExecutor):
+    """Answers 429 with Retry-After to the first request, then succeeds"""
+
+    def __init__(self):
+        self.last_delivery = None
+
+    async def execute_task(self, task, retry_count=0, **kwargs):
+        FlakyExecutor.attempts.append((task.id, retry_count))
+        if len(FlakyExecutor.attempts) == 1:
+            self.last_delivery = Delivery(False, "status 429", 429, 0.1)
+        else:
+            self.last_delivery = Delivery(True, "ok", 204)
+        return self.last_delivery.success
+
+
+@pytest.mark.asyncio
+async def test_throttled_attempt_is_parked_without_using_a_retry(make_task):
+    FlakyExecutor.attempts = []
+    FlakyExecutor.deactivated = []
+    task = make_task(max_retry=1)
+    dispatcher = TaskDispatcher(workers=1, executor_factory=ThrottledExecutor)
+    dispatcher.start()
+
+    await dispatcher.submit(task)
+    await dispatcher.join()
+    assert dispatcher.stats()["parked"] == 1
+    # Other tasks for the destination wait out the Retry-After as well
+    assert dispatcher.destinations.acquire(task.webhook_url) > 0
+
+    await asyncio.sleep(0.2)
+    await dispatcher.join()
+    await dispatcher.stop()
+
+    assert FlakyExecutor.attempts == [(task.id, 1), (task.id, 1)]
+    assert FlakyExecutor.deactivated == []
+    assert dispatcher.stats()["completed"] == 1
+
+
+class BatchExecutor(FlakyExecutor):
+    """Accepts batches, failing the items of tasks whose name contains 'bad'"""
+
+    batches = []
+
+    async def execute_task(self, task, retry_count=0, **kwargs):
+        FlakyExecutor.attempts.append((task.id, retry_count))
+        return True
+
+    async def execute_batch(self, url, items):
+        BatchExecutor.batches.append(
+            [(task.id, attempt) for task, attempt, *_ in items]
+        )
+        deliveries = [
+            Delivery("bad" not in task.name or attempt > 1, "batched", 200)
+            for task, attempt, *_ in items
+        ]
+        return Delivery(True, "batch", 200), deliveries
+
+
+@pytest.mark.asyncio
+async def test_batchable_tasks_sharing_a_url_are_sent_together(make_task):
+    FlakyExecutor.attempts = []
+    BatchExecutor.batches = []
+    batched = [make_task(id=f"task-{i}") for i in range(5)]
+    for task in batched:
+        task.webhook_url = "https://hooks.example.com/fan-in"
+        task.batchable = True
+        task.retry_backoff_base = 0.05
+    batched[0].name = "bad task"
+    single = make_task(id="task-9")
+    dispatcher = TaskDispatcher(workers=2, executor_factory=BatchExecutor)
+    dispatcher.batches.window = 0.05
+    dispatcher.start()
+
+    for task in batched + [single]:
+        await dispatcher.submit(task)
+    for _ in range(100):
+        if BatchExecutor.batches:
+            break
+        await asyncio.sleep(0.01)
+
+    assert BatchExecutor.batches == [[(task.id, 1) for task in batched]]
+    assert FlakyExecutor.attempts == [(single.id, 1)]
+
+    # The failed item is retried on its own schedule, in a later batch
+    await asyncio.sleep(0.2)
+    await dispatcher.join()
+    await dispatcher.stop()
+
+    assert BatchExecutor.batches[1:] == [[(batched[0].id, 2)]]
+    assert dispatcher.stats()["completed"] == 6
+    assert dispatcher.stats()["batches"]["items_sent"] == 6
+
+
+@pytest.mark.asyncio
+async def test_batch_sends_are_bounded_and_cancelled_on_close(make_task):
+    started, cancelled = [], []
+
+    async def send(url, items):
+        started.append(url)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+
+    batcher = WebhookBatcher(send, max_size=1, concurrency=2)
+    for i in range(5):
+        url = f"https://hooks.example.com/{i}"
+        batcher.add(make_task(id=f"task-{i}", webhook_url=url), 1)
+    await asyncio.sleep(0.05)
+    assert len(started) == 2
+    assert batcher.stats()["sending"] == 5
+
+    await batcher.close()
+    assert len(cancelled) == 2
+    assert batcher.stats()["sending"] == 0
+
+
+def test_retry_delay_strategies(make_task):
+    task = make_task()
+    task.retry_backoff_base = 2.0
+    task.retry_backoff_cap = 10.0
+    task.retry_jitter = "none"
+    assert [retry_delay(task, n) for n in range(1, 6)] == [2, 4, 8, 10, 10]
+
+    task.retry_jitter = "full"
+    with patch("app.core.backoff.random.uniform", side_effect=lambda a, b: b / 4):
+        assert retry_delay(task, 2) == 1.0
+
+    task.retry_jitter = "equal"
+    with patch("app.core.backoff.random.uniform", side_effect=lambda a, b: b):
+        assert retry_delay(task, 2) == 4.0
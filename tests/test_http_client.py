@@ -0,0 +1,205 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from app.core.config import settings
+from app.core.http_client import HttpClientPool
+from app.core.http2_client import Http2ClientPool
+from app.core.task_executor import TaskExecutor, batch_deliveries
+from app.models.task import Task
+
+
+@pytest.mark.asyncio
+async def test_executors_share_pooled_connections(monkeypatch):
+    async def webhook(request):
+        await request.read()
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_post("/webhook", webhook)
+    server = TestServer(app)
+    await server.start_server()
+    monkeypatch.setattr(TaskExecutor, "_log_task_execution", AsyncMock())
+
+    pool = HttpClientPool(limit=10, limit_per_host=5)
+    pool.open()
+    try:
+        task = Task(
+            id="123e4567-e89b-12d3-a456-426614174000",
+            name="Test Task",
+            schedule="* * * * *",
+            webhook_url=str(server.make_url("/webhook")),
+            payload={"content": "Test message"},
+            max_retry=3,
+            status="active",
+        )
+        for _ in range(5):
+            async with TaskExecutor(session=pool.session) as executor:
+                assert await executor.execute_task(task, 1) is True
+
+        assert not pool.session.closed
+        stats = pool.stats()
+        assert stats["requests_total"] == 5
+        assert stats["requests_in_flight"] == 0
+        assert stats["connections_created"] == 1
+        assert stats["connections_reused"] == 4
+    finally:
+        await pool.close()
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_and_large_responses_are_bounded(monkeypatch):
+    async def hang(request):
+        await asyncio.sleep(5)
+        return web.Response(status=204)
+
+    async def huge(request):
+        return web.Response(status=500, body=b"x" * 1_000_000)
+
+    app = web.Application()
+    app.router.add_post("/hang", hang)
+    app.router.add_post("/huge", huge)
+    server = TestServer(app)
+    await server.start_server()
+    monkeypatch.setattr(settings, "WEBHOOK_RESPONSE_PREFIX_BYTES", 16)
+    monkeypatch.setattr(settings, "WEBHOOK_RESPONSE_DRAIN_BYTES", 1024)
+
+    pool = HttpClientPool()
+    try:
+        executor = TaskExecutor(session=pool.open())
+        slow = Task(
+            id="123e4567-e89b-12d3-a456-426614174000",
+            webhook_url=str(server.make_url("/hang")),
+            read_timeout=0.2,
+        )
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        delivery = await executor.deliver(slow)
+        assert not delivery.success
+        assert "timed out" in delivery.message.lower()
+        assert loop.time() - started < 2
+
+        large = Task(
+            id="123e4567-e89b-12d3-a456-426614174001",
+            webhook_url=str(server.make_url("/huge")),
+        )
+        delivery = await executor.deliver(large)
+        assert delivery.status == 500
+        assert delivery.message == "Webhook request failed with status 500: " + "x" * 16
+    finally:
+        await pool.close()
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_selected_destinations_are_sent_over_http2(monkeypatch):
+    pytest.importorskip("h2")
+    from benchmarks.http2_delivery import H2StubServer
+
+    server = await H2StubServer().start()
+    monkeypatch.setattr(TaskExecutor, "_log_task_execution", AsyncMock())
+    http2 = Http2ClientPool(
+        enabled=False,
+        destinations=[f"127.0.0.1:{server.port}/h2"],
+        prior_knowledge=True,
+    )
+    try:
+        http2.open()
+        executor = TaskExecutor(session=None, http2=http2)
+        tasks = [
+            Task(
+                id=f"123e4567-e89b-12d3-a456-4266141740{i:02d}",
+                webhook_url=server.url(f"/h2/{i}"),
+                payload={"content": i},
+            )
+            for i in range(20)
+        ]
+        results = await asyncio.gather(*(executor.execute_task(t, 1) for t in tasks))
+
+        assert results == [True] * 20
+        assert server.connections == 1
+        assert http2.stats()["responses_by_version"] == {"HTTP/2": 20}
+        assert not http2.handles(server.url("/other"))
+    finally:
+        await http2.close()
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_is_posted_as_one_array_with_per_task_outcomes(monkeypatch):
+    received = []
+
+    async def fan_in(request):
+        items = await request.json()
+        received.append(items)
+        return web.json_response(
+            [{"status": 500 if item.get("fail") else 200} for item in items]
+        )
+
+    app = web.Application()
+    app.router.add_post("/fan-in", fan_in)
+    server = TestServer(app)
+    await server.start_server()
+    log = AsyncMock()
+    monkeypatch.setattr(TaskExecutor, "_log_task_execution", log)
+
+    pool = HttpClientPool()
+    try:
+        executor = TaskExecutor(session=pool.open())
+        url = str(server.make_url("/fan-in"))
+        items = [
+            (
+                Task(
+                    id=f"123e4567-e89b-12d3-a456-42661417400{i}",
+                    webhook_url=url,
+                    payload={"n": i, "fail": i == 1},
+                ),
+                1,
+                None,
+                None,
+            )
+            for i in range(3)
+        ]
+        batch, deliveries = await executor.execute_batch(url, items)
+
+        assert received == [[{"n": i, "fail": i == 1} for i in range(3)]]
+        assert batch.success
+        assert [d.success for d in deliveries] == [True, False, True]
+        assert [call.args[2] for call in log.call_args_list] == [
+            "success",
+            "failed",
+            "success",
+        ]
+    finally:
+        await pool.close()
+        await server.close()
+
+
+def test_batch_response_without_per_task_results_applies_to_all():
+    batch, deliveries = batch_deliveries(204, b"", None, 3)
+    assert batch.success and all(d.success for d in deliveries)
+
+    batch, deliveries = batch_deliveries(429, b"slow down", "2", 2)
+    assert not batch.success and batch.retry_after == 2
+    assert [d.status for d in deliveries] == [429, 429]
+
+    # A result list of the wrong length can't be matched to the tasks
+    batch, deliveries = batch_deliveries(200, b"[true]", None, 2)
+    assert [d.success for d in deliveries] == [True, True]
+
+
+def test_unrecognised_batch_entries_count_as_failures():
+    batch, deliveries = batch_deliveries(
+        200,
+        b'[{"status":"error"},null,"failed",{"error":"boom"},201,{"ok":true},204]',
+        None,
+        7,
+    )
+
+    assert batch.success
+    # 201 is not a success status for single requests either
+    outcomes = [delivery.success for delivery in deliveries]
+    assert outcomes == [False] * 5 + [True, True]
+    assert deliveries[2].message == 'Batched webhook item failed: "failed"'
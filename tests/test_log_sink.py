@@ -0,0 +1,106 @@
+import pytest
+import asyncio
+from app.core.log_sink import TaskLogSink
+
+TASK_ID = "123e4567-e89b-12d3-a456-426614174000"
+
+
+class RecordingSink(TaskLogSink):
+    """TaskLogSink that records flushed batches instead of writing them"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches = []
+
+    async def _flush(self, batch):
+        self.batches.append(batch)
+        self.written += len(batch)
+
+
+@pytest.mark.asyncio
+async def test_sink_flushes_full_batches():
+    sink = RecordingSink(batch_size=10, flush_interval_ms=10000, max_buffer=100)
+    sink.start()
+    for i in range(25):
+        await sink.write(TASK_ID, "success", 1, f"attempt {i}")
+    await asyncio.sleep(0.05)
+
+    assert [len(batch) for batch in sink.batches] == [10, 10]
+
+    await sink.stop()
+    assert [len(batch) for batch in sink.batches] == [10, 10, 5]
+    assert sink.stats()["written"] == 25
+
+
+@pytest.mark.asyncio
+async def test_sink_flushes_partial_batch_after_interval():
+    sink = RecordingSink(batch_size=100, flush_interval_ms=20, max_buffer=100)
+    sink.start()
+    await sink.write(TASK_ID, "failed", 2, "Webhook request failed with status 500")
+    await asyncio.sleep(0.1)
+
+    assert len(sink.batches) == 1
+    record = sink.batches[0][0]
+    assert record["status"] == "failed"
+    assert record["retry_count"] == 2
+    await sink.stop()
+
+
+@pytest.mark.asyncio
+async def test_sink_applies_back_pressure_when_full():
+    sink = RecordingSink(batch_size=10, flush_interval_ms=10, max_buffer=5)
+    for i in range(5):
+        await sink.write(TASK_ID, "success", 1, "ok")
+
+    # The flusher is not running yet, so the buffer cannot drain
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(sink.write(TASK_ID, "success", 1, "ok"), 0.05)
+
+    sink.start()
+    await asyncio.wait_for(sink.write(TASK_ID, "success", 1, "ok"), 1)
+    await sink.stop()
+    assert sink.stats()["written"] == 6
+
+
+class FailingSink(TaskLogSink):
+    """TaskLogSink whose inserts fail as scripted"""
+
+    def __init__(self, *args, fail_batches=0, bad_message=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail_batches = fail_batches
+        self.bad_message = bad_message
+        self.inserts = []
+
+    async def _insert(self, records):
+        self.inserts.append(len(records))
+        if self.fail_batches:
+            self.fail_batches -= 1
+            raise ConnectionError("connection reset")
+        if any(record["message"] == self.bad_message for record in records):
+            raise ValueError("invalid record")
+
+
+@pytest.mark.asyncio
+async def test_sink_retries_a_failed_batch_once():
+    sink = FailingSink(batch_size=10, flush_interval_ms=10, fail_batches=1)
+    sink.start()
+    for i in range(10):
+        await sink.write(TASK_ID, "success", 1, f"attempt {i}")
+    await sink.stop()
+
+    assert sink.inserts == [10, 10]
+    assert sink.stats()["written"] == 10
+    assert sink.stats()["failed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sink_falls_back_to_single_rows_for_a_bad_record():
+    sink = FailingSink(batch_size=5, flush_interval_ms=10, bad_message="attempt 2")
+    sink.start()
+    for i in range(5):
+        await sink.write(TASK_ID, "success", 1, f"attempt {i}")
+    await sink.stop()
+
+    assert sink.inserts == [5, 5, 1, 1, 1, 1, 1]
+    assert sink.stats()["written"] == 4
+    assert sink.stats()["failed"] == 1
@@ -0,0 +1,105 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+from app.core.misfire import catch_up_times, missed_occurrences
+from app.core.rate_limit import TokenBucket
+from app.core.scheduler import TaskScheduler
+
+BASE = datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def test_missed_occurrences_are_bounded_by_the_limit():
+    # Ten years of downtime, but only the latest three occurrences are computed
+    missed = missed_occurrences(
+        "* * * * *", BASE - timedelta(days=3650), BASE + timedelta(seconds=30), 3
+    )
+    assert missed == [
+        BASE - timedelta(minutes=2),
+        BASE - timedelta(minutes=1),
+        BASE,
+    ]
+
+
+def test_catch_up_policies(make_task):
+    last_fired = datetime(2023, 1, 1, 11, 0)  # naive UTC, as stored
+    now = BASE + timedelta(minutes=5)
+    task = make_task(
+        schedule="*/10 * * * *",
+        max_retry=0,
+        misfire_grace_seconds=3600,
+        max_backfill=10,
+    )
+
+    task.misfire_policy = "skip"
+    assert catch_up_times(task, last_fired, now) == []
+    task.misfire_policy = "fire_once"
+    assert catch_up_times(task, last_fired, now) == [BASE]
+    task.misfire_policy = "fire_all"
+    assert catch_up_times(task, last_fired, now) == [
+        BASE - timedelta(minutes=m) for m in (50, 40, 30, 20, 10, 0)
+    ]
+    task.max_backfill = 2
+    assert catch_up_times(task, last_fired, now) == [
+        BASE - timedelta(minutes=10),
+        BASE,
+    ]
+    # Only occurrences within the grace window are replayed
+    task.max_backfill = 10
+    task.misfire_grace_seconds = 1000
+    assert catch_up_times(task, last_fired, now) == [
+        BASE - timedelta(minutes=10),
+        BASE,
+    ]
+
+
+def test_token_bucket_limits_bursts():
+    bucket = TokenBucket(rate=1, burst=2)
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert 0 < bucket.delay() <= 1
+
+
+@pytest.mark.asyncio
+async def test_missed_runs_are_backfilled_at_the_limited_rate(make_task):
+    scheduler = TaskScheduler()
+    scheduler._backfill_limiter = TokenBucket(rate=0.001, burst=2)
+    task = make_task(
+        schedule="*/10 * * * *",
+        max_retry=0,
+        misfire_policy="fire_all",
+        misfire_grace_seconds=3600,
+        max_backfill=10,
+    )
+    scheduler._track_task(task, BASE)
+
+    with (
+        patch.object(
+            scheduler,
+            "_last_fired_times",
+            new=AsyncMock(return_value={task.id: datetime(2023, 1, 1, 11, 0)}),
+        ),
+        patch.object(scheduler.dispatcher, "is_running", return_value=False),
+        patch.object(scheduler.dispatcher, "submit", new=AsyncMock()) as submit,
+    ):
+        assert await scheduler._plan_catch_up(BASE + timedelta(minutes=5))
+        assert len(scheduler._backfill) == 6
+
+        await scheduler._drain_backfill()
+
+    # One run per task per pass, within the burst
+    assert submit.await_count == 1
+    assert len(scheduler._backfill) == 5
+
+
+@pytest.mark.asyncio
+async def test_last_fire_times_come_from_the_scheduled_occurrence():
+    scheduler = TaskScheduler()
+    scheduler.ledger = None
+    session = AsyncMock()
+    session.execute.return_value = []
+
+    with patch("app.core.scheduler.AsyncSessionLocal", return_value=session):
+        await scheduler._last_fired_times(["task-1"])
+
+    query = str(session.execute.await_args.args[0])
+    assert "coalesce(max(task_logs.scheduled_for)" in query
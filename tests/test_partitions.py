@@ -0,0 +1,97 @@
+import pytest
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+from app.core.partitions import (
+    TaskLogPartitionManager,
+    covered,
+    overlapping_partitions,
+    parse_partition_bound,
+    parse_partition_name,
+    partition_bounds,
+)
+
+
+def test_monthly_partitions_are_planned_ahead_across_year_end():
+    manager = TaskLogPartitionManager(interval="month", ahead=2, retention_days=0)
+
+    planned = manager.planned_partitions(datetime(2023, 11, 15, 8, 30))
+
+    assert planned == [
+        ("task_logs_p2023_11", datetime(2023, 11, 1), datetime(2023, 12, 1)),
+        ("task_logs_p2023_12", datetime(2023, 12, 1), datetime(2024, 1, 1)),
+        ("task_logs_p2024_01", datetime(2024, 1, 1), datetime(2024, 2, 1)),
+    ]
+
+
+def test_daily_partition_names_round_trip():
+    start, end = partition_bounds(datetime(2024, 2, 29, 23, 59), "day")
+
+    assert (start, end) == (datetime(2024, 2, 29), datetime(2024, 3, 1))
+    assert parse_partition_name("task_logs_p2024_02_29") == (start, end)
+    assert parse_partition_name("task_logs_default") is None
+
+
+def test_only_partitions_entirely_past_retention_expire():
+    manager = TaskLogPartitionManager(interval="month", ahead=2, retention_days=90)
+    names = [
+        "task_logs_default",
+        "task_logs_p2023_01",
+        "task_logs_p2023_02",
+        "task_logs_p2023_03",
+        "task_logs_p2023_04",
+    ]
+
+    # The cutoff is 2023-03-02: March still holds logs inside the window
+    expired = manager.expired_partitions(names, datetime(2023, 5, 31))
+
+    assert expired == ["task_logs_p2023_01", "task_logs_p2023_02"]
+
+
+def test_partition_bounds_are_read_from_the_catalog_expression():
+    assert parse_partition_bound(
+        "FOR VALUES FROM ('2023-11-01 00:00:00') TO ('2023-12-01 00:00:00')"
+    ) == (datetime(2023, 11, 1), datetime(2023, 12, 1))
+    assert parse_partition_bound("DEFAULT") is None
+
+
+def test_daily_partitions_inside_existing_monthly_ones_are_covered():
+    existing = {
+        "task_logs_default": None,
+        "task_logs_p2023_11": (datetime(2023, 11, 1), datetime(2023, 12, 1)),
+        "task_logs_p2023_12": (datetime(2023, 12, 1), datetime(2024, 1, 1)),
+    }
+
+    day = partition_bounds(datetime(2023, 11, 30), "day")
+    overlaps = overlapping_partitions(*day, existing)
+    assert [name for name, _ in overlaps] == ["task_logs_p2023_11"]
+    assert covered(*day, overlaps)
+
+    # A month of daily partitions with gaps is only partly covered
+    daily = {
+        "task_logs_p2024_01_01": partition_bounds(datetime(2024, 1, 1), "day"),
+        "task_logs_p2024_01_03": partition_bounds(datetime(2024, 1, 3), "day"),
+    }
+    month = partition_bounds(datetime(2024, 1, 1), "month")
+    assert not covered(*month, overlapping_partitions(*month, daily))
+    assert (
+        overlapping_partitions(*partition_bounds(datetime(2024, 2, 1), "month"), daily)
+        == []
+    )
+
+
+@pytest.mark.asyncio
+async def test_maintenance_is_skipped_on_replicas_that_should_not_run_it():
+    manager = TaskLogPartitionManager(should_run=lambda: False)
+
+    with (
+        patch.object(manager, "run_once", AsyncMock()) as run_once,
+        patch(
+            "app.core.partitions.asyncio.sleep",
+            AsyncMock(side_effect=asyncio.CancelledError),
+        ),
+    ):
+        with pytest.raises(asyncio.CancelledError):
+            await manager.run_forever()
+
+    run_once.assert_not_called()
@@ -0,0 +1,81 @@
+import json
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from pydantic import ValidationError
+from app.core.payloads import PayloadCache, encode_json
+from app.schemas.task import TaskCreate
+
+
+def test_payload_is_encoded_once_per_task_version(make_task):
+    cache = PayloadCache(maxsize=10)
+    task = make_task(payload={"content": "hello"}, updated_at=datetime(2023, 1, 1))
+
+    with patch("app.core.payloads.encode_json", wraps=encode_json) as encode:
+        for _ in range(3):
+            body, content_type = cache.get(task)
+        assert encode.call_count == 1
+        assert json.loads(body) == {"content": "hello"}
+        assert content_type == "application/json"
+
+        # An edit bumps updated_at, which invalidates the entry
+        edited = make_task(
+            payload={"content": "edited"}, updated_at=datetime(2023, 1, 2)
+        )
+        assert json.loads(cache.get(edited)[0]) == {"content": "edited"}
+        assert encode.call_count == 2
+
+    assert cache.stats()["hits"] == 2
+    cache.invalidate(task.id)
+    assert cache.stats()["size"] == 0
+
+
+def test_unsaved_tasks_and_wide_integers_are_encoded(make_task):
+    cache = PayloadCache(maxsize=10)
+    task = make_task(payload=None)
+
+    assert cache.get(task)[0] == b"{}"
+    assert cache.stats()["size"] == 0
+    assert json.loads(encode_json({"n": 2**70, "s": "é"})) == {"n": 2**70, "s": "é"}
+
+
+def test_template_placeholders_are_rendered_per_attempt(make_task):
+    cache = PayloadCache(maxsize=10)
+    task = make_task(
+        payload={
+            "content": 'Run of "{{ task.name }}" due {{scheduled_for}}',
+            "attempt": "{{attempt}}",
+            "quoted": 'x\\"{{attempt}}"',
+            "other": "{{unknown}}",
+        },
+        updated_at=datetime(2023, 1, 1),
+    )
+    task.name = 'Daily "report"'
+    task.payload_template = True
+    scheduled_for = datetime(2023, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+    body, _ = cache.get(task, 2, scheduled_for)
+
+    assert json.loads(body) == {
+        "content": 'Run of "Daily "report"" due 2023-01-01T12:00:00+00:00',
+        "attempt": 2,
+        "quoted": 'x\\"2"',
+        "other": "{{unknown}}",
+    }
+    # Compiled once; later attempts only substitute
+    assert json.loads(cache.get(task, 3, scheduled_for)[0])["attempt"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_placeholders_are_left_alone_without_templating(make_task):
+    task = make_task(payload={"content": "{{attempt}}"})
+    assert json.loads(PayloadCache(maxsize=10).get(task, 2)[0]) == {
+        "content": "{{attempt}}"
+    }
+
+
+def test_unknown_template_variables_are_rejected():
+    fields = dict(name="t", schedule="* * * * *", webhook_url="https://x.test/hook")
+    TaskCreate(**fields, payload={"a": "{{attempt}}"}, payload_template=True)
+    with pytest.raises(ValidationError, match="fire_time"):
+        TaskCreate(**fields, payload={"a": "{{fire_time}}"}, payload_template=True)
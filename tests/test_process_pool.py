@@ -0,0 +1,50 @@
+import pytest
+import uuid
+from unittest.mock import AsyncMock
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from app.core.process_pool import ProcessDeliveryPool
+from app.core.task_executor import TaskExecutor
+from app.models.task import Task
+
+
+@pytest.mark.asyncio
+async def test_webhooks_are_sent_from_child_processes(monkeypatch):
+    received = []
+
+    async def webhook(request):
+        received.append(await request.json())
+        status = 204 if request.path == "/ok" else 500
+        return web.Response(status=status)
+
+    app = web.Application()
+    app.router.add_post("/ok", webhook)
+    app.router.add_post("/fail", webhook)
+    server = TestServer(app)
+    await server.start_server()
+    log = AsyncMock()
+    monkeypatch.setattr(TaskExecutor, "_log_task_execution", log)
+
+    pool = ProcessDeliveryPool(processes=2)
+    pool.start()
+    try:
+        executor = TaskExecutor(delivery=pool)
+        for path, expected in (("/ok", True), ("/fail", False)):
+            task = Task(
+                id=uuid.uuid4(),
+                name="Test Task",
+                schedule="* * * * *",
+                webhook_url=str(server.make_url(path)),
+                payload={"content": path},
+                max_retry=3,
+                status="active",
+            )
+            assert await executor.execute_task(task, 1) is expected
+
+        assert received == [{"content": "/ok"}, {"content": "/fail"}]
+        # Outcomes are logged by the parent
+        assert [call.args[2] for call in log.call_args_list] == ["success", "failed"]
+        assert pool.stats()["pending"] == 0
+    finally:
+        await pool.stop()
+        await server.close()
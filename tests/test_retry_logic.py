@@ -71,7 +71,9 @@ def test_task_deactivation_after_max_retries(auth_headers):
         
         # Test the _log_task_execution method
         executor = TaskExecutor()
-        executor._log_task_execution(updated_task, 2, "failed", "Task failed after max retries")
+        asyncio.run(
+            executor._log_task_execution(updated_task, 2, "failed", "Task failed after max retries")
+        )
         
         # Verify task log was created
         log = db.query(TaskLog).filter(TaskLog.task_id == task_id).order_by(TaskLog.created_at.desc()).first()
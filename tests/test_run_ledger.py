@@ -0,0 +1,206 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+from app.core.run_ledger import RECORD_CHUNK_SIZE, TaskRunLedger
+from app.core.scheduler import TaskScheduler
+from app.models.task import Task
+
+BASE = datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _task():
+    return Task(
+        id="123e4567-e89b-12d3-a456-426614174000",
+        name="Test Task",
+        schedule="* * * * *",
+        webhook_url="https://discord.com/api/webhooks/test",
+        payload={"content": "Test message"},
+        max_retry=3,
+        status="active",
+    )
+
+
+@pytest.mark.asyncio
+async def test_due_tasks_are_recorded_instead_of_dispatched():
+    scheduler = TaskScheduler()
+    scheduler.ledger = AsyncMock()
+    task = _task()
+    scheduler._track_task(task, BASE)
+
+    with (
+        patch.object(
+            scheduler, "_load_tasks", new=AsyncMock(return_value={task.id: task})
+        ),
+        patch.object(scheduler.dispatcher, "submit", new=AsyncMock()) as submit,
+    ):
+        await scheduler._check_and_execute_tasks(BASE + timedelta(minutes=1))
+
+    submit.assert_not_called()
+    scheduler.ledger.record.assert_awaited_once_with(
+        [(task.id, BASE + timedelta(minutes=1))]
+    )
+
+
+@pytest.mark.asyncio
+async def test_claimed_runs_are_dispatched_and_finished():
+    scheduler = TaskScheduler()
+    scheduler.ledger = AsyncMock()
+    task = _task()
+    scheduled_for = datetime(2023, 1, 1, 12, 1)
+    scheduler.ledger.claim.return_value = [(task.id, scheduled_for)]
+
+    with (
+        patch.object(
+            scheduler, "_load_tasks", new=AsyncMock(return_value={task.id: task})
+        ),
+        patch.object(
+            scheduler.dispatcher, "submit", new=AsyncMock(return_value=True)
+        ) as submit,
+    ):
+        await scheduler._dispatch_claimed_runs(BASE + timedelta(minutes=1))
+        submit.assert_awaited_once_with(task, BASE + timedelta(minutes=1))
+
+        await scheduler._on_task_complete(task, True)
+        scheduler.ledger.finish.assert_awaited_once_with(
+            task.id, BASE + timedelta(minutes=1), "done"
+        )
+
+
+@pytest.mark.asyncio
+async def test_claimed_run_is_released_while_task_runs_unclaimed():
+    scheduler = TaskScheduler()
+    scheduler.ledger = AsyncMock()
+    task = _task()
+    scheduled_for = datetime(2023, 1, 1, 12, 1)
+    scheduler.ledger.claim.return_value = [(task.id, scheduled_for)]
+
+    with (
+        patch.object(
+            scheduler, "_load_tasks", new=AsyncMock(return_value={task.id: task})
+        ),
+        patch.object(scheduler.dispatcher, "submit", new=AsyncMock(return_value=False)),
+    ):
+        await scheduler._dispatch_claimed_runs(BASE + timedelta(minutes=1))
+
+    scheduler.ledger.finish.assert_not_called()
+    scheduler.ledger.release.assert_awaited_once_with(
+        [(task.id, BASE + timedelta(minutes=1))]
+    )
+    assert task.id not in scheduler._claimed
+
+
+@pytest.mark.asyncio
+async def test_second_claimed_occurrence_waits_for_the_first():
+    scheduler = TaskScheduler()
+    scheduler.ledger = AsyncMock()
+    task = _task()
+    first, second = datetime(2023, 1, 1, 12, 1), datetime(2023, 1, 1, 12, 2)
+    scheduler.ledger.claim.side_effect = [[(task.id, first), (task.id, second)], []]
+
+    with (
+        patch.object(
+            scheduler, "_load_tasks", new=AsyncMock(return_value={task.id: task})
+        ),
+        patch.object(
+            scheduler.dispatcher, "submit", new=AsyncMock(return_value=True)
+        ) as submit,
+    ):
+        await scheduler._dispatch_claimed_runs(BASE + timedelta(minutes=2))
+        submit.assert_awaited_once_with(task, BASE + timedelta(minutes=1))
+        assert scheduler._held_runs() == [
+            (task.id, BASE + timedelta(minutes=1)),
+            (task.id, BASE + timedelta(minutes=2)),
+        ]
+
+        await scheduler._on_task_complete(task, True)
+        await scheduler._dispatch_claimed_runs(BASE + timedelta(minutes=3))
+        submit.assert_awaited_with(task, BASE + timedelta(minutes=2))
+
+    scheduler.ledger.finish.assert_awaited_once_with(
+        task.id, BASE + timedelta(minutes=1), "done"
+    )
+    assert scheduler._waiting_runs == {}
+
+
+@pytest.mark.asyncio
+async def test_own_run_reclaimed_while_retrying_is_left_alone():
+    scheduler = TaskScheduler()
+    scheduler.ledger = AsyncMock()
+    task = _task()
+    scheduled_for = datetime(2023, 1, 1, 12, 1)
+    scheduler._claimed[task.id] = scheduled_for.replace(tzinfo=timezone.utc)
+    scheduler.ledger.claim.return_value = [(task.id, scheduled_for)]
+
+    with (
+        patch.object(
+            scheduler, "_load_tasks", new=AsyncMock(return_value={task.id: task})
+        ),
+        patch.object(scheduler.dispatcher, "submit", new=AsyncMock()) as submit,
+    ):
+        await scheduler._dispatch_claimed_runs(BASE + timedelta(minutes=20))
+
+    submit.assert_not_called()
+    scheduler.ledger.finish.assert_not_called()
+    assert scheduler._claimed[task.id] == BASE + timedelta(minutes=1)
+
+
+@pytest.mark.asyncio
+async def test_claims_of_running_tasks_are_renewed_periodically():
+    scheduler = TaskScheduler()
+    scheduler.ledger = AsyncMock()
+    scheduler.ledger.claim_timeout = 900
+    task = _task()
+    scheduler._claimed[task.id] = BASE
+
+    await scheduler._renew_claims(BASE)
+    await scheduler._renew_claims(BASE + timedelta(minutes=1))
+    await scheduler._renew_claims(BASE + timedelta(minutes=5))
+
+    assert scheduler.ledger.renew.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_unfinished_claims_are_released_on_stop():
+    scheduler = TaskScheduler()
+    scheduler.ledger = AsyncMock()
+    task = _task()
+    scheduler._claimed[task.id] = BASE
+
+    with (
+        patch.object(scheduler.coordinator, "leave", new=AsyncMock()),
+        patch.object(scheduler.dispatcher, "stop", new=AsyncMock()),
+    ):
+        await scheduler.stop()
+
+    scheduler.ledger.release.assert_awaited_once_with([(task.id, BASE)])
+    assert scheduler._claimed == {}
+
+
+@pytest.mark.asyncio
+async def test_occurrences_are_kept_when_recording_fails():
+    scheduler = TaskScheduler()
+    scheduler.ledger = AsyncMock()
+    scheduler.ledger.record.side_effect = [ConnectionError("down"), None]
+    first = [("task-1", BASE)]
+    second = [("task-2", BASE + timedelta(minutes=1))]
+
+    await scheduler._record(first)
+    assert scheduler._unrecorded == first
+
+    await scheduler._record(second)
+    scheduler.ledger.record.assert_awaited_with(first + second)
+    assert scheduler._unrecorded == []
+
+
+@pytest.mark.asyncio
+async def test_large_record_is_split_under_the_parameter_limit():
+    ledger = TaskRunLedger("node-1")
+    session = AsyncMock()
+    occurrences = [(f"task-{i}", BASE) for i in range(RECORD_CHUNK_SIZE * 2 + 1)]
+
+    with patch("app.core.run_ledger.AsyncSessionLocal", return_value=session):
+        await ledger.record(occurrences)
+
+    assert session.execute.await_count == 3
+    assert RECORD_CHUNK_SIZE * 5 < 32767
+    session.commit.assert_awaited_once()
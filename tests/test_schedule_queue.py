@@ -0,0 +1,120 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.core.schedule_queue import ScheduleQueue
+from app.core.scheduler import ID_CHUNK_SIZE, TaskScheduler
+from app.models.task import Task
+
+BASE = datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def test_pop_due_returns_only_due_entries_in_order():
+    queue = ScheduleQueue()
+    queue.push("b", BASE + timedelta(minutes=2))
+    queue.push("a", BASE + timedelta(minutes=1))
+    queue.push("c", BASE + timedelta(minutes=10))
+
+    due = queue.pop_due(BASE + timedelta(minutes=5))
+
+    assert [key for key, _ in due] == ["a", "b"]
+    assert len(queue) == 1
+    assert queue.peek_time() == BASE + timedelta(minutes=10)
+
+
+def test_reschedule_and_remove_invalidate_old_entries():
+    queue = ScheduleQueue()
+    queue.push("a", BASE)
+    queue.push("a", BASE + timedelta(hours=1))
+    queue.push("b", BASE)
+    queue.remove("b")
+
+    assert queue.pop_due(BASE + timedelta(minutes=1)) == []
+    assert queue.peek_time() == BASE + timedelta(hours=1)
+    assert "b" not in queue
+
+
+def test_heap_is_compacted_after_many_reschedules():
+    queue = ScheduleQueue()
+    for i in range(1000):
+        queue.push("a", BASE + timedelta(seconds=i))
+
+    assert len(queue) == 1
+    assert len(queue._heap) < 100
+
+
+@pytest.mark.asyncio
+async def test_scheduler_executes_due_task_and_requeues_it():
+    scheduler = TaskScheduler()
+    task = Task(
+        id="123e4567-e89b-12d3-a456-426614174000",
+        name="Test Task",
+        schedule="* * * * *",  # Every minute
+        webhook_url="https://discord.com/api/webhooks/test",
+        payload={"content": "Test message"},
+        max_retry=3,
+        status="active",
+    )
+    scheduler._track_task(task, BASE)
+    assert scheduler.queue.peek_time() == BASE + timedelta(minutes=1)
+
+    with (
+        patch.object(
+            scheduler, "_load_tasks", new=AsyncMock(return_value={task.id: task})
+        ),
+        patch.object(scheduler.dispatcher, "submit", new=AsyncMock()) as submit,
+    ):
+        await scheduler._check_and_execute_tasks(BASE + timedelta(seconds=30))
+        submit.assert_not_called()
+
+        await scheduler._check_and_execute_tasks(BASE + timedelta(minutes=1))
+        submit.assert_called_once_with(task, BASE + timedelta(minutes=1))
+
+    assert scheduler.queue.peek_time() == BASE + timedelta(minutes=2)
+
+
+def test_stored_next_run_at_is_used_and_recomputed_values_are_saved():
+    scheduler = TaskScheduler()
+    stored = Task(
+        id="123e4567-e89b-12d3-a456-426614174001",
+        name="Stored",
+        schedule="0 * * * *",
+        webhook_url="https://discord.com/api/webhooks/test",
+        status="active",
+        next_run_at=datetime(2023, 1, 1, 13, 0),
+    )
+    stale = Task(
+        id="123e4567-e89b-12d3-a456-426614174002",
+        name="Stale",
+        schedule="0 * * * *",
+        webhook_url="https://discord.com/api/webhooks/test",
+        status="active",
+        next_run_at=datetime(2023, 1, 1, 11, 0),
+    )
+    scheduler._track_task(stored, BASE)
+    scheduler._track_task(stale, BASE)
+
+    assert scheduler.queue.peek_time() == BASE + timedelta(hours=1)
+    assert len(scheduler.queue) == 1
+    assert scheduler._next_run_updates == {stale.id: BASE + timedelta(hours=1)}
+
+
+@pytest.mark.asyncio
+async def test_next_run_writes_and_loads_are_chunked():
+    scheduler = TaskScheduler()
+    next_run = BASE + timedelta(hours=1)
+    task_ids = [f"task-{i}" for i in range(ID_CHUNK_SIZE * 2 + 1)]
+    scheduler._next_run_updates = {task_id: next_run for task_id in task_ids}
+    session = AsyncMock()
+    session.execute.return_value = MagicMock()
+    session.commit.side_effect = RuntimeError("connection lost")
+
+    with patch("app.core.scheduler.AsyncSessionLocal", return_value=session):
+        await scheduler._store_next_runs()
+        assert session.execute.await_count == 3
+        # A failed write is not retried on every loop
+        assert scheduler._next_run_updates == {}
+
+        session.execute.reset_mock()
+        session.execute.return_value.scalars.return_value.all.return_value = []
+        assert await scheduler._load_tasks(task_ids) == {}
+        assert session.execute.await_count == 3
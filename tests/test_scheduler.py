@@ -1,7 +1,7 @@
 import pytest
 import asyncio
 from unittest.mock import AsyncMock, patch, MagicMock
-from datetime import datetime
+from datetime import datetime, timezone
 from app.core.task_executor import TaskExecutor
 from app.core.scheduler import TaskScheduler
 from app.models.task import Task
@@ -110,11 +110,12 @@ def test_should_execute_task():
     )
 
     # Test with times that should trigger execution
-    last_check = datetime(2023, 1, 1, 12, 0, 0)
-    current_time = datetime(2023, 1, 1, 12, 1, 30)  # 1.5 minutes later
+    last_check = datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    current_time = datetime(2023, 1, 1, 12, 1, 30, tzinfo=timezone.utc)
 
-    result = scheduler._should_execute_task(task, last_check, current_time)
-    assert result is True
+    next_execution = scheduler._next_fire_time(task, last_check)
+    assert next_execution == datetime(2023, 1, 1, 12, 1, tzinfo=timezone.utc)
+    assert next_execution <= current_time
 
 
 def test_should_not_execute_task():
@@ -130,8 +131,9 @@ def test_should_not_execute_task():
     )
 
     # Test with times that should not trigger execution
-    last_check = datetime(2023, 1, 1, 12, 0, 0)
-    current_time = datetime(2023, 1, 1, 12, 1, 30)  # 1.5 minutes later
+    last_check = datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    current_time = datetime(2023, 1, 1, 12, 1, 30, tzinfo=timezone.utc)
 
-    result = scheduler._should_execute_task(task, last_check, current_time)
-    assert result is False
\ No newline at end of file
+    next_execution = scheduler._next_fire_time(task, last_check)
+    assert next_execution == datetime(2023, 1, 2, 0, 0, tzinfo=timezone.utc)
+    assert next_execution > current_time
\ No newline at end of file
@@ -1,12 +1,14 @@
+import json
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from app.core.scheduler import TaskScheduler
 from app.models.task import Task
 
+
 def test_scheduler_skips_inactive_tasks():
     """Test that scheduler skips tasks that are no longer active"""
     scheduler = TaskScheduler()
-    
+
     # Create a task that is initially active but will be deactivated
     task = Task(
         id="123e4567-e89b-12d3-a456-426614174000",
@@ -17,16 +19,32 @@ def test_scheduler_skips_inactive_tasks():
         max_retry=3,
         status="inactive",  # Task is already inactive
     )
-    
+
     # Test with times that would normally trigger execution
-    last_check = datetime(2023, 1, 1, 12, 0, 0)
-    current_time = datetime(2023, 1, 1, 12, 1, 30)  # 1.5 minutes later
-    
-    # Task should not be executed because it's inactive
-    result = scheduler._should_execute_task(task, last_check, current_time)
-    # Note: _should_execute_task only checks schedule, not status
-    # The actual skipping of inactive tasks is handled in _check_and_execute_tasks
-    assert result is True  # Schedule-wise, it should execute
-    
-    # But in the actual execution flow, inactive tasks are skipped
-    # This is tested in the integration tests
\ No newline at end of file
+    last_check = datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    current_time = datetime(2023, 1, 1, 12, 1, 30, tzinfo=timezone.utc)
+
+    # Schedule-wise the task is due; the actual skipping of inactive tasks
+    # is handled in _track_task and _check_and_execute_tasks
+    assert scheduler._next_fire_time(task, last_check) <= current_time
+
+    scheduler._track_task(task, current_time)
+    assert task.id not in scheduler._tasks
+    assert len(scheduler.queue) == 0
+
+
+def test_scheduler_logs_its_stats_periodically(caplog):
+    scheduler = TaskScheduler()
+    now = datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+    with caplog.at_level("INFO", logger="app.core.scheduler"):
+        scheduler._log_stats(now)
+        scheduler._log_stats(now + timedelta(seconds=30))
+        scheduler._log_stats(now + timedelta(seconds=60))
+
+    lines = [r.message for r in caplog.records if "stats:" in r.message]
+    assert len(lines) == 2
+    stats = json.loads(lines[0].split("stats: ", 1)[1])
+    assert stats["dispatcher"]["workers"] == 0 and "http" in stats["dispatcher"]
+    assert "p99_ms" in stats["dispatcher"]["lag"]
+    assert "hit_rate" in stats["schedule_cache"]
@@ -0,0 +1,102 @@
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from app.core.lag import LagTracker
+from app.core.schedules import ScheduleCache, parse_schedule
+from app.core.scheduler import TaskScheduler
+from app.models.task import Task
+
+BASE = datetime(2023, 1, 1, 12, 0, 7, tzinfo=timezone.utc)
+
+
+def test_six_field_cron_has_leading_seconds():
+    schedule = parse_schedule("*/15 * * * * *")
+
+    assert schedule.next_after(BASE) == BASE + timedelta(seconds=8)
+    assert schedule.prev_before(BASE) == BASE - timedelta(seconds=7)
+
+
+def test_five_field_cron_is_unchanged():
+    schedule = parse_schedule("0 * * * *")
+
+    assert schedule.next_after(BASE) == datetime(2023, 1, 1, 13, tzinfo=timezone.utc)
+
+
+def test_interval_schedule_is_aligned_to_the_epoch():
+    schedule = parse_schedule("@every 1m30s")
+    next_fire = schedule.next_after(BASE)
+
+    assert next_fire == datetime(2023, 1, 1, 12, 1, 30, tzinfo=timezone.utc)
+    assert schedule.next_after(next_fire) == next_fire + timedelta(seconds=90)
+    assert schedule.prev_before(next_fire) == next_fire - timedelta(seconds=90)
+    # Naive timestamps are read as UTC
+    assert schedule.next_after(BASE.replace(tzinfo=None)) == next_fire
+
+
+@pytest.mark.parametrize(
+    "expression", ["* * *", "61 * * * *", "@every", "@every 0s", "@every 5x"]
+)
+def test_invalid_schedules_are_rejected(expression):
+    with pytest.raises(ValueError):
+        parse_schedule(expression)
+
+
+def test_lag_tracker_percentiles():
+    tracker = LagTracker(window=100, slo_ms=50)
+    for lag_ms in range(1, 201):
+        tracker.record(lag_ms)
+
+    stats = tracker.stats()
+    # Only the latest 100 samples are kept
+    assert stats["samples"] == 100 and stats["total"] == 200
+    assert stats["p50_ms"] == 150
+    assert stats["p99_ms"] == 199
+    assert stats["slo_met"] is False
+
+
+def test_schedule_cache_is_lru_and_counts_hits():
+    cache = ScheduleCache(maxsize=2)
+    every_minute = cache.get("* * * * *")
+    cache.get("0 * * * *")
+
+    assert cache.get("* * * * *") is every_minute
+    cache.get("@every 30s")  # evicts "0 * * * *", the least recently used
+    cache.get("0 * * * *")
+
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert (stats["hits"], stats["misses"]) == (1, 4)
+    assert stats["hit_rate"] == 0.2
+
+
+def test_cron_schedule_in_timezone():
+    schedule = ScheduleCache().get("0 9 * * *", "Asia/Jakarta")
+
+    # 09:00 in Jakarta (UTC+7)
+    assert schedule.next_after(BASE) == datetime(2023, 1, 2, 2, tzinfo=timezone.utc)
+
+
+def test_tasks_sharing_a_schedule_share_one_queue_entry():
+    scheduler = TaskScheduler()
+    tasks = [
+        Task(
+            id=uuid.uuid4(),
+            name=f"Task {i}",
+            schedule="*/5 * * * *" if i % 2 else "0 * * * *",
+            webhook_url="https://example.com/hook",
+            max_retry=0,
+            status="active",
+        )
+        for i in range(100)
+    ]
+    for task in tasks:
+        scheduler._track_task(task, BASE)
+
+    assert len(scheduler.queue) == 2
+    assert scheduler.queue.peek_time() == datetime(
+        2023, 1, 1, 12, 5, tzinfo=timezone.utc
+    )
+
+    scheduler._untrack_task(tasks[0].id)
+    hourly = ("0 * * * *", None, datetime(2023, 1, 1, 13, tzinfo=timezone.utc))
+    assert len(scheduler._groups[hourly]) == 49
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import uuid
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.core.scheduler import TaskScheduler
+from app.core.task_changes import TaskChangeListener, notify_task_change
+from app.core.config import settings
+
+BASE = datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def test_notification_statement():
+    task_id = uuid.uuid4()
+    params = notify_task_change(task_id, "delete").compile().params
+
+    assert params["channel"] == "task_changes"
+    assert json.loads(params["payload"]) == {"id": str(task_id), "op": "delete"}
+
+
+def test_listener_collects_latest_change_per_task():
+    woken = []
+    listener = TaskChangeListener(on_change=lambda: woken.append(True))
+    task_id = str(uuid.uuid4())
+
+    listener._on_notify(None, 1, "task_changes", json.dumps({"id": task_id}))
+    listener._on_notify(
+        None, 1, "task_changes", json.dumps({"id": task_id, "op": "delete"})
+    )
+    listener._on_notify(None, 1, "task_changes", "not json")
+
+    assert listener.drain() == {task_id: "delete"}
+    assert listener.drain() == {}
+    assert len(woken) == 2
+
+
+@pytest.mark.asyncio
+async def test_scheduler_applies_only_notified_changes(make_task):
+    scheduler = TaskScheduler()
+    scheduler.listener.connected = True
+    scheduler._next_full_resync = BASE + timedelta(hours=1)
+    edited, deleted = uuid.uuid4(), uuid.uuid4()
+    scheduler._track_task(make_task(id=edited), BASE)
+    scheduler._track_task(make_task(id=deleted), BASE)
+
+    scheduler.listener._pending = {str(edited): "upsert", str(deleted): "delete"}
+    load = AsyncMock(return_value={edited: make_task(id=edited, schedule="0 * * * *")})
+    with patch.object(scheduler, "_load_tasks", new=load):
+        await scheduler._sync_tasks(BASE + timedelta(seconds=1))
+
+    load.assert_awaited_once_with([edited, deleted])
+    assert deleted not in scheduler._tasks
+    assert scheduler._tasks[edited].schedule == "0 * * * *"
+    assert scheduler.queue.peek_time() == BASE + timedelta(hours=1)
+
+    # Due tasks are taken from the registry without another query
+    with patch.object(scheduler, "_load_tasks", new=AsyncMock()) as load:
+        with patch.object(scheduler.dispatcher, "submit", new=AsyncMock()) as submit:
+            await scheduler._check_and_execute_tasks(BASE + timedelta(hours=1))
+    load.assert_not_called()
+    submit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_lookahead_query_and_prune_wait_for_their_intervals(make_task):
+    scheduler = TaskScheduler()
+    scheduler.lookahead = 3600
+    scheduler.listener.connected = True
+    scheduler.ledger = AsyncMock()
+    scheduler._caught_up = True
+    session = AsyncMock()
+    session.execute.return_value = MagicMock()
+    session.execute.return_value.scalars.return_value.all.return_value = []
+    edited = uuid.uuid4()
+    load = AsyncMock(return_value={edited: make_task(id=edited)})
+
+    with patch("app.core.scheduler.AsyncSessionLocal", return_value=session):
+        with patch.object(scheduler, "_load_tasks", new=load):
+            await scheduler._sync_tasks(BASE)
+            # Between syncs only the notified changes are loaded
+            scheduler.listener._pending = {str(edited): "upsert"}
+            await scheduler._sync_tasks(BASE + timedelta(seconds=1))
+            await scheduler._sync_tasks(BASE + timedelta(seconds=2))
+            assert session.execute.await_count == 1
+            load.assert_awaited_once_with([edited])
+            assert edited in scheduler._tasks
+
+            interval = settings.SCHEDULER_SYNC_INTERVAL_SECONDS
+            await scheduler._sync_tasks(BASE + timedelta(seconds=interval))
+
+    assert session.execute.await_count == 2
+    scheduler.ledger.prune.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_listening_scheduler_sleeps_between_syncs():
+    scheduler = TaskScheduler()
+    scheduler.listener.connected = True
+    scheduler._next_full_resync = datetime.now(timezone.utc) + timedelta(hours=1)
+    scheduler._next_sync = datetime.now(timezone.utc) - timedelta(seconds=1)
+    iterations = AsyncMock()
+
+    scheduler.listener.run_forever = AsyncMock()
+    scheduler.partitions.run_forever = AsyncMock()
+    with patch.object(scheduler, "_check_and_execute_tasks", new=iterations):
+        running = asyncio.create_task(scheduler.start())
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+        await running
+
+    # One pass, then asleep until the next sync instead of spinning
+    assert iterations.await_count == 1
@@ -251,4 +251,50 @@ def test_list_task_logs_by_task_with_status_filter(
     # Check that only success logs for our task are returned
     for log in data["task_logs"]:
         assert log["task_id"] == sample_task["id"]
-        assert log["status"] == "success"
\ No newline at end of file
+        assert log["status"] == "success"
+
+def test_list_task_logs_by_task_with_cursor(
+    auth_headers, sample_task, sample_task_logs
+):
+    # Walk the logs of our task one page at a time using the cursor
+    url = f"/task-logs/task/{sample_task['id']}?limit=2"
+    response = client.get(url, headers=auth_headers)
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page["task_logs"]) == 2
+    assert first_page["next_cursor"] is not None
+
+    response = client.get(
+        f"{url}&cursor={first_page['next_cursor']}", headers=auth_headers
+    )
+    assert response.status_code == 200
+    second_page = response.json()
+    # Exact totals are opt-in when paging by cursor
+    assert second_page["total"] is None
+    assert second_page["next_cursor"] is None
+
+    execution_times = [
+        log["execution_time"]
+        for log in first_page["task_logs"] + second_page["task_logs"]
+    ]
+    assert len(execution_times) == 3
+    assert execution_times == sorted(execution_times, reverse=True)
+
+
+def test_list_task_logs_with_invalid_cursor(auth_headers):
+    response = client.get("/task-logs/?cursor=not-a-cursor", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_list_task_logs_by_task_with_time_range(
+    auth_headers, sample_task, sample_task_logs
+):
+    response = client.get(
+        f"/task-logs/task/{sample_task['id']}"
+        "?since=2023-01-01T10:30:00Z&until=2023-01-01T12:00:00Z",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    assert data["task_logs"][0]["execution_time"].startswith("2023-01-01T11:00:00")
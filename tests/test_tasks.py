@@ -206,4 +206,85 @@ def test_list_tasks_with_search_filter(auth_headers, sample_tasks):
     assert "total" in data
     # Check that only tasks with "Test" in the name are returned
     for task in data["tasks"]:
-        assert "Test" in task["name"]
\ No newline at end of file
+        assert "Test" in task["name"]
+
+def test_list_tasks_with_cursor(auth_headers, sample_tasks):
+    # Follow next_cursor until the last page and check nothing repeats
+    seen = []
+    cursor = None
+    while True:
+        url = "/tasks/?limit=2&include_total=true"
+        if cursor:
+            url += f"&cursor={cursor}"
+        response = client.get(url, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] is not None
+        seen.extend(task["id"] for task in data["tasks"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen)) == data["total"]
+    for task in sample_tasks:
+        assert task["id"] in seen
+
+
+def test_task_logs_are_opt_in(auth_headers, sample_tasks):
+    task_id = sample_tasks[0]["id"]
+    for hour in (10, 11, 12):
+        response = client.post(
+            "/task-logs/",
+            json={
+                "task_id": task_id,
+                "execution_time": f"2023-01-01T{hour}:00:00Z",
+                "status": "success",
+                "retry_count": 1,
+                "message": "Task executed successfully",
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+    # Logs are not loaded unless requested
+    response = client.get(f"/tasks/{task_id}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["logs"] is None
+
+    # When requested, only the most recent logs_limit logs are returned
+    response = client.get(
+        f"/tasks/{task_id}?include=logs&logs_limit=2", headers=auth_headers
+    )
+    assert response.status_code == 200
+    logs = response.json()["logs"]
+    assert [log["execution_time"][:19] for log in logs] == [
+        "2023-01-01T12:00:00",
+        "2023-01-01T11:00:00",
+    ]
+
+    response = client.get("/tasks/?include=logs&logs_limit=1", headers=auth_headers)
+    assert response.status_code == 200
+    for task in response.json()["tasks"]:
+        assert len(task["logs"]) <= 1
+
+
+def test_schedule_is_validated_and_canonicalized(auth_headers):
+    task_data = {
+        "name": "Test Task",
+        "schedule": "not a cron",
+        "webhook_url": "https://discord.com/api/webhooks/test",
+    }
+    response = client.post("/tasks/", json=task_data, headers=auth_headers)
+    assert response.status_code == 422
+
+    task_data["schedule"] = "0  */5 * * * *"
+    response = client.post("/tasks/", json=task_data, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["schedule"] == "*/5 * * * *"
+    assert data["next_run_at"] is not None
+
+    response = client.put(
+        f"/tasks/{data['id']}", json={"status": "inactive"}, headers=auth_headers
+    )
+    assert response.json()["next_run_at"] is None
@@ -0,0 +1,19 @@
+import pytest
+from app import worker
+from app.core.config import settings
+
+
+def test_several_processes_require_coordination(monkeypatch):
+    monkeypatch.setattr(settings, "SCHEDULER_COORDINATION", "none")
+    monkeypatch.setattr(settings, "SCHEDULER_RUN_LEDGER", False)
+
+    with pytest.raises(SystemExit):
+        worker.main(["--processes", "2"])
+
+
+def test_single_process_applies_concurrency(monkeypatch):
+    started = []
+    monkeypatch.setattr(worker, "_worker_main", lambda *args: started.append(args))
+
+    assert worker.main(["--concurrency", "7", "--executor-processes", "2"]) == 0
+    assert started == [(7, 2)]